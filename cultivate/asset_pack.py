@@ -0,0 +1,152 @@
+"""Pack every asset into one indexed file that is read through mmap.
+
+Layout (little endian):
+
+    header   b"CPAK", version (H), entry count (I)
+    index    per entry: name length (H), name (utf-8), format length (B), format (ascii),
+             offset (Q), length (Q)
+    data     the raw bytes of each file, at {offset} from the start of the pack
+"""
+import io
+import mmap
+import os
+import struct
+import sys
+import typing
+
+MAGIC = b"CPAK"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+ENTRY_POSITION = struct.Struct("<QQ")
+PACKED_EXTENSIONS = {"png", "jpg", "jpeg", "ogg", "wav", "ttf"}
+
+
+class PackEntry(typing.NamedTuple):
+    offset: int
+    length: int
+    format: str
+
+
+class MemoryViewReader(io.RawIOBase):
+    """Read-only file object over a memoryview, so pygame can load straight from the pack."""
+
+    def __init__(self, view: memoryview):
+        super().__init__()
+        self.view = view
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = min(len(buffer), len(self.view) - self.position)
+        buffer[:count] = self.view[self.position:self.position + count]
+        self.position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, min(offset, len(self.view)))
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+
+class AssetPack:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self.index = self.read_index(self._view)
+
+    @staticmethod
+    def read_index(view: memoryview) -> typing.Dict[str, PackEntry]:
+        magic, version, count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} asset pack")
+        index = {}
+        position = HEADER.size
+        for _ in range(count):
+            name_length, = struct.unpack_from("<H", view, position)
+            position += 2
+            name = bytes(view[position:position + name_length]).decode("utf-8")
+            position += name_length
+            format_length, = struct.unpack_from("<B", view, position)
+            position += 1
+            asset_format = bytes(view[position:position + format_length]).decode("ascii")
+            position += format_length
+            offset, length = ENTRY_POSITION.unpack_from(view, position)
+            position += ENTRY_POSITION.size
+            index[name] = PackEntry(offset, length, asset_format)
+        return index
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def get(self, name: str) -> memoryview:
+        """Return the bytes of {name} without copying them out of the pack."""
+        entry = self.index[name]
+        return self._view[entry.offset:entry.offset + entry.length]
+
+    def open(self, name: str) -> MemoryViewReader:
+        return MemoryViewReader(self.get(name))
+
+
+def find_assets(assets_dir: str) -> typing.List[str]:
+    """Return the pack names (paths relative to {assets_dir}, with / separators) of every packable file."""
+    names = []
+    for directory, _, filenames in os.walk(assets_dir):
+        for filename in filenames:
+            if filename.rsplit(".", 1)[-1].lower() not in PACKED_EXTENSIONS:
+                continue
+            path = os.path.relpath(os.path.join(directory, filename), assets_dir)
+            names.append(path.replace(os.sep, "/"))
+    return sorted(names)
+
+
+def build(assets_dir: str, output_path: str) -> int:
+    """Write every asset under {assets_dir} into a pack at {output_path} and return the entry count."""
+    names = find_assets(assets_dir)
+    encoded = [(name.encode("utf-8"), name.rsplit(".", 1)[-1].lower().encode("ascii")) for name in names]
+    index_size = sum(2 + len(name) + 1 + len(asset_format) + ENTRY_POSITION.size
+                     for name, asset_format in encoded)
+
+    offset = HEADER.size + index_size
+    index = []
+    for name in names:
+        length = os.path.getsize(os.path.join(assets_dir, name))
+        index.append((offset, length))
+        offset += length
+
+    with open(output_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(names)))
+        for (name, asset_format), (offset, length) in zip(encoded, index):
+            f.write(struct.pack("<H", len(name)) + name)
+            f.write(struct.pack("<B", len(asset_format)) + asset_format)
+            f.write(ENTRY_POSITION.pack(offset, length))
+        for name in names:
+            with open(os.path.join(assets_dir, name), "rb") as asset:
+                f.write(asset.read())
+    return len(names)
+
+
+def main(argv=sys.argv[1:]):
+    from cultivate import days, settings
+
+    output_path = argv[0] if argv else settings.ASSET_PACK
+    count = build(settings.ROOT_ASSETS_DIR, output_path)
+    print(f"Packed {count} assets into {output_path}")
+    # the day definitions are compiled as part of the same build step
+    days.main([])
+
+
+if __name__ == "__main__":
+    main()
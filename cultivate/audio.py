@@ -0,0 +1,109 @@
+import typing
+from functools import lru_cache
+
+import pygame
+
+from cultivate import settings
+
+# reserved channel, never handed out to other sound effects
+FOOTSTEPS = 0
+RESERVED_CHANNELS = 1
+
+SFX = "sfx"
+
+# sound effect priorities, when every channel is busy a new effect cuts off a lower one
+KEYSTROKE = 1
+
+
+def init_mixer(buffer: int = None) -> None:
+    """Set the mixer up once, must be called before pygame.init()."""
+    if buffer is None:
+        buffer = settings.AUDIO_BUFFER
+    # a small buffer stops the sound effect delay (see https://stackoverflow.com/q/18273722)
+    pygame.mixer.pre_init(settings.AUDIO_FREQUENCY, -16, 2, buffer)
+
+
+class AudioManager:
+    """Plays sound effects on a fixed pool of channels.
+
+    Footsteps get their own reserved channel. Other effects are limited
+    to {max_voices} copies at once, and when the pool is full a new effect only plays
+    if it can steal the channel of a lower priority one.
+    """
+
+    def __init__(self, channels: int = None):
+        pygame.mixer.set_num_channels(settings.AUDIO_CHANNELS if channels is None else channels)
+        pygame.mixer.set_reserved(RESERVED_CHANNELS)
+        self.footsteps = pygame.mixer.Channel(FOOTSTEPS)
+        # channel index -> (sound, priority) of the effect we last started on it
+        self.playing = {}
+        self.volumes = {FOOTSTEPS: 1.0, SFX: 1.0}
+        self.pending_volumes = {}
+
+    def play_footsteps(self, sound: pygame.mixer.Sound) -> None:
+        if self.footsteps.get_sound() is not sound or not self.footsteps.get_busy():
+            self.footsteps.play(sound, -1)
+
+    def stop_footsteps(self) -> None:
+        self.footsteps.stop()
+
+    def play(self, sound: pygame.mixer.Sound, priority: int = 0, max_voices: int = 2,
+             loops: int = 0) -> typing.Optional[pygame.mixer.Channel]:
+        """Play a sound effect, return its channel or None if it was dropped."""
+        voices = []
+        lowest = None
+        for index, (playing_sound, playing_priority) in list(self.playing.items()):
+            channel = pygame.mixer.Channel(index)
+            if not channel.get_busy() or channel.get_sound() is not playing_sound:
+                del self.playing[index]
+                continue
+            if playing_sound is sound:
+                voices.append(index)
+            if lowest is None or playing_priority < self.playing[lowest][1]:
+                lowest = index
+
+        if len(voices) >= max_voices:
+            # restart the oldest copy instead of adding another
+            index = voices[0]
+        else:
+            index = self.free_channel()
+            if index is None:
+                if lowest is None or self.playing[lowest][1] > priority:
+                    return None
+                index = lowest
+
+        channel = pygame.mixer.Channel(index)
+        channel.play(sound, loops)
+        channel.set_volume(self.volumes[SFX])
+        # re-insert so {self.playing} stays ordered oldest first
+        self.playing.pop(index, None)
+        self.playing[index] = (sound, priority)
+        return channel
+
+    @staticmethod
+    def free_channel() -> typing.Optional[int]:
+        for index in range(RESERVED_CHANNELS, pygame.mixer.get_num_channels()):
+            if not pygame.mixer.Channel(index).get_busy():
+                return index
+        return None
+
+    def set_volume(self, group, volume: float) -> None:
+        """Queue a volume change for {group} (FOOTSTEPS or SFX), applied on the next {flush}."""
+        self.pending_volumes[group] = volume
+
+    def flush(self) -> None:
+        """Apply the volume changes queued since the last frame in one go."""
+        if not self.pending_volumes:
+            return
+        self.volumes.update(self.pending_volumes)
+        if FOOTSTEPS in self.pending_volumes:
+            self.footsteps.set_volume(self.volumes[FOOTSTEPS])
+        if SFX in self.pending_volumes:
+            for index in self.playing:
+                pygame.mixer.Channel(index).set_volume(self.volumes[SFX])
+        self.pending_volumes = {}
+
+
+@lru_cache(None)
+def get_audio() -> AudioManager:
+    return AudioManager()
@@ -0,0 +1,511 @@
+"""Play the whole game with a scripted bot, for end to end performance runs.
+
+The bot presses keys like a player would: the movement key it holds each tick goes to
+Map.update_map_view and key presses go through main.handle_event, so everything from the
+map to the final cutscene runs as it does in the real game. It finds its way with A* over
+the map's collision sprites on the 10px grid the map view moves on, and each day has a
+script for completing its task and one for sabotaging it.
+
+    python -m cultivate.autoplay [--sabotage all|1,3] [--seed N] [--headless] [--report run.json]
+
+Every tick is drawn with the dirty rect renderer and timed. The report has each day's
+frame times, as a histogram of milliseconds, and peak memory.
+"""
+import bisect
+import contextlib
+import heapq
+import json
+import logging
+import os
+import random
+import sys
+import time
+import typing
+
+from itertools import chain
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+with contextlib.redirect_stdout(None):
+    import pygame
+
+from cultivate import main as game, settings
+from cultivate.culling import SpatialHash
+from cultivate.exc import DemonSummoned, SummoningSabotaged
+from cultivate.music import MusicPlayer
+from cultivate.npc import CultLeader, Npc
+from cultivate.renderer import DirtyRectRenderer
+from cultivate.sprites import pickups as pickupables
+
+COMPLETE = "complete"
+SABOTAGE = "sabotage"
+TASK_DAYS = (1, 2, 3, 4, 5)
+# frame time histogram bucket upper bounds, in milliseconds
+BUCKETS = (1, 2, 4, 8, 16, 33, 66)
+# how far the map view moves in a tick, Map.move_amount
+STEP = 10
+MOVES = {
+    pygame.K_RIGHT: (STEP, 0),
+    pygame.K_LEFT: (-STEP, 0),
+    pygame.K_DOWN: (0, STEP),
+    pygame.K_UP: (0, -STEP),
+}
+MAX_TICKS_PER_DAY = 100000
+MAX_SEARCH = 100000
+# the wrong word written into the prayer to sabotage it
+WRONG_WORD = "bake"
+
+
+class Stuck(Exception):
+    """The bot couldn't get on with its script."""
+
+
+class Tick(typing.NamedTuple):
+    """The keys for one tick: {held} down the whole tick, {presses} pressed at the start of it."""
+    held: typing.Optional[int] = None
+    presses: typing.Tuple[int, ...] = ()
+
+
+class HeldKeys:
+    """Stands in for pygame.key.get_pressed(), with at most {key} down."""
+
+    def __init__(self, key: int = None):
+        self.key = key
+
+    def __getitem__(self, key: int) -> bool:
+        return key == self.key
+
+
+def peak_rss_kb() -> typing.Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS counts bytes, everyone else kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def histogram(frame_times: typing.Sequence[float]) -> typing.Dict[str, int]:
+    """Count {frame_times} (ms) into BUCKETS."""
+    counts = [0] * (len(BUCKETS) + 1)
+    for frame_time in frame_times:
+        counts[bisect.bisect_left(BUCKETS, frame_time)] += 1
+    labels = [f"<={bucket}ms" for bucket in BUCKETS] + [f">{BUCKETS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+def day_report(frame_times: typing.Sequence[float], wall_time: float) -> dict:
+    ordered = sorted(frame_times)
+    return {
+        "wall_time": round(wall_time, 3),
+        "frames": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else None,
+        "p95_ms": round(ordered[int(len(ordered) * 0.95)], 3) if ordered else None,
+        "max_ms": round(ordered[-1], 3) if ordered else None,
+        "histogram": histogram(ordered),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+class Navigator:
+    """Find paths for the map view, seeing collisions the way Map.can_move does.
+
+    Map views are searched on the grid the view moves on. Sprite rects are taken in map
+    coordinates from the view they were last updated for.
+    """
+
+    def __init__(self, game_map, player):
+        view = (game_map.map_view_x, game_map.map_view_y)
+        self.impassables = self.index(game_map.impassables, view)
+        self.passables = self.index(game_map.passables, view)
+        self.feet = (player.rect.x, player.rect.bottom, player.rect.w)
+        self.reach = player.tooltip_boundary(None)
+        self.walkable_cache = {}
+
+    @staticmethod
+    def index(sprites, view) -> SpatialHash:
+        spatial = SpatialHash()
+        for sprite in sprites:
+            spatial.insert(sprite, sprite.rect.move(view))
+        return spatial
+
+    def walkable(self, view: typing.Tuple[int, int]) -> bool:
+        if view not in self.walkable_cache:
+            x, bottom, width = self.feet
+            feet = pygame.Rect(view[0] + x, view[1] + bottom, width, 1)
+            self.walkable_cache[view] = bool(self.passables.query(feet)) or not self.impassables.query(feet)
+        return self.walkable_cache[view]
+
+    def reach_rect(self, view: typing.Tuple[int, int]) -> pygame.Rect:
+        """What the player can reach (Player.tooltip_boundary) from {view}, in map coordinates."""
+        return self.reach.move(view)
+
+    def path(self, start: typing.Tuple[int, int], is_goal: typing.Callable[[typing.Tuple[int, int]], bool],
+             target: pygame.Rect = None) -> typing.List[int]:
+        """The movement keys from {start} to the nearest view {is_goal} accepts, heading for {target}."""
+        def estimate(view):
+            if target is None:
+                return 0
+            reach = self.reach_rect(view)
+            dx = max(target.left - reach.right, reach.left - target.right, 0)
+            dy = max(target.top - reach.bottom, reach.top - target.bottom, 0)
+            return (dx + dy) // STEP
+
+        came_from = {start: None}
+        cost = {start: 0}
+        frontier = [(estimate(start), 0, start)]
+        while frontier:
+            _, steps, view = heapq.heappop(frontier)
+            if steps > cost[view]:
+                continue
+            if is_goal(view):
+                keys = []
+                while came_from[view] is not None:
+                    view, key = came_from[view]
+                    keys.append(key)
+                return keys[::-1]
+            if len(cost) > MAX_SEARCH:
+                break
+            for key, (dx, dy) in MOVES.items():
+                next_view = (view[0] + dx, view[1] + dy)
+                if steps + 1 < cost.get(next_view, MAX_SEARCH) and self.walkable(next_view):
+                    cost[next_view] = steps + 1
+                    came_from[next_view] = (view, key)
+                    heapq.heappush(frontier, (steps + 1 + estimate(next_view), steps + 1, next_view))
+        raise Stuck(f"no way from {start} to {target}")
+
+
+class Autoplayer:
+    """Play a game from day 0, completing or sabotaging each day's task as {choices} says.
+
+    pygame has to be initialised and {screen} made first, see {init}.
+    """
+
+    def __init__(self, screen: pygame.Surface, choices: typing.Dict[int, str]):
+        self.screen = screen
+        self.choices = choices
+        (self.game_state, self.player, self.game_map, self.tooltip_bar, self.inventory, self.info_box,
+         self.static_interactables) = game.init_state(0)
+        self.game_state.music = MusicPlayer()
+        self.game_state.music.play_day(0)
+        self.npc_sprites, self.pickups = self.game_state.get_day_items()
+        self.current_day = 0
+        self.renderer = DirtyRectRenderer()
+        self.frame_times = {}
+        self.wall_times = {}
+        # the first tick puts every sprite where the current view says
+        self.step(Tick())
+        self.navigator = Navigator(self.game_map, self.player)
+
+    @property
+    def view(self) -> typing.Tuple[int, int]:
+        return self.game_map.map_view_x, self.game_map.map_view_y
+
+    def rect_of(self, sprite) -> pygame.Rect:
+        """{sprite}'s rect in map coordinates, as of the last tick."""
+        if isinstance(sprite, Npc):
+            # npcs off screen don't keep their rect up to date (see NpcGroup)
+            return pygame.Rect(sprite.x, sprite.y, sprite.rect.w, sprite.rect.h)
+        return sprite.rect.move(self.view)
+
+    def step(self, tick: Tick) -> None:
+        """Run one tick of the main loop with {tick}'s keys, and draw it."""
+        start = time.perf_counter()
+        # nothing should be queued, but don't let it pile up
+        pygame.event.pump()
+        for key in tick.presses:
+            game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key), self.player, self.game_map,
+                              self.game_state, self.inventory, self.static_interactables, self.pickups)
+        if self.game_state.day != self.current_day and self.game_state.fader.black:
+            self.npc_sprites, self.pickups = self.game_state.swap_day_items()
+            self.current_day = self.game_state.day
+
+        game.update(self.game_state, self.player, self.game_map, self.tooltip_bar, self.npc_sprites,
+                    self.pickups, self.static_interactables, HeldKeys(tick.held))
+        camera = (*self.game_map.get_viewport().topleft,
+                  self.game_state.fader.opacity if self.game_state.fader.fading else None)
+        states = game.frame_states(self.player, self.game_map, self.game_state, self.tooltip_bar, self.inventory,
+                                   self.info_box, self.npc_sprites, self.pickups, None)
+        self.renderer.render(
+            self.screen, camera, states,
+            lambda surface: game.draw_frame(surface, self.player, self.game_map, self.game_state, self.tooltip_bar,
+                                            self.inventory, self.info_box, self.npc_sprites, self.pickups, None)
+        )
+
+        elapsed = time.perf_counter() - start
+        self.frame_times.setdefault(self.current_day, []).append(elapsed * 1000)
+        self.wall_times[self.current_day] = self.wall_times.get(self.current_day, 0) + elapsed
+
+    def play(self) -> str:
+        """Play until the game ends and return how: "demon_summoned" or "summoning_sabotaged"."""
+        try:
+            for tick in self.script():
+                self.step(tick)
+                if len(self.frame_times[self.current_day]) > MAX_TICKS_PER_DAY:
+                    raise Stuck(f"day {self.current_day} took more than {MAX_TICKS_PER_DAY} ticks")
+        except DemonSummoned:
+            return "demon_summoned"
+        except SummoningSabotaged:
+            return "summoning_sabotaged"
+        raise Stuck("the game didn't end")
+
+    def report(self) -> dict:
+        return {
+            "days": {day: day_report(frame_times, self.wall_times[day])
+                     for day, frame_times in sorted(self.frame_times.items())},
+            "all": day_report(list(chain.from_iterable(self.frame_times.values())), sum(self.wall_times.values())),
+        }
+
+    # scripts, each yields the ticks to play
+
+    def script(self) -> typing.Iterator[Tick]:
+        yield from self.tour()
+        for day in TASK_DAYS:
+            yield from self.sleep()
+            sabotage = self.choices.get(day) == SABOTAGE
+            yield from getattr(self, f"day_{day}")(sabotage)
+        yield from self.sleep()
+        yield from self.finale()
+
+    def tour(self) -> typing.Iterator[Tick]:
+        centre = pygame.Rect(settings.WIDTH // 2 - 50, settings.HEIGHT // 2 - 50, 100, 100)
+        for building_name, _ in list(self.game_map.day0):
+            if building_name is None:
+                continue
+            building = self.rect_of(self.game_map.buildings[building_name])
+            yield from self.walk(building, lambda view: centre.move(view).colliderect(building))
+        while not self.game_state.is_day_done() or self.player.interacting_with:
+            yield from self.close_dialogue()
+            yield Tick()
+
+    def day_1(self, sabotage: bool) -> typing.Iterator[Tick]:
+        grave = self.game_map.graves[0]
+        yield from self.pick_up(pickupables.Shovel)
+        yield from self.interact(grave)
+        if sabotage:
+            yield from self.pick_up(pickupables.Flower)
+            yield from self.interact(grave)
+
+    def day_2(self, sabotage: bool) -> typing.Iterator[Tick]:
+        yield from self.make(pickupables.EmptyBucket, self.game_map.river)
+        yield from self.make(pickupables.Lemon, pickupables.WaterBucket)
+        yield from self.make(pickupables.Sugar, pickupables.LemonyWater)
+        yield from self.make(pickupables.SugaryLemonWater, self.game_map.fire)
+        if sabotage:
+            yield from self.make(pickupables.RatPoison, self.game_map.river)
+
+    def day_3(self, sabotage: bool) -> typing.Iterator[Tick]:
+        yield from self.make(pickupables.EmptyBucket, self.game_map.river)
+        yield from self.make(pickupables.Soap, pickupables.WaterBucket)
+        yield from self.make(pickupables.DirtyRobes, pickupables.SoapyWater)
+        if sabotage:
+            yield from self.make(pickupables.RedSock, pickupables.WhiteLaundry)
+            yield from self.make(pickupables.ColorRunLaundry, self.game_map.clothes_line)
+        else:
+            yield from self.make(pickupables.WhiteLaundry, self.game_map.clothes_line)
+
+    def day_4(self, sabotage: bool) -> typing.Iterator[Tick]:
+        yield from self.make(pickupables.BeesWax, self.game_map.fire)
+        yield from self.make(pickupables.BlackDye, pickupables.MeltedWax)
+        if sabotage:
+            yield from self.make(pickupables.EssenceOfCinnamon, pickupables.MeltedBlackWax)
+            yield from self.make(pickupables.EmptyBucket, pickupables.ScentedMeltedBlackWax)
+        else:
+            yield from self.make(pickupables.EmptyBucket, pickupables.MeltedBlackWax)
+
+    def day_5(self, sabotage: bool) -> typing.Iterator[Tick]:
+        yield from self.drop()
+        yield from self.interact(self.game_map.desk)
+        madlibs = self.player.madlibs
+        if madlibs is None:
+            raise Stuck("the desk didn't open the prayer")
+        words = list(madlibs.expected_changes.values())
+        if sabotage:
+            words[0] = WRONG_WORD
+        for current, word in zip(list(madlibs.changed_words.values()), words):
+            presses = [pygame.K_BACKSPACE] * len(current) + [getattr(pygame, f"K_{letter}") for letter in word]
+            for key in presses + [pygame.K_TAB]:
+                yield Tick(presses=(key,))
+        yield Tick(presses=(game.K_QUIT_INTERACTION,))
+
+    def finale(self) -> typing.Iterator[Tick]:
+        leader = next(npc for npc in self.npc_sprites if isinstance(npc, CultLeader))
+        # getting close enough for its tooltip starts the cutscene
+        yield from self.walk(self.rect_of(leader))
+        while True:
+            cutscene = self.game_state.cutscene
+            if cutscene and cutscene.current_conversation:
+                yield from self.wait(20)
+                yield Tick(presses=(game.K_QUIT_INTERACTION,))
+            else:
+                yield Tick()
+
+    # what the scripts are made of
+
+    def wait(self, ticks: int) -> typing.Iterator[Tick]:
+        for _ in range(ticks):
+            yield Tick()
+
+    def close_dialogue(self) -> typing.Iterator[Tick]:
+        if self.player.interacting_with or self.player.conversation:
+            yield Tick(presses=(game.K_QUIT_INTERACTION,))
+
+    def drop(self) -> typing.Iterator[Tick]:
+        if self.player.pickup:
+            yield Tick(presses=(pygame.K_z,))
+
+    def walk(self, target: pygame.Rect, is_goal=None) -> typing.Iterator[Tick]:
+        """Walk until {is_goal}(view), by default until {target} (map coordinates) is in reach."""
+        if is_goal is None:
+            is_goal = lambda view: self.navigator.reach_rect(view).colliderect(target)
+        for _ in range(10):
+            if is_goal(self.view):
+                return
+            view = self.view
+            for key in self.navigator.path(view, is_goal, target):
+                yield from self.close_dialogue()
+                yield Tick(held=key)
+                expected = (view[0] + MOVES[key][0], view[1] + MOVES[key][1])
+                if self.view != expected:
+                    # held up, by a conversation or the goal moving, plan again from here
+                    break
+                view = expected
+        if not is_goal(self.view):
+            raise Stuck(f"couldn't get to {target}")
+
+    def first_in_reach(self, view, sprites) -> typing.Optional[pygame.sprite.Sprite]:
+        reach = self.navigator.reach_rect(view)
+        return next((sprite for sprite in sprites if reach.colliderect(self.rect_of(sprite))), None)
+
+    def find(self, item_type: type) -> pickupables.BasePickUp:
+        items = [item for item in self.pickups if type(item) is item_type]
+        if not items:
+            raise Stuck(f"no {item_type.__name__} on the map")
+        x, y = self.game_map.map_view_x + self.player.x, self.game_map.map_view_y + self.player.y
+        return min(items, key=lambda item: abs(item.x - x) + abs(item.y - y))
+
+    def set_aside(self) -> typing.Iterator[Tick]:
+        """Put down what's held somewhere nothing else can be reached."""
+        pickups = [self.rect_of(item) for item in self.pickups]
+        yield from self.walk(None, lambda view: self.navigator.reach_rect(view).collidelist(pickups) == -1)
+        yield from self.drop()
+
+    def pick_up(self, item_type: type) -> typing.Iterator[Tick]:
+        yield from self.drop()
+        for _ in range(5):
+            item = self.find(item_type)
+            yield from self.walk(self.rect_of(item))
+            yield Tick(presses=(game.K_INTERACT,))
+            if isinstance(self.player.pickup, item_type):
+                return
+            # something on top of it came first
+            yield from self.close_dialogue()
+            yield from self.set_aside()
+        raise Stuck(f"couldn't pick up {item_type.__name__}")
+
+    def combine_with(self, target) -> typing.Iterator[Tick]:
+        """Combine what's held with {target}, a pickup type or a static sprite."""
+        if isinstance(target, type):
+            target = self.find(target)
+        held = self.player.pickup
+        candidates = [sprite for sprite in chain(self.pickups, self.static_interactables) if held.can_combine(sprite)]
+        yield from self.walk(self.rect_of(target), lambda view: self.first_in_reach(view, candidates) is target)
+        yield Tick(presses=(pygame.K_c,))
+        if self.player.pickup is held:
+            raise Stuck(f"couldn't combine {held.name} with {target}")
+
+    def make(self, item_type: type, target) -> typing.Iterator[Tick]:
+        yield from self.pick_up(item_type)
+        yield from self.combine_with(target)
+
+    def interact(self, target) -> typing.Iterator[Tick]:
+        """Press the interact key with {target} nearby and nothing to pick up in the way."""
+        before = list(chain(self.pickups, self.static_interactables))
+        yield from self.walk(self.rect_of(target), lambda view: self.first_in_reach(view, before) is target)
+        # npcs come before everything else, wait for any passing by
+        for _ in range(200):
+            if self.player.nearby_interactable is target:
+                break
+            yield Tick()
+        else:
+            raise Stuck(f"couldn't get near {target}")
+        yield Tick(presses=(game.K_INTERACT,))
+
+    def sleep(self) -> typing.Iterator[Tick]:
+        if not self.game_state.is_day_done():
+            raise Stuck(f"day {self.game_state.day}'s task isn't done")
+        day = self.game_state.day
+        yield from self.close_dialogue()
+        yield from self.drop()
+        yield from self.interact(self.game_map.bed)
+        while self.current_day == day or self.game_state.fader.fading:
+            yield Tick()
+
+
+def init(headless: bool = False) -> pygame.Surface:
+    """Start pygame for {Autoplayer}, without a window or sound when {headless}."""
+    if headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "disk")
+        os.environ.setdefault("SDL_DISKAUDIOFILE", os.devnull)
+    screen, _ = game.init_game()
+    return screen
+
+
+def play(screen: pygame.Surface, choices: typing.Dict[int, str], seed: int) -> dict:
+    """Play a game on world {seed} and return what happened and how long it took."""
+    settings.WORLD_SEED = seed
+    random.seed(seed)
+    start = time.perf_counter()
+    bot = Autoplayer(screen, choices)
+    outcome, error = None, None
+    try:
+        outcome = bot.play()
+    except Stuck as e:
+        error = str(e)
+        logging.warning("Bot stuck on day %d: %s", bot.current_day, e)
+    return {
+        "seed": seed,
+        "choices": {str(day): choice for day, choice in sorted(choices.items())},
+        "outcome": outcome,
+        "error": error,
+        "wall_time": round(time.perf_counter() - start, 3),
+        **bot.report(),
+    }
+
+
+def parse_choices(argv) -> typing.Dict[int, str]:
+    sabotaged = []
+    if "--sabotage" in argv:
+        value = argv[argv.index('--sabotage') + 1]
+        sabotaged = TASK_DAYS if value == "all" else [int(day) for day in value.split(",")]
+    return {day: SABOTAGE if day in sabotaged else COMPLETE for day in TASK_DAYS}
+
+
+def print_report(report: dict) -> None:
+    print(f"seed {report['seed']}: {report['outcome'] or 'stuck, ' + report['error']} "
+          f"in {report['wall_time']:.1f}s")
+    for day, stats in chain(report["days"].items(), [("all", report["all"])]):
+        print(f"  day {day:>3}: {stats['frames']:6d} frames, mean {stats['mean_ms']}ms, "
+              f"p95 {stats['p95_ms']}ms, max {stats['max_ms']}ms, peak rss {stats['peak_rss_kb']}kB")
+
+
+def main(argv=sys.argv[1:]):
+    logging.basicConfig(level=logging.DEBUG if "--debug" in argv else logging.INFO,
+                        format="%(levelname)-8s %(asctime)15s [%(filename)s@%(lineno)-3s] %(message)s")
+    seed = int(argv[argv.index('--seed') + 1]) if "--seed" in argv else random.randrange(2 ** 32)
+    if "--crowd" in argv:
+        settings.NPC_CROWD = True
+    screen = init(headless="--headless" in argv)
+    report = play(screen, parse_choices(argv), seed)
+    print_report(report)
+    if "--report" in argv:
+        with open(argv[argv.index('--report') + 1], "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["outcome"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""Npcs walking their paths as columns of numpy arrays, moved a whole crowd at a time.
+
+An npc in a Crowd keeps its position, previous position and the point it's walking to
+in the crowd's arrays, its attributes for them are views onto its row (see {view}). Each
+tick Crowd.step moves the npcs near the screen in a few array operations, the same way
+Npc.update would have: one axis at a time, x first, snapping to a point once within a
+step of it, and stopping while the player is next to it. Npcs further off keep the level
+of detail NpcGroup gives them, only moving every NPC_LOD_NEAR_INTERVAL or
+NPC_LOD_FAR_INTERVAL ticks, all the way they'd have walked since in one go (see
+{Crowd.advance}). Only the npcs near the screen then get a python update, to be put on
+screen, animated and given their speech bubbles, and followers are only sent after the
+player when it gets to another pathfinding cell.
+
+Paths are copied into the crowd when an npc joins, so an npc's points and speed have to
+be set by the time it's added to a group.
+"""
+import typing
+
+import pygame
+
+from cultivate import settings
+from cultivate.culling import SCREEN
+from cultivate.pathfinding import get_pathfinder
+from cultivate.settings import HEIGHT, WIDTH
+
+try:
+    import numpy
+except ImportError:  # npcs update one at a time without numpy (see NpcGroup)
+    numpy = None
+
+# npcs here stop for the player to talk to them
+NEAR_PLAYER = pygame.Rect(WIDTH//2 - 100, HEIGHT//2 - 100, 200, 200)
+# npcs get a python update (animated, with speech bubbles) here, a bit bigger than the
+# screen so they're animated by the time they walk on
+FULL_DETAIL = SCREEN.inflate(200, 200)
+# npcs off screen but within this are moved every NPC_LOD_NEAR_INTERVAL ticks
+NEAR_DETAIL = SCREEN.inflate(settings.NPC_LOD_NEAR_DISTANCE * 2, settings.NPC_LOD_NEAR_DISTANCE * 2)
+
+# Npc.get_images directions, by the number Crowd.step gives each npc
+DIRECTIONS = [None, 'right', 'left', 'backward', 'forward']
+
+FLOAT_COLUMNS = ("x", "y", "prev_x", "prev_y", "next_x", "next_y", "speed", "w", "h")
+INT_COLUMNS = ("start", "length", "waypoint", "moved", "due", "phase")
+BOOL_COLUMNS = ("cycles", "finished", "can_stop", "follows", "on_screen")
+
+
+def view(name: str) -> property:
+    """An npc attribute read from and written to the npc's row of its crowd, a plain attribute out of one."""
+    private = "_" + name
+
+    def get(npc):
+        if npc.crowd is None:
+            return getattr(npc, private)
+        return npc.crowd.columns[name][npc.slot].item()
+
+    def set(npc, value):
+        if npc.crowd is None:
+            setattr(npc, private, value)
+        else:
+            npc.crowd.columns[name][npc.slot] = value
+
+    return property(get, set)
+
+
+def overlapping(area: pygame.Rect, x, y, w, h):
+    """Which of the rects at ({x}, {y}) sized ({w}, {h}) overlap {area}, for arrays of them."""
+    return (x < area.right) & (x + w > area.left) & (y < area.bottom) & (y + h > area.top)
+
+
+class Crowd:
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        self.tick = 0
+        self.npcs = []
+        self.columns = {}
+        for names, dtype in ((FLOAT_COLUMNS, numpy.float64), (INT_COLUMNS, numpy.int64),
+                             (BOOL_COLUMNS, numpy.bool_)):
+            for name in names:
+                self.columns[name] = numpy.zeros(capacity, dtype)
+        # every path's points one after the other, an npc's row says where its own are
+        self.points_x = numpy.zeros(0)
+        self.points_y = numpy.zeros(0)
+        # where the viewport was when npcs were last put on screen
+        self.view = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        # the pathfinding cell followers were last sent to
+        self.followed = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, npc) -> None:
+        if self.size == len(self.columns["x"]):
+            for name, column in self.columns.items():
+                self.columns[name] = numpy.concatenate([column, numpy.zeros_like(column)])
+        slot = self.size
+        self.size += 1
+        self.npcs.append(npc)
+        row = {
+            "x": npc.x, "y": npc.y, "prev_x": npc.prev_x, "prev_y": npc.prev_y,
+            "next_x": npc.next_x, "next_y": npc.next_y, "speed": npc.speed,
+            "w": npc.rect.w, "h": npc.rect.h, "can_stop": npc.player_can_stop, "length": 0,
+            "follows": npc.follows_view, "on_screen": npc.on_screen,
+            "moved": self.tick, "due": self.tick + 1,
+            "phase": -1 if npc.lod_phase is None else npc.lod_phase,
+        }
+        for name, value in row.items():
+            self.columns[name][slot] = value
+        npc.crowd, npc.slot = self, slot
+        self.set_path(npc)
+        if npc.follows_view:
+            # to be sent after the player on the next step
+            self.followed = None
+
+    def set_path(self, npc) -> None:
+        """Copy {npc}'s points and how far along them it is into the crowd."""
+        if len(self.points_x) > 4 * self.columns["length"][:self.size].sum() + 1024:
+            self.compact()
+        slot = npc.slot
+        row = {
+            "start": len(self.points_x), "length": len(npc.points), "waypoint": npc.waypoint,
+            "cycles": npc.cycle_path, "finished": npc.finished,
+        }
+        for name, value in row.items():
+            self.columns[name][slot] = value
+        self.points_x = numpy.append(self.points_x, [x for x, _ in npc.points])
+        self.points_y = numpy.append(self.points_y, [y for _, y in npc.points])
+
+    def compact(self) -> None:
+        """Drop the points of paths nobody's walking any more."""
+        start, length = self.columns["start"][:self.size], self.columns["length"][:self.size]
+        kept = [numpy.arange(first, first + count) for first, count in zip(start.tolist(), length.tolist())]
+        kept = numpy.concatenate(kept) if kept else numpy.zeros(0, numpy.int64)
+        self.points_x = self.points_x[kept]
+        self.points_y = self.points_y[kept]
+        start[:] = numpy.cumsum(length) - length
+
+    def remove(self, npc) -> None:
+        """Take {npc} out, its attributes hold where it got to."""
+        slot = npc.slot
+        row = {name: column[slot].item() for name, column in self.columns.items()}
+        npc.crowd, npc.slot = None, None
+        for name in ("x", "y", "prev_x", "prev_y", "next_x", "next_y"):
+            setattr(npc, name, row[name])
+        npc.waypoint, npc.finished, npc.on_screen = row["waypoint"], row["finished"], row["on_screen"]
+        npc.lod_phase = None if row["phase"] < 0 else row["phase"]
+
+        # the last row fills the gap
+        self.size -= 1
+        last = self.npcs.pop()
+        if last is not npc:
+            for column in self.columns.values():
+                column[slot] = column[self.size]
+            self.npcs[slot] = last
+            last.slot = slot
+
+    def next_points(self, c: typing.Dict[str, numpy.ndarray], walking: numpy.ndarray) -> numpy.ndarray:
+        """Send the {walking} npcs on to their next point, return the ones at the end of a path that doesn't cycle."""
+        waypoint = c["waypoint"]
+        waypoint[walking] += 1
+        wrapped = walking & (waypoint == c["length"])
+        ended = wrapped & ~c["cycles"]
+        waypoint[wrapped & c["cycles"]] = 0
+        waypoint[ended] -= 1
+        c["finished"][ended] = True
+        going = walking & ~ended
+        point = c["start"][going] + waypoint[going]
+        c["next_x"][going] = self.points_x[point]
+        c["next_y"][going] = self.points_y[point]
+        return ended
+
+    def advance(self, c: typing.Dict[str, numpy.ndarray], walking: numpy.ndarray,
+                distance: numpy.ndarray) -> numpy.ndarray:
+        """Walk the {walking} npcs {distance} along their paths in one go, the way Npc.advance does.
+
+        Each pass takes every npc still walking one axis or one point further, so it
+        takes as many passes as the most points any of them crosses. Returns the npcs
+        that got to the end of a path that doesn't cycle.
+        """
+        x, y, next_x, next_y = c["x"], c["y"], c["next_x"], c["next_y"]
+        left = numpy.where(walking, distance, 0)
+        ended = numpy.zeros_like(walking)
+        while True:
+            going = left > 0
+            if not going.any():
+                return ended
+            along_x = going & (x != next_x)
+            along_y = going & ~along_x & (y != next_y)
+            for along, position, target in ((along_x, x, next_x), (along_y, y, next_y)):
+                step = numpy.minimum(numpy.abs(target[along] - position[along]), left[along])
+                position[along] += numpy.sign(target[along] - position[along]) * step
+                left[along] -= step
+            at_point = going & ~(along_x | along_y)
+            # a finished path, or one that stays put, goes no further
+            left[at_point & c["finished"]] = 0
+            stopped = self.next_points(c, at_point & ~c["finished"])
+            ended |= stopped
+            left[stopped] = 0
+            left[at_point & (next_x == x) & (next_y == y)] = 0
+
+    def step(self, viewport: pygame.Rect) -> None:
+        """Move the npcs due a move this tick, and update the ones near the screen for {viewport}."""
+        if not self.size:
+            return
+        self.tick += 1
+        tick = self.tick
+        c = {name: column[:self.size] for name, column in self.columns.items()}
+        x, y, next_x, next_y, speed = c["x"], c["y"], c["next_x"], c["next_y"], c["speed"]
+        c["prev_x"][:] = x
+        c["prev_y"][:] = y
+
+        # the npcs due a move: ones near the screen move a tick, after catching up if they've
+        # just come near it, the rest all the way they'd have walked since their last move
+        due = (c["due"] <= tick)
+        detailed = due & overlapping(FULL_DETAIL, x - viewport.x, y - viewport.y, c["w"], c["h"])
+        ended = self.advance(c, detailed & (c["moved"] < tick - 1), speed * (tick - 1 - c["moved"]))
+        due &= ~detailed
+        ended |= self.advance(c, due, speed * (tick - c["moved"]))
+
+        # where the npcs were drawn last tick, for stopping next to the player
+        near_player = overlapping(NEAR_PLAYER, x - self.view.x, y - self.view.y, c["w"], c["h"])
+        moving = detailed & ~(c["can_stop"] & near_player)
+
+        right = moving & (next_x > x + speed)
+        left = moving & ~right & (next_x < x - speed)
+        backward = moving & ~(right | left) & (next_y < y - speed)
+        forward = moving & ~(right | left | backward) & (next_y > y + speed)
+        arrived = moving & ~(right | left | backward | forward)
+        x += numpy.where(right, speed, 0) - numpy.where(left, speed, 0)
+        y += numpy.where(forward, speed, 0) - numpy.where(backward, speed, 0)
+        x[arrived] = next_x[arrived]
+        y[arrived] = next_y[arrived]
+        # on to the next point, or the end of a path that doesn't cycle
+        ended |= self.next_points(c, arrived & ~c["finished"])
+
+        # when each npc moves next, off screen ones spread over the ticks by their phase
+        c["moved"][detailed | due] = tick
+        c["due"][detailed] = tick + 1
+        near = overlapping(NEAR_DETAIL, x - viewport.x, y - viewport.y, c["w"], c["h"])
+        interval = numpy.where(near, settings.NPC_LOD_NEAR_INTERVAL, settings.NPC_LOD_FAR_INTERVAL)
+        phase = c["phase"]
+        first = due & (phase >= 0)
+        interval[first] = 1 + phase[first] % interval[first]
+        phase[first] = -1
+        c["due"][due] = tick + interval[due]
+
+        self.view = pygame.Rect(viewport)
+        screen_x = x - viewport.x
+        screen_y = y - viewport.y
+        on_screen = overlapping(FULL_DETAIL, screen_x, screen_y, c["w"], c["h"])
+        left_screen = c["on_screen"] & ~on_screen
+        c["on_screen"][:] = on_screen
+        direction = (right * 1 + left * 2 + backward * 3 + forward * 4)
+
+        npcs = self.npcs
+        for slot in numpy.flatnonzero(left_screen):
+            npcs[slot].rect.topleft = (screen_x[slot].item(), screen_y[slot].item())
+        shown = numpy.flatnonzero(on_screen)
+        frames = {}
+        for slot, rect_x, rect_y, heading in zip(shown.tolist(), screen_x[shown].tolist(),
+                                            screen_y[shown].tolist(), direction[shown].tolist()):
+            npcs[slot].show(rect_x, rect_y, DIRECTIONS[heading], frames)
+        # picked out first, an npc at the end of its path may leave the crowd
+        for npc in [npcs[slot] for slot in numpy.flatnonzero(ended)]:
+            npc.reached_end()
+
+        # followers head for the player whenever they get to another cell
+        followed = get_pathfinder().cell_at(*viewport.center)
+        if followed != self.followed:
+            self.followed = followed
+            for npc in [npcs[slot] for slot in numpy.flatnonzero(c["follows"])]:
+                npc.follow(*viewport.center)
+
+
+def make_crowd() -> typing.Optional[Crowd]:
+    """A crowd for a group of npcs, None unless NPC_CROWD is on and numpy is installed."""
+    return Crowd() if settings.NPC_CROWD and numpy is not None else None
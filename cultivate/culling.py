@@ -0,0 +1,81 @@
+import collections
+import itertools
+import typing
+
+import pygame
+
+from cultivate import settings
+
+SCREEN = pygame.Rect(0, 0, settings.WIDTH, settings.HEIGHT)
+
+
+def world_rect(sprite) -> pygame.Rect:
+    """The map rect of a sprite that keeps its map position in {x}, {y}."""
+    return pygame.Rect(sprite.x, sprite.y, sprite.rect.w, sprite.rect.h)
+
+
+def on_screen(sprites: typing.Iterable) -> list:
+    """Keep the sprites that are (partly) on screen, in order.
+
+    Sprite rects are already relative to the viewport. Sprites that draw outside their
+    rect (npc speech bubbles) expose the full area as {bounds}.
+    """
+    return [sprite for sprite in sprites if SCREEN.colliderect(getattr(sprite, "bounds", sprite.rect))]
+
+
+class SpatialHash:
+    """Bucket map rects into a grid, so a viewport query only looks at the cells it covers.
+
+    Items come back in the order they were inserted, so draw order is kept.
+    """
+
+    def __init__(self, cell_size: int = None):
+        self.cell_size = settings.CULL_CELL_SIZE if cell_size is None else cell_size
+        self.cells = collections.defaultdict(list)
+        self.rects = {}
+        self.order = {}
+        # insertion numbers, never reused so a removal can't make two items tie
+        self.inserted = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def cells_for(self, rect: pygame.Rect) -> typing.Iterator[typing.Tuple[int, int]]:
+        size = self.cell_size
+        for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cell_x, cell_y
+
+    def insert(self, item, rect: pygame.Rect) -> None:
+        if item in self.rects:
+            self.remove(item)
+        self.rects[item] = pygame.Rect(rect)
+        self.order[item] = next(self.inserted)
+        for cell in self.cells_for(rect):
+            self.cells[cell].append(item)
+
+    def remove(self, item) -> None:
+        rect = self.rects.pop(item)
+        del self.order[item]
+        for cell in self.cells_for(rect):
+            self.cells[cell].remove(item)
+            if not self.cells[cell]:
+                del self.cells[cell]
+
+    def move(self, item, rect: pygame.Rect) -> None:
+        """Update the rect of {item}, only re-bucketing it when it changes cells."""
+        old = self.rects[item]
+        if list(self.cells_for(old)) == list(self.cells_for(rect)):
+            old.update(rect)
+            return
+        order = self.order[item]
+        self.insert(item, rect)
+        self.order[item] = order
+
+    def query(self, rect: pygame.Rect) -> list:
+        found = {}
+        for cell in self.cells_for(rect):
+            for item in self.cells.get(cell, ()):
+                if item not in found and self.rects[item].colliderect(rect):
+                    found[item] = None
+        return sorted(found, key=self.order.__getitem__)
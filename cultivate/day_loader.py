@@ -0,0 +1,49 @@
+import typing
+
+from pygame.sprite import Group, Sprite
+
+from cultivate.npc import NpcGroup
+
+DIRECTIONS = [None, 'forward', 'backward', 'left', 'right']
+
+
+class DayLoader:
+    """Build a day's npcs and pickups a few at a time while the screen fades out.
+
+    The new groups are only handed over once everything is built, so the sprites
+    on screen never change mid-fade.
+    """
+
+    def __init__(self, npc_factories: typing.List[typing.Callable[[], Sprite]],
+                 pickup_factories: typing.List[typing.Callable[[], Sprite]]):
+        self.npc_sprites = NpcGroup()
+        self.pickups = Group()
+        self._pending = [(self.npc_sprites, factory) for factory in npc_factories]
+        self._pending += [(self.pickups, factory) for factory in pickup_factories]
+
+    @property
+    def done(self) -> bool:
+        return not self._pending
+
+    def step(self, count: int = 1) -> None:
+        """Build the next {count} sprites and warm the images they will animate with."""
+        for _ in range(count):
+            if not self._pending:
+                return
+            group, factory = self._pending.pop(0)
+            sprite = factory()
+            self.warm(sprite)
+            group.add(sprite)
+
+    def finish(self) -> typing.Tuple[Group, Group]:
+        while self._pending:
+            self.step()
+        return self.npc_sprites, self.pickups
+
+    @staticmethod
+    def warm(sprite: Sprite) -> None:
+        # npc animations are cached per direction, load them all now rather than on first step
+        get_images = getattr(sprite, 'get_images', None)
+        if get_images is not None:
+            for direction in DIRECTIONS:
+                get_images(direction=direction)
@@ -0,0 +1,138 @@
+"""Day definitions: the day's task, what spawns and what gets said, read from data files.
+
+Each day is a JSON file in settings.DAYS_DIR, day_0.json onwards:
+
+    task            name of the day's task
+    conversation    what the quester says about it
+    npcs, pickups   [type name, *constructor args] for everything spawned at the start of the day
+    tour            (day 0) [{building, conversation}], said when the player reaches {building}
+    finale          (last day) the cult leader's intro, and a verdict for each day's task
+
+Before building the package they are compiled into one file (settings.DAYS_PACK, little endian):
+
+    header   b"CDAY", version (H), day count (I)
+    index    per day: task name length (H), task name (utf-8), offset (Q), length (Q)
+    data     each day's compact JSON, zlib compressed
+
+Only the index is read up front, days are loaded when they're needed and dropped once the
+game has moved past them. Without the compiled file (e.g. in development) the JSON is read.
+"""
+import glob
+import json
+import os
+import struct
+import sys
+import typing
+import zlib
+from functools import lru_cache
+
+from cultivate import settings
+
+MAGIC = b"CDAY"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+ENTRY_POSITION = struct.Struct("<QQ")
+
+Day = typing.Dict[str, typing.Any]
+
+
+def find_days(days_dir: str) -> typing.List[str]:
+    """Return the day files in {days_dir}, in day order."""
+    paths = glob.glob(os.path.join(days_dir, "day_*.json"))
+    return sorted(paths, key=lambda path: int(os.path.basename(path)[4:-5]))
+
+
+def read_day(path: str) -> Day:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Days:
+    """Load day definitions from the compiled file at {path}, or the JSON in {days_dir} without it."""
+
+    def __init__(self, path: str = None, days_dir: str = None):
+        path = settings.DAYS_PACK if path is None else path
+        days_dir = settings.DAYS_DIR if days_dir is None else days_dir
+        self.loaded = {}
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                self._data = f.read()
+            self.tasks, self._index = self.read_index(self._data)
+            self._paths = None
+        else:
+            self._data = None
+            self._paths = find_days(days_dir)
+            self.tasks = [read_day(path)["task"] for path in self._paths]
+
+    @staticmethod
+    def read_index(data: bytes) -> typing.Tuple[typing.List[str], typing.List[typing.Tuple[int, int]]]:
+        magic, version, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} days file")
+        tasks, index = [], []
+        position = HEADER.size
+        for _ in range(count):
+            name_length, = struct.unpack_from("<H", data, position)
+            position += 2
+            tasks.append(data[position:position + name_length].decode("utf-8"))
+            position += name_length
+            index.append(ENTRY_POSITION.unpack_from(data, position))
+            position += ENTRY_POSITION.size
+        return tasks, index
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __getitem__(self, day: int) -> Day:
+        if day not in self.loaded:
+            if self._paths is not None:
+                self.loaded[day] = read_day(self._paths[day])
+            else:
+                offset, length = self._index[day]
+                self.loaded[day] = json.loads(zlib.decompress(self._data[offset:offset + length]))
+        return self.loaded[day]
+
+    def focus(self, day: int) -> None:
+        """Keep {day} and the one after it loaded, and drop the rest."""
+        wanted = [d for d in (day, day + 1) if d < len(self)]
+        self.loaded = {d: self.loaded[d] for d in wanted if d in self.loaded}
+        for d in wanted:
+            self[d]
+
+    def conversation(self, task: str) -> typing.List[dict]:
+        """What the quester says about {task}."""
+        return self[self.tasks.index(task)]["conversation"]
+
+
+@lru_cache(None)
+def get_days() -> Days:
+    return Days()
+
+
+def build(days_dir: str, output_path: str) -> int:
+    """Compile every day in {days_dir} into {output_path} and return the day count."""
+    days = [read_day(path) for path in find_days(days_dir)]
+    names = [day["task"].encode("utf-8") for day in days]
+    blobs = [zlib.compress(json.dumps(day, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 9)
+             for day in days]
+
+    offset = HEADER.size + sum(2 + len(name) + ENTRY_POSITION.size for name in names)
+    with open(output_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(days)))
+        for name, blob in zip(names, blobs):
+            f.write(struct.pack("<H", len(name)) + name)
+            f.write(ENTRY_POSITION.pack(offset, len(blob)))
+            offset += len(blob)
+        for blob in blobs:
+            f.write(blob)
+    return len(days)
+
+
+def main(argv=sys.argv[1:]):
+    output_path = argv[0] if argv else settings.DAYS_PACK
+    count = build(settings.DAYS_DIR, output_path)
+    print(f"Compiled {count} days into {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import pygame
-from cultivate.loader import get_conversation_box
-from cultivate.settings import WIDTH, HEIGHT, MD_FONT
+from cultivate.loader import get_conversation_box, render_text
+from cultivate import settings
+from cultivate.settings import WIDTH, HEIGHT
 
 FOREGROUND = pygame.Color(0, 0, 0)
 DE_EMPH = pygame.Color("black")
@@ -49,13 +50,13 @@ class Dialogue:
         self.padding = 10
 
     def set_data(self, npc_name, text, responses):
-        font_width, font_height = MD_FONT.size(text)
+        font_width, font_height = settings.MD_FONT.size(text)
         self.render = self.image.copy()
 
         pd = self.padding
 
         self.render.blit(
-            MD_FONT.render(npc_name, True, FOREGROUND),
+            render_text(settings.MD_FONT, npc_name, True, FOREGROUND),
             (pd, pd)
         )
 
@@ -67,11 +68,11 @@ class Dialogue:
             (self.width - self.padding * 2),
             (self.height - self.padding * 2),
         )
-        text_height, _ = drawText(self.render, text, FOREGROUND, text_rect, MD_FONT)
+        text_height, _ = drawText(self.render, text, FOREGROUND, text_rect, settings.MD_FONT)
         text_height += pd
 
         for idx, (key, response_text) in enumerate(responses):
-            self.render.blit(MD_FONT.render(
+            self.render.blit(render_text(settings.MD_FONT,
                 f'{idx+1} => {response_text}', True, FOREGROUND),
                 (
                     pd,
@@ -80,9 +81,9 @@ class Dialogue:
             )
 
         quit_msg = 'press q to quit'
-        quit_width, quit_height = MD_FONT.size(quit_msg)
+        quit_width, quit_height = settings.MD_FONT.size(quit_msg)
         self.render.blit(
-            MD_FONT.render(quit_msg, True, DE_EMPH),
+            render_text(settings.MD_FONT, quit_msg, True, DE_EMPH),
             (
                 self.width - pd - quit_width,
                 self.height - pd - quit_height,
@@ -0,0 +1,160 @@
+"""Draw at the logical resolution (settings.WIDTH x HEIGHT) and present it to a window of any size.
+
+Everything in the game is positioned in logical pixels, so it always draws to a back buffer
+of that size. Presenting it is either left to SDL (pygame.SCALED) or done here with a nearest
+neighbour scale into the window, so fill rate doesn't grow with the window.
+
+With a RENDER_SCALE below 1 the world is drawn to a smaller layer and scaled up under the
+ui, which is still drawn at the logical resolution (see {world_layer}).
+
+This module mirrors pygame.display: call {flip} and {update} instead of pygame's once {init} has run.
+"""
+import math
+import typing
+
+import pygame
+
+from cultivate import settings
+
+SCALED = "scaled"  # let SDL scale to the window, resizable and letterboxed
+NEAREST = "nearest"  # scale to fit the window, keeping the aspect ratio
+INTEGER = "integer"  # scale by the largest whole factor that fits, so pixels stay square
+MODES = (SCALED, NEAREST, INTEGER)
+
+
+def parse_size(text: str) -> typing.Tuple[int, int]:
+    """Parse a "WIDTHxHEIGHT" size."""
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+class Display:
+    def __init__(self, window_size: typing.Tuple[int, int] = None, scale_mode: str = None, pacer=None,
+                 render_scale: float = None):
+        scale_mode = settings.SCALE_MODE if scale_mode is None else scale_mode
+        if scale_mode not in MODES:
+            raise ValueError(f"Unknown scale mode {scale_mode!r}, expected one of {', '.join(MODES)}")
+        render_scale = settings.RENDER_SCALE if render_scale is None else render_scale
+        if not 0 < render_scale <= 1:
+            raise ValueError(f"Render scale {render_scale} out of range, expected more than 0 and at most 1")
+        self.logical_size = (settings.WIDTH, settings.HEIGHT)
+        self.window_size = window_size or settings.WINDOW_SIZE or self.logical_size
+        self.scale_mode = scale_mode
+        set_mode = pacer.set_mode if pacer else pygame.display.set_mode
+
+        if scale_mode == SCALED:
+            self.window = set_mode(self.logical_size, pygame.SCALED | pygame.RESIZABLE)
+        elif self.window_size == self.logical_size:
+            self.window = set_mode(self.logical_size)
+        else:
+            self.window = set_mode(self.window_size, pygame.RESIZABLE)
+
+        if self.window.get_size() == self.logical_size:
+            # drawn straight to the window, nothing to scale
+            self.buffer = self.window
+        else:
+            self.buffer = pygame.Surface(self.logical_size).convert()
+        self.dest = None
+
+        self.render_scale = render_scale
+        if render_scale == 1:
+            self.world = None
+        else:
+            self.world = pygame.Surface([math.ceil(side * render_scale) for side in self.logical_size]).convert()
+            # the world scaled up, when only part of it can be copied to the buffer
+            self.upscaled = pygame.Surface(self.logical_size).convert()
+
+    @property
+    def direct(self) -> bool:
+        return self.buffer is self.window
+
+    def fit(self, window_size: typing.Tuple[int, int]) -> pygame.Rect:
+        """The window area the buffer is scaled to."""
+        (width, height), (window_width, window_height) = self.logical_size, window_size
+        factor = min(window_width / width, window_height / height)
+        if self.scale_mode == INTEGER and factor >= 1:
+            factor = int(factor)
+        dest = pygame.Rect(0, 0, int(width * factor), int(height * factor))
+        dest.center = (window_width // 2, window_height // 2)
+        return dest
+
+    def present(self) -> None:
+        window_size = self.window.get_size()
+        if self.dest is None or self.dest.size != self.fit(window_size).size or \
+                self.dest.center != (window_size[0] // 2, window_size[1] // 2):
+            # the window was resized, clear the letterbox bars
+            self.dest = self.fit(window_size)
+            self.window.fill(pygame.Color("black"))
+        pygame.transform.scale(self.buffer, self.dest.size, self.window.subsurface(self.dest))
+
+    def flip(self) -> None:
+        if not self.direct:
+            self.present()
+        pygame.display.flip()
+
+    def update(self, rects: typing.List[pygame.Rect]) -> None:
+        if self.direct:
+            pygame.display.update(rects)
+        else:
+            # the scale is cheap compared to drawing, so present the whole buffer
+            self.flip()
+
+    def show_world(self, screen: pygame.Surface) -> None:
+        """Scale the world layer up onto {screen}, keeping to its clip."""
+        if screen.get_clip() == screen.get_rect():
+            pygame.transform.scale(self.world, self.logical_size, screen)
+        else:
+            pygame.transform.scale(self.world, self.logical_size, self.upscaled)
+            screen.blit(self.upscaled, (0, 0))
+
+    def to_logical(self, position: typing.Tuple[int, int]) -> typing.Tuple[int, int]:
+        """Map a window position (e.g. the mouse) to the back buffer."""
+        if self.direct or self.dest is None:
+            return position
+        return ((position[0] - self.dest.x) * self.logical_size[0] // self.dest.w,
+                (position[1] - self.dest.y) * self.logical_size[1] // self.dest.h)
+
+
+_display = None
+
+
+def init(window_size: typing.Tuple[int, int] = None, scale_mode: str = None, pacer=None) -> pygame.Surface:
+    """Open the window and return the logical back buffer to draw on."""
+    global _display
+    _display = Display(window_size, scale_mode, pacer)
+    return _display.buffer
+
+
+def get_display() -> typing.Optional[Display]:
+    return _display
+
+
+def flip() -> None:
+    if _display:
+        _display.flip()
+    else:
+        pygame.display.flip()
+
+
+def update(rects: typing.List[pygame.Rect]) -> None:
+    if _display:
+        _display.update(rects)
+    else:
+        pygame.display.update(rects)
+
+
+def world_layer(screen: pygame.Surface) -> typing.Tuple[pygame.Surface, float]:
+    """The surface to draw the world on instead of {screen}, and the scale to draw it at."""
+    if _display and _display.world is not None:
+        return _display.world, _display.render_scale
+    return screen, 1.0
+
+
+def show_world(screen: pygame.Surface) -> None:
+    """Put the world drawn on {world_layer} on {screen}, before the ui goes on top."""
+    if _display and _display.world is not None:
+        _display.show_world(screen)
+
+
+def to_logical(position: typing.Tuple[int, int]) -> typing.Tuple[int, int]:
+    return _display.to_logical(position) if _display else position
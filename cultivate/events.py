@@ -0,0 +1,32 @@
+import collections
+import typing
+
+# events and what they're published with
+ITEM_CREATED = "item_created"  # (item) a pickup appeared on the map: made, dropped or spawned mid-day
+ITEM_REMOVED = "item_removed"  # (item) a pickup left the map: picked up or used up
+GRAVE_DUG = "grave_dug"  # (grave)
+GRAVE_PLANTED = "grave_planted"  # (grave)
+MADLIBS_EDITED = "madlibs_edited"  # (madlibs)
+INTERACTION_STOPPED = "interaction_stopped"  # () the player closed a conversation or the prayer
+DAY_STARTED = "day_started"  # (day) the player went to bed, the next day fades in
+
+
+class EventBus:
+    """Let game state react when something happens, instead of checking for it every frame.
+
+    Handlers run straight away, in the order they subscribed.
+    """
+
+    def __init__(self):
+        self.handlers = collections.defaultdict(list)
+
+    def subscribe(self, event: str, handler: typing.Callable) -> None:
+        self.handlers[event].append(handler)
+
+    def unsubscribe(self, event: str, handler: typing.Callable) -> None:
+        self.handlers[event].remove(handler)
+
+    def publish(self, event: str, *args) -> None:
+        # copied, a handler may unsubscribe
+        for handler in list(self.handlers.get(event, ())):
+            handler(*args)
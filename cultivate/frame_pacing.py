@@ -0,0 +1,84 @@
+import collections
+import logging
+import typing
+
+import pygame
+
+from cultivate import settings
+
+CAPPED = "capped"
+VSYNC = "vsync"
+UNCAPPED = "uncapped"
+ADAPTIVE = "adaptive"
+MODES = (CAPPED, VSYNC, UNCAPPED, ADAPTIVE)
+
+
+def percentile(values: typing.Iterable[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class FramePacer:
+    """Decide how long each frame waits before the next one.
+
+    capped      sleep to settings.FPS (the old behaviour)
+    vsync       let the display flip wait for the monitor, falls back to capped if unsupported
+    uncapped    never wait, for benchmarking
+    adaptive    capped, but drops to settings.ADAPTIVE_FALLBACK_FPS while the p95 of the
+                time spent working each frame is over the settings.FPS budget
+
+    The simulation runs in fixed ticks, so the frame rate only changes how smooth it looks.
+    """
+
+    def __init__(self, mode: str = None):
+        mode = settings.FPS_MODE if mode is None else mode
+        if mode not in MODES:
+            raise ValueError(f"Unknown fps mode {mode!r}, expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.clock = pygame.time.Clock()
+        self.target = None if mode in (VSYNC, UNCAPPED) else settings.FPS
+        # milliseconds spent working each frame, not counting the wait
+        self.work_times = collections.deque(maxlen=settings.FRAME_TIME_WINDOW)
+
+    def set_mode(self, size: typing.Tuple[int, int], flags: int = 0) -> pygame.Surface:
+        if self.mode == VSYNC:
+            try:
+                return pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                logging.warning("vsync is not available (%s), capping at %d fps instead", e, settings.FPS)
+                self.mode = CAPPED
+                self.target = settings.FPS
+        return pygame.display.set_mode(size, flags)
+
+    @property
+    def p95(self) -> float:
+        return percentile(self.work_times, 0.95)
+
+    def tick(self) -> int:
+        """Wait for the next frame, return the milliseconds since the last one."""
+        elapsed = self.clock.tick(self.target) if self.target else self.clock.tick()
+        self.work_times.append(self.clock.get_rawtime())
+        if self.mode == ADAPTIVE:
+            self.adapt()
+        return elapsed
+
+    def adapt(self) -> None:
+        if len(self.work_times) < self.work_times.maxlen:
+            return
+        budget = 1000 / settings.FPS
+        if self.target == settings.FPS and self.p95 > budget:
+            self.set_target(settings.ADAPTIVE_FALLBACK_FPS)
+        elif self.target != settings.FPS and self.p95 < budget * 0.75:
+            # only go back up with some headroom, so we don't flip between the two
+            self.set_target(settings.FPS)
+
+    def set_target(self, fps: int) -> None:
+        logging.debug("Frame pacing target %d -> %d fps (p95 %.1fms)", self.target, fps, self.p95)
+        self.target = fps
+        self.work_times.clear()
+
+    def describe(self) -> str:
+        target = f"{self.target} fps" if self.target else "no cap"
+        return f"{self.mode} ({target}) p95 {self.p95:.1f}ms"
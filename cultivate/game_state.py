@@ -1,27 +1,47 @@
 from collections import namedtuple
+from functools import partial
+from cultivate import events
+from cultivate.events import EventBus
+from cultivate.days import get_days
 from cultivate.npc import Susan, NpcFollower, NpcQuester, CultLeader, Pentagram
-from cultivate.tasks import task_conversations
 from cultivate.transition import Fader
-from cultivate.settings import WIDTH, HEIGHT
-from cultivate.sprites.grave import Grave
-from cultivate.sprites.desk import Desk
 from cultivate.sprites import pickups as pickupables
 from cultivate.final_cutscene import FinalCutscene
-
-from pygame.sprite import Group
+from cultivate.day_loader import DayLoader
+from cultivate.task_tracking import TRACKERS
+from cultivate.timeline import Timeline
+from cultivate.timers import get_timers
 
 TaskStatus = namedtuple('TaskStatus', 'completed sabotaged')
 
+# npcs the day files can spawn by name
+NPC_TYPES = {npc.__name__: npc for npc in (Susan, NpcFollower, NpcQuester, CultLeader, Pentagram)}
+
 class GameState:
     def __init__(self, day=0):
         self.day = day
-        tasks_todo = list(task_conversations.keys())
+        self.days = get_days()
+        self.days.focus(day)
+        tasks_todo = list(self.days.tasks)
         self.current_task = tasks_todo[day]
         self.tasks_todo = tasks_todo[day+1:]
         self.task_status = [TaskStatus(False, False)] * 6
         self.playthroughs = 0
 
         self.fader = Fader()
+        self.day_loader = None
+        self.music = None  # set by main once the mixer is up
+
+        self.events = EventBus()
+        self.static_interactables = None  # set by main once the map is built
+        self.task_tracker = None
+        self.npc_sprites = None
+        self.pickups = None
+        # the game clock, a new game mustn't fire anything left from the last one
+        self.timers = get_timers()
+        self.timers.clear()
+        # cutscenes, stepped once a tick
+        self.timeline = Timeline(self.timers)
 
         self.final_cutscene = False
         self.madlib_text = "1\n2\n\n3\n4\n5\n6\n\n7\n\n"
@@ -29,91 +49,75 @@ class GameState:
     def next_day(self):
         if self.fader.fading:
             return
+        self.stop_task_tracker()
         self.day += 1
+        self.days.focus(self.day)
         if self.tasks_todo:
             self.current_task = self.tasks_todo[0]
             self.tasks_todo = self.tasks_todo[1:]
         self.fader.start()
+        if self.music:
+            self.music.play_day(self.day)
+        self.events.publish(events.DAY_STARTED, self.day)
+        # build the next day's items during the fade, they are swapped in once the screen is black
+        self.day_loader = DayLoader(*self.day_spawns(self.day))
+
+    def day_spawns(self, day):
+        """Return factories for the npcs and pickups of {day}, so they can be built later."""
+        spawns = self.days[day]
+        npc_factories = [self.npc_factory(name, *args) for name, *args in spawns['npcs']]
+        pickup_factories = [partial(getattr(pickupables, name), *args) for name, *args in spawns['pickups']]
+        return npc_factories, pickup_factories
+
+    def npc_factory(self, name, *args):
+        if name == 'CultLeader':
+            # runs the finale, so it needs to know how the days went
+            return partial(CultLeader, *args, self)
+        return partial(NPC_TYPES[name], *args)
 
     def get_day_items(self):
-        self.npc_sprites = Group()
-        self.pickups = Group()
-
-        if self.day == 0:
-            # show the newcomers around
-            self.npc_sprites = Group([
-                NpcFollower(WIDTH * 3/2-50, HEIGHT *3/2-50),
-                NpcFollower(WIDTH * 3/2-70, HEIGHT *3/2-70),
-                NpcFollower(WIDTH * 3/2-55, HEIGHT *3/2-100),
-                NpcFollower(WIDTH * 3/2-100, HEIGHT *3/2-60),
-                NpcFollower(WIDTH * 3/2+25, HEIGHT *3/2+55),
-                NpcFollower(WIDTH * 3/2+50, HEIGHT *3/2+100)
-            ])
-
-
-        if self.day == 1:
-            # dig the grave
-            self.npc_sprites = Group([NpcQuester()])
-            self.pickups = Group([
-                pickupables.Shovel(1770, 480),
-                *[pickupables.Flower(3000 + (i * 100), 700) for i in range(6)],
-            ])
-
-        if self.day == 2:
-            # make lemonade
-            self.npc_sprites = Group([Susan(), NpcQuester()])
-            self.pickups = Group([
-                pickupables.Lemon(1860, 1650),
-                pickupables.EmptyBucket(2000, 590),
-                pickupables.Sugar(1850, 1555),
-                pickupables.RatPoison(1922, 1545),
-            ])
-
-        if self.day == 3:
-            # do laundry
-            self.npc_sprites = Group([NpcQuester()])
-            self.pickups = Group([
-                pickupables.EmptyBucket(2000, 590),
-                pickupables.Soap(2000, 525),
-                pickupables.RedSock(1900, 500),
-                pickupables.DirtyRobes(1900, 500),
-            ])
-
-        if self.day == 4:
-            # make candles
-            self.npc_sprites = Group([NpcQuester()])
-            self.pickups = Group([
-                pickupables.EmptyBucket(2000, 590),
-                pickupables.BeesWax(1890, 510),
-                pickupables.BlackDye(1930, 515),
-                pickupables.EssenceOfCinnamon(1970, 510),
-            ])
-
-        if self.day == 5:
-            # edit prayer sheet
-            self.npc_sprites = Group([NpcQuester()])
-
-        if self.day == 6:
-            # summoning ritual
-            self.npc_sprites = Group([
-                NpcQuester(),
-                CultLeader(3000, 1500, self),
-                Pentagram()
-            ])
-
+        """Build the current day's items straight away."""
+        self.day_loader = DayLoader(*self.day_spawns(self.day))
+        return self.swap_day_items()
+
+    def swap_day_items(self):
+        """Finish building the next day's items and make them the current ones."""
+        if self.npc_sprites:
+            # the day's over, so are its npcs' timers
+            self.npc_sprites.empty()
+        self.npc_sprites, self.pickups = self.day_loader.finish()
+        self.day_loader = None
+        self.start_task_tracker()
         return self.npc_sprites, self.pickups
 
+    def start_task_tracker(self):
+        self.stop_task_tracker()
+        tracker = TRACKERS.get(self.day)
+        if tracker and self.static_interactables is not None:
+            self.task_tracker = tracker(self, self.pickups, self.static_interactables)
+
+    def stop_task_tracker(self):
+        if self.task_tracker:
+            self.task_tracker.stop()
+            self.task_tracker = None
+
     def trigger_final_cutscene(self):
         if not self.final_cutscene:
             self.final_cutscene = True
             self._cutscene = FinalCutscene(self.npc_sprites, self.pickups, self)
+            self.timeline.start(self._cutscene.run())
+            if self.music:
+                self.music.play_finale()
 
     def is_day_done(self):
         return self.task_status[self.day].completed or self.task_status[self.day].sabotaged
 
     def update(self, viewport):
-        if self.final_cutscene:
-            self._cutscene.update(viewport)
+        self.fader.update()
+        if self.day_loader:
+            self.day_loader.step()
+        self.timers.advance()
+        self.timeline.update()
 
     def key_press(self, key):
         if not self.final_cutscene:
@@ -122,61 +126,6 @@ class GameState:
         self._cutscene.key_press(key)
         return True
 
-    def update_task_status(self, pickups, static_interactables):
-        if self.day == 0:
-            pass
-        elif self.day == 1:
-            dug = 0
-            sabotaged = 0
-            for item in static_interactables:
-                if isinstance(item, Grave):
-                    if item.dug:
-                        dug += 1
-                    if item.planted:
-                        sabotaged += 1
-            if dug == 6:
-                self.complete_task()
-            if sabotaged == 6:
-                self.sabotage_task()
-
-        elif self.day == 2:
-            has_lemonade = False
-            has_empty_ratpoison = False
-            for item in pickups:
-                if isinstance(item, pickupables.Lemonade):
-                    has_lemonade = True
-                elif isinstance(item, pickupables.EmptyBottle):
-                    has_empty_ratpoison = True
-            if has_lemonade:
-                self.complete_task()
-            if has_lemonade and has_empty_ratpoison:
-                self.sabotage_task()
-
-        elif self.day == 3:
-            for item in pickups:
-                if isinstance(item, pickupables.WhiteRobes):
-                    self.complete_task()
-                elif isinstance(item, pickupables.PinkRobes):
-                    self.sabotage_task()
-
-        elif self.day == 4:
-            for item in pickups:
-                if isinstance(item, pickupables.BlackCandles):
-                    self.complete_task()
-                elif isinstance(item, pickupables.ScentedBlackCandles):
-                    self.sabotage_task()
-
-        elif self.day == 5:
-            for item in static_interactables:
-                if isinstance(item, Desk):
-                    madlibs = item.madlibs
-                    if madlibs.edited and madlibs.correct:
-                        self.complete_task()
-                        self.madlib_text = madlibs.unformattted_prose.format_map(madlibs.changed_words)
-                    elif madlibs.edited and not madlibs.correct:
-                        self.sabotage_task()
-                        self.madlib_text = madlibs.unformattted_prose.format_map(madlibs.changed_words)
-
     def complete_task(self):
         self.task_status[self.day] = TaskStatus(True, self.task_status[self.day].sabotaged)
 
@@ -197,3 +146,11 @@ class GameState:
     def draw(self, surface):
         if self.final_cutscene:
             self._cutscene.draw(surface)
+
+    @property
+    def cutscene(self):
+        return self._cutscene if self.final_cutscene else None
+
+    @property
+    def draw_state(self):
+        return self._cutscene.draw_state if self.final_cutscene else None
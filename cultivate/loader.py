@@ -1,38 +1,80 @@
 import os
+import typing
 from functools import lru_cache
 
 import pygame
 import pyganim
-import random
 
-from cultivate import settings
+from cultivate import settings, terrain
+from cultivate.asset_pack import AssetPack
+from cultivate.palettes import PALETTES, recolour
 
 # todo: the spritesheets may be loaded from disk multiple tiles
 
 
 @lru_cache(None)
-def get_music(path: str) -> pygame.mixer.Sound:
+def get_asset_pack() -> typing.Optional[AssetPack]:
+    """Return the packed assets, or None when running from loose files (e.g. in development)."""
+    if not os.path.exists(settings.ASSET_PACK):
+        return None
+    return AssetPack(settings.ASSET_PACK)
+
+
+def asset(path: str) -> typing.Union[str, typing.BinaryIO]:
+    """Return what pygame should load {path} from: the asset pack if it has it, otherwise the loose file."""
+    pack = get_asset_pack()
+    if pack is not None:
+        name = os.path.relpath(path, settings.ROOT_ASSETS_DIR).replace(os.sep, "/")
+        if name in pack:
+            return pack.open(name)
+    return path
+
+
+def get_music(path: str) -> typing.Union[str, typing.BinaryIO]:
+    """Return a source for pygame.mixer.music to stream {path} from.
+
+    Not cached: every load needs its own file object to read from.
+    """
     path = path.replace("/", os.sep).replace("\\", os.sep)
     path = os.path.join(settings.MUSIC_DIR, path)
-    return pygame.mixer.Sound(path)
+    return asset(path)
 
 
 @lru_cache(None)
 def get_sound(path: str) -> pygame.mixer.Sound:
     path = path.replace("/", os.sep).replace("\\", os.sep)
     path = os.path.join(settings.SOUNDS_DIR, path)
-    return pygame.mixer.Sound(path)
+    return pygame.mixer.Sound(asset(path))
 
 
 @lru_cache(None)
 def get_font(filename: str, size: int) -> pygame.font.Font:
     path = os.path.join(settings.FONTS_DIR, filename)
-    return pygame.font.Font(path, size)
+    return pygame.font.Font(asset(path), size)
+
+@lru_cache(settings.TEXT_CACHE_SIZE)
+def _render_text(font: pygame.font.Font, text: str, antialias: bool, color: tuple) -> pygame.Surface:
+    return font.render(text, antialias, color)
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color) -> pygame.Surface:
+    """Render {text}, reusing the surface from the last time the same text was rendered.
+
+    The surface is shared: blit it, don't draw on it.
+    """
+    return _render_text(font, text, antialias, tuple(color))
+
+
+def text_cache_hit_rate() -> float:
+    info = _render_text.cache_info()
+    lookups = info.hits + info.misses
+    return info.hits / lookups if lookups else 0.0
+
 
 @lru_cache(None)
 def get_image(path: str, has_alpha: bool = False) -> pygame.Surface:
     canonicalized_path = path.replace('/', os.sep).replace('\\', os.sep)
-    image = pygame.image.load(canonicalized_path)
+    image = pygame.image.load(asset(canonicalized_path))
     if has_alpha:
         image.convert_alpha()
     else:
@@ -44,17 +86,12 @@ def get_image(path: str, has_alpha: bool = False) -> pygame.Surface:
 def get_grass(width: int, height: int) -> pygame.Surface:
     # load the grass tile from the sprite sheet
     grass_tile = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'foliage4.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'foliage4.png')),
         rects=[(269, 333, 16, 16)])[0].convert()
 
-    # create a blank surface to paint with grass
+    # create a blank surface and paint it with grass
     grass = pygame.Surface((width, height), pygame.SRCALPHA, 32).convert()
-
-    # paint grass tiles onto surface
-    for i in range(0, width, 16):
-        for j in range(0, height, 16):
-            grass.blit(grass_tile, (i, j))
-    return grass
+    return terrain.tile(grass, grass_tile)
 
 
 @lru_cache(None)
@@ -65,99 +102,95 @@ def get_river(height):
         (112, 48, 16, 16)  # right river
     ]
     images = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'river1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'river1.png')),
         rects=tiles)
     for image in images:
         image.convert_alpha()
     river = pygame.Surface((128, height), pygame.SRCALPHA, 32).convert_alpha()
 
-    # make left column
-    for i in range(0, height, 16):
-        river.blit(images[0], (0, i))
-        for j in range(0, 96, 16):
-            river.blit(images[1], ((16 + j), i))
-        river.blit(images[2], (112, i))
-    return river
+    # one row of left bank, water and right bank, then repeat it down
+    row = pygame.Surface((128, 16), pygame.SRCALPHA, 32).convert_alpha()
+    row.blits([(images[0], (0, 0)), *[(images[1], (16 + j, 0)) for j in range(0, 96, 16)], (images[2], (112, 0))])
+    return terrain.tile(river, row)
 
 
 @lru_cache(None)
 def get_floor(width: int, height: int) -> pygame.Surface:
     # load the floor tile from the sprite sheet
     floor_tile = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'floors1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'floors1.png')),
         rects=[(0, 0, 16, 16)])[0].convert()
 
     # create a blank surface to tile
     floor = pygame.Surface((width, height), pygame.SRCALPHA, 32).convert()
+    return terrain.tile(floor, floor_tile)
+
+# where each direction's row starts in a character's tile list
+ROWS = {'forward': 0, 'left': 3, 'right': 6, 'backward': 9}
+# frames of a row played by a walk cycle, stepping back to the standing frame in between
+WALK_CYCLE = (0, 1, 0, 2)
+
+CHARS1_TILES = (
+    (3, 130, 25, 36),  # facing forward
+    (27, 130, 25, 36),
+    (52, 130, 25, 36),
+    (3, 166, 24, 34),  # facing backwards
+    (27, 166, 26, 36),
+    (52, 166, 26, 36),
+    (3, 202, 25, 34),  # facing to the right
+    (27, 202, 25, 34),
+    (52, 202, 25, 34),
+    (3, 236, 25, 34),  # facing to the left
+    (27, 236, 25, 34),
+    (52, 236, 25, 34),
+)
+CHARS1_ROWS = {'forward': 0, 'backward': 3, 'right': 6, 'left': 9}
+# bottom left character of the 96x128 character sheets
+LOWER_LEFT_TILES = (
+    (1, 128, 30, 32),  # forward
+    (33, 128, 30, 32),
+    (66, 128, 30, 32),
+    (1, 160, 30, 32),  # left
+    (33, 160, 30, 32),
+    (66, 160, 30, 32),
+    (1, 192, 30, 32),  # right
+    (33, 192, 30, 32),
+    (66, 192, 30, 32),
+    (0, 224, 30, 32),  # backward
+    (33, 224, 30, 32),
+    (66, 224, 30, 32),
+)
+
+
+@lru_cache(None)
+def get_character_tiles(filename: str, tiles: typing.Tuple[typing.Tuple[int, int, int, int], ...],
+                        palette: str = None) -> typing.List[pygame.Surface]:
+    """Cut {tiles} out of a sprite sheet, recoloured with a palette from palettes.PALETTES.
+
+    Variants share the tiles of the base sheet, so each sheet is only decoded once.
+    """
+    if palette is not None:
+        return [recolour(tile, PALETTES[palette]) for tile in get_character_tiles(filename, tiles)]
+    return pyganim.getImagesFromSpriteSheet(
+        asset(os.path.join(settings.SPRITES_DIR, filename)),
+        rects=list(tiles))
+
+
+def animate_character(char_tiles: typing.List[pygame.Surface], direction: str, duration: int,
+                      rows: typing.Dict[str, int] = ROWS, cycle: typing.Tuple[int, ...] = WALK_CYCLE):
+    """Walk animation for {direction}, or the first standing frame when there is no direction."""
+    if direction in rows:
+        dir_tiles = [char_tiles[rows[direction] + frame] for frame in cycle]
+    else:
+        dir_tiles = [char_tiles[0]]
+    animChar = pyganim.PygAnimation([(tile, duration) for tile in dir_tiles])
+    animChar.play()
+    return animChar
 
-    # tile the floor
-    for i in range(0, height, 16):
-        for j in range(0, width, 16):
-            floor.blit(floor_tile, (i, j))
-    return floor
 
 @lru_cache(None)
 def get_character(filename, direction):
-    tiles = [
-        (3, 130, 25, 36),  # facing forward
-        (27, 130, 25, 36),
-        (52, 130, 25, 36),
-        (3, 166, 24, 34),  # facing backwards
-        (27, 166, 26, 36),
-        (52, 166, 26, 36),
-        (3, 202, 25, 34),  # facing to the right
-        (27, 202, 25, 34),
-        (52, 202, 25, 34),
-        (3, 236, 25, 34),  # facing to the right
-        (27, 236, 25, 34),
-        (52, 236, 25, 34)
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, filename),
-        rects=tiles)
-    for tile in char_tiles:
-        tile.convert_alpha()
-    character = pygame.Surface(
-        (23, 34), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[0],
-            char_tiles[2]
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[3],
-            char_tiles[5]
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[6],
-            char_tiles[8]
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[9],
-            char_tiles[11]
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [100, 100, 100, 100]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-
-    return animChar
+    return animate_character(get_character_tiles(filename, CHARS1_TILES), direction, 100, rows=CHARS1_ROWS)
 
 @lru_cache(None)
 def get_player(direction=None):
@@ -169,243 +202,51 @@ def get_npc(direction=None):
 
 @lru_cache(None)
 def get_npc2(direction=None):
-    tiles = [
-        (1, 128, 30, 32), # forward
-        (33, 128, 30, 32),
-        (66, 128, 30, 32),
-        (1, 160, 30, 32), # left
-        (33, 160, 30, 32),
-        (66, 160, 30, 32),
-        (1, 192, 30, 32), # right
-        (33, 192, 30, 32),
-        (66, 192, 30, 32),
-        (0, 224, 30, 32), # backward
-        (33, 224, 30, 32),
-        (66, 224, 30, 32)
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "chars5.png"),
-        rects=tiles)
-    character = pygame.Surface(
-        (30, 32), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[0],
-            char_tiles[2],
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[9],
-            char_tiles[11],
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[6],
-            char_tiles[8],
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[3],
-            char_tiles[5],
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [200, 200, 200, 200]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-    return animChar
+    return animate_character(get_character_tiles("chars5.png", LOWER_LEFT_TILES), direction, 200)
 
 @lru_cache(None)
 def get_npc5(direction=None):
-    tiles = [
-        (98, 0, 30, 32), # forward
+    tiles = (
+        (98, 0, 30, 32),  # forward
         (130, 0, 30, 32),
         (161, 0, 30, 32),
-        (98, 34, 30, 32), # left
+        (98, 34, 30, 32),  # left
         (130, 34, 30, 32),
         (161, 34, 30, 32),
-        (98, 65, 30, 32), # right
+        (98, 65, 30, 32),  # right
         (130, 65, 30, 32),
         (161, 65, 30, 32),
-        (98, 98, 30, 32), # right
+        (98, 98, 30, 32),  # backward
         (130, 98, 30, 32),
         (161, 98, 30, 32),
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "chars2.png"),
-        rects=tiles)
-    character = pygame.Surface(
-        (30, 32), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[0],
-            char_tiles[2],
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[9],
-            char_tiles[11],
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[6],
-            char_tiles[8],
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[3],
-            char_tiles[5],
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [150, 150, 150, 150]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-    return animChar
+    )
+    return animate_character(get_character_tiles("chars2.png", tiles), direction, 150)
 
 @lru_cache(None)
 def get_npc_innocent(direction=None):
-    tiles = [
-        (1, 128, 30, 32), # forward
-        (33, 128, 30, 32),
-        (66, 128, 30, 32),
-        (1, 160, 30, 32), # left
-        (33, 160, 30, 32),
-        (66, 160, 30, 32),
-        (1, 192, 30, 32), # right
-        (33, 192, 30, 32),
-        (66, 192, 30, 32),
-        (0, 224, 30, 32), # backward
-        (33, 224, 30, 32),
-        (66, 224, 30, 32)
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "chars9.png"),
-        rects=tiles)
-    character = pygame.Surface(
-        (30, 32), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[0],
-            char_tiles[2],
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[9],
-            char_tiles[11],
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[6],
-            char_tiles[8],
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[3],
-            char_tiles[5],
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [200, 200, 200, 200]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-    return animChar
+    return animate_character(get_character_tiles("chars9.png", LOWER_LEFT_TILES), direction, 200)
 
 @lru_cache(None)
 def get_npc3(direction=None):
-    tiles = [
-        (193, 128, 30, 32), # forward
+    tiles = (
+        (193, 128, 30, 32),  # forward
         (225, 128, 30, 32),
         (257, 128, 30, 32),
-        (193, 160, 30, 32), # left
+        (193, 160, 30, 32),  # left
         (225, 160, 30, 32),
         (257, 160, 30, 32),
-        (193, 192, 30, 32), # right
+        (193, 192, 30, 32),  # right
         (225, 192, 30, 32),
         (257, 192, 30, 32),
-        (193, 224, 30, 32), # backward
+        (193, 224, 30, 32),  # backward
         (225, 224, 30, 32),
-        (257, 224, 30, 32)
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "chars5.png"),
-        rects=tiles)
-    character = pygame.Surface(
-        (30, 32), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[2]
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[11]
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[8]
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[5]
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [100, 100, 100]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-    return animChar
+        (257, 224, 30, 32),
+    )
+    return animate_character(get_character_tiles("chars5.png", tiles), direction, 100, cycle=(0, 1, 2))
 
 @lru_cache(None)
 def get_npc_cat(direction=None):
-    tiles = [
+    tiles = (
         (435, 12, 42, 42),
         (483, 12, 42, 42),
         (530, 12, 42, 42),
@@ -418,50 +259,12 @@ def get_npc_cat(direction=None):
         (435, 156, 42, 42),
         (483, 156, 42, 42),
         (530, 156, 42, 42),
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "cats1.png"),
-        rects=tiles)
-    character = pygame.Surface(
-        (30, 32), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[2]
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[11]
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[8]
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[5]
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [100, 100, 100]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-    return animChar
+    )
+    return animate_character(get_character_tiles("cats1.png", tiles), direction, 100, cycle=(0, 1, 2))
 
 @lru_cache(None)
 def get_npc4(direction=None):
-    tiles = [
+    tiles = (
         (99, 2, 27, 31),
         (131, 2, 27, 31),
         (163, 2, 27, 31),
@@ -473,233 +276,83 @@ def get_npc4(direction=None):
         (163, 66, 27, 31),
         (99, 98, 27, 31),
         (131, 98, 27, 31),
-        (163, 98, 27, 31)
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "chars6.png"),
-        rects=tiles)
-    character = pygame.Surface(
-        (30, 32), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[2]
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[11]
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[8]
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[5]
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [100, 100, 100]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-    return animChar
+        (163, 98, 27, 31),
+    )
+    return animate_character(get_character_tiles("chars6.png", tiles), direction, 100, cycle=(0, 1, 2))
 
 @lru_cache(None)
 def get_npc_white_robes(direction=None):
-    tiles = [
-        (1, 128, 30, 32), # forward
-        (33, 128, 30, 32),
-        (66, 128, 30, 32),
-        (1, 160, 30, 32), # left
-        (33, 160, 30, 32),
-        (66, 160, 30, 32),
-        (1, 192, 30, 32), # right
-        (33, 192, 30, 32),
-        (66, 192, 30, 32),
-        (0, 224, 30, 32), # backward
-        (33, 224, 30, 32),
-        (66, 224, 30, 32)
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "chars10.png"),
-        rects=tiles)
-    character = pygame.Surface(
-        (30, 32), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[0],
-            char_tiles[2],
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[9],
-            char_tiles[11],
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[6],
-            char_tiles[8],
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[3],
-            char_tiles[5],
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [150, 150, 150, 150]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-    return animChar
+    return animate_character(get_character_tiles("chars10.png", LOWER_LEFT_TILES), direction, 150)
 
 @lru_cache(None)
 def get_npc_pink_robes(direction=None):
-    tiles = [
-        (1, 128, 30, 32), # forward
-        (33, 128, 30, 32),
-        (66, 128, 30, 32),
-        (1, 160, 30, 32), # left
-        (33, 160, 30, 32),
-        (66, 160, 30, 32),
-        (1, 192, 30, 32), # right
-        (33, 192, 30, 32),
-        (66, 192, 30, 32),
-        (0, 224, 30, 32), # backward
-        (33, 224, 30, 32),
-        (66, 224, 30, 32)
-    ]
-    char_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "pink_chars.png"),
-        rects=tiles)
-    character = pygame.Surface(
-        (30, 32), pygame.SRCALPHA, 32).convert_alpha()
-
-    if direction == 'forward':
-        dir_tiles = [
-            char_tiles[0],
-            char_tiles[1],
-            char_tiles[0],
-            char_tiles[2],
-        ]
-    elif direction == 'backward':
-        dir_tiles = [
-            char_tiles[9],
-            char_tiles[10],
-            char_tiles[9],
-            char_tiles[11],
-        ]
-    elif direction == 'right':
-        dir_tiles = [
-            char_tiles[6],
-            char_tiles[7],
-            char_tiles[6],
-            char_tiles[8],
-        ]
-    elif direction == 'left':
-        dir_tiles = [
-            char_tiles[3],
-            char_tiles[4],
-            char_tiles[3],
-            char_tiles[5],
-        ]
-    else:
-        dir_tiles = [
-            char_tiles[0]
-            ]
-    frames = list(zip(dir_tiles,
-                      [150, 150, 150, 150]))
-    animChar = pyganim.PygAnimation(frames)
-    animChar.play()
-    return animChar
+    return animate_character(get_character_tiles("chars10.png", LOWER_LEFT_TILES, "pink_robes"), direction, 150)
 
 @lru_cache(None)
 def get_laundry_basin():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'food1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'food1.png')),
         rects=[(160, 285, 32, 35)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_lemonade_glass():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'food1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'food1.png')),
         rects=[(196, 258, 10, 14)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_lemonade_pitcher():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'food1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'food1.png')),
         rects=[(227, 290, 18, 21)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_rat_poison():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(325, 224, 15, 17)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_empty_bottle():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(272, 385, 15, 17)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_lemonade_stand():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'food1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'food1.png')),
         rects=[(192, 161, 65, 86)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_sock():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'fairytale1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'fairytale1.png')),
         rects=[(259, 128, 20, 22)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_stained_glass_window():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'fairytale2.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'fairytale2.png')),
         rects=[(225, 111, 31, 69)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_desk():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'library1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'library1.png')),
         rects=[(192, 277, 64, 64)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_prayer_edits():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'library1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'library1.png')),
         rects=[(415, 224, 34, 29)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_prayer_scroll():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'library1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'library1.png')),
         rects=[(479, 223, 33, 34)])[0].convert_alpha()
 
 @lru_cache(None)
@@ -708,7 +361,7 @@ def get_bridge():
         (416, 32, 44, 32)
     ]
     images = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'foliage1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'foliage1.png')),
         rects=tiles)
     for image in images:
         image.convert_alpha()
@@ -722,33 +375,33 @@ def get_bridge():
 @lru_cache(None)
 def get_basin_water():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'food1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'food1.png')),
         rects=[(159, 157, 33, 38)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_basin_empty():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'food2.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'food2.png')),
         rects=[(159, 157, 33, 38)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_dirt_path():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'foliage4.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'foliage4.png')),
         rects=[(130, 0, 28, 32)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_weed():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "foliage2.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "foliage2.png")),
         rects=[(131, 453, 58, 58)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_walls(width):
     wall_tile = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'walls2.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'walls2.png')),
         rects=[(64, 0, 64, 64)])[0].convert()
     wall = pygame.Surface((width, 64), pygame.SRCALPHA, 32).convert()
     for i in range(0, width, 64):
@@ -758,7 +411,7 @@ def get_walls(width):
 @lru_cache(None)
 def get_walls_edge(height):
     wall_tile = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'walls2.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'walls2.png')),
         rects=[(64, 0, 12, 64)])[0].convert()
     wall = pygame.Surface((12, height), pygame.SRCALPHA, 32).convert()
     for i in range(0, height, 64):
@@ -767,7 +420,7 @@ def get_walls_edge(height):
 
 
 @lru_cache(None)
-def get_forest(width, height):
+def get_forest_tiles() -> typing.List[pygame.Surface]:
     tiles = [
         (0, 220, 130, 130),
         # this is the annoyingly long one in case you were wondering
@@ -776,52 +429,22 @@ def get_forest(width, height):
         (133, 226, 120, 126)
     ]
     forest_tile = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'foliage2.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'foliage2.png')),
         rects=tiles)
     for tile in forest_tile:
         tile.convert_alpha()
-    forest = pygame.Surface(
-        (width, height), pygame.SRCALPHA, 32).convert_alpha()
-
-    # for top edge
-    for i in range(0, width, 100):
-        forest.blit(forest_tile[1], (i, -50))
-        forest.blit(random.choice(forest_tile),
-                    (i+random.randint(-30, 0), 0+random.randint(-20, 20)))
-        forest.blit(random.choice(forest_tile),
-                    (i+random.randint(-30, 0), 150+random.randint(-20, 20)))
-        forest.blit(random.choice([forest_tile[0], forest_tile[2], forest_tile[3]]), (
-            i+random.randint(-25, 25), 250+random.randint(-25, 25)))
-    # left edge
-    for i in range(0, height, 100):
-        forest.blit(forest_tile[1], (-50, i+random.randint(-30, 0)))
-        for i_x in range(50, 450, 90):
-            forest.blit(random.choice(forest_tile),
-                        (i_x+random.randint(-30, 30), i+random.randint(-30, 0)))
-    # right edge
-    for i in range(0, height, 100):
-        forest.blit(forest_tile[1], (width-100, i+random.randint(-30, 0)))
-        for i_x in range(50, 550, 90):
-            forest.blit(random.choice(forest_tile), ((width - i_x) +
-                                                     random.randint(-30, 30), i+random.randint(-30, 0)))
-    # bottom edge
-    for i in range(0, width, 100):
-        for i_y in range(50, 400, 90):
-            forest.blit(random.choice(
-                forest_tile), (i+random.randint(-30, 0), (width - i_y)+random.randint(-30, 30)))
-        forest.blit(forest_tile[1], (i, height-100))
-    return forest
+    return forest_tile
 
 
 @lru_cache(None)
 def get_lemon():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "food1.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "food1.png")),
         rects=[(55, 180, 8, 8)])[0].convert_alpha()
 
 
 @lru_cache(None)
-def get_vegetables(width, height):
+def get_vegetables(width, height, seed=None):
     tiles = [
         (10, 99, 41, 30),
         (10, 130, 41, 31),
@@ -831,15 +454,16 @@ def get_vegetables(width, height):
         (10, 256, 41, 30)
     ]
     veg_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "food1.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "food1.png")),
         rects=tiles)
     for tile in veg_tiles:
         tile.convert_alpha()
     vegetables = pygame.Surface(
         (width, height), pygame.SRCALPHA, 32).convert_alpha()
+    rng = terrain.stage_rng(seed, "vegetables")
     for i in range(50, width-30, 30):
-        vegetables.blit(random.choice(veg_tiles), (0, i))
-        vegetables.blit(random.choice(veg_tiles), (width-40, i))
+        vegetables.blit(rng.choice(veg_tiles), (0, i))
+        vegetables.blit(rng.choice(veg_tiles), (width-40, i))
     return vegetables
 
 @lru_cache(None)
@@ -853,7 +477,7 @@ def get_lemon_basket():
         (10, 256, 41, 30)
     ]
     veg_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "food1.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "food1.png")),
         rects=tiles)
     for tile in veg_tiles:
         tile.convert_alpha()
@@ -869,7 +493,7 @@ def get_stone_cross_floor(width, height):
     ]
     height_prop = int((height - 32) * 7 / 16)
     images = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'floors1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'floors1.png')),
         rects=tiles)
     for image in images:
         image.convert_alpha()
@@ -899,7 +523,7 @@ def get_stone_cross_wall(width, height):
 
     height_prop = int((height - 32) * 7 / 16)
     images = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'walls2.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'walls2.png')),
         rects=tiles)
     for image in images:
         image.convert_alpha()
@@ -960,14 +584,14 @@ def get_stone_cross_wall(width, height):
 @lru_cache(None)
 def get_altar():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "library1.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "library1.png")),
         rects=[(352, 294, 36, 48)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_pews():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "foliage1.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "foliage1.png")),
         rects=[(128, 460, 64, 16)])[0].convert_alpha()
 
 @lru_cache(None)
@@ -1009,59 +633,61 @@ def get_dirt(width: int, height: int) -> pygame.Surface:
         (145, 65, 33, 33)
     ]
     dirt_tile = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'foliage4.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'foliage4.png')),
         rects=tiles)
     for tile in dirt_tile:
         tile.convert_alpha()
     dirt = pygame.Surface((width, height), pygame.SRCALPHA, 32).convert_alpha()
 
+    # the tiles overlap and are partly transparent, so they're drawn in one batch but in
+    # the same order (and as many times) as they always were to keep the look
+    placements = []
     for i in range(0, width, 33):
         for j in range(0, height, 33):
-            dirt.blit(dirt_tile[5], (0, i))
-            dirt.blit(dirt_tile[0], (i, j))
-            dirt.blit(dirt_tile[7], (width-33, j))
-        dirt.blit(dirt_tile[6], (i, 0))
-        dirt.blit(dirt_tile[8], (i, height-30))
-    dirt.blit(dirt_tile[1], (0,0))
-    dirt.blit(dirt_tile[2], (width-33, 0))
-    dirt.blit(dirt_tile[3], (0, height-33))
-    dirt.blit(dirt_tile[4], (width-33, height-33))
-    return dirt
+            placements += [(dirt_tile[5], (0, i)), (dirt_tile[0], (i, j)), (dirt_tile[7], (width-33, j))]
+        placements += [(dirt_tile[6], (i, 0)), (dirt_tile[8], (i, height-30))]
+    placements += [
+        (dirt_tile[1], (0, 0)),
+        (dirt_tile[2], (width-33, 0)),
+        (dirt_tile[3], (0, height-33)),
+        (dirt_tile[4], (width-33, height-33)),
+    ]
+    return terrain.draw(dirt, placements)
 
 @lru_cache(None)
 def get_bed() -> pygame.Surface:
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "apothecary1.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "apothecary1.png")),
         rects=[(192, 430, 32, 64)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_sideways_bed() -> pygame.Surface:
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "apothecary1.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "apothecary1.png")),
         rects=[(256, 186, 58, 38)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_grave() -> pygame.Surface:
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "foliage5.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "foliage5.png")),
         rects=[(65, 131, 63, 60)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_dug_grave() -> pygame.Surface:
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "foliage6.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "foliage6.png")),
         rects=[(65, 131, 63, 60)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_planted_grave() -> pygame.Surface:
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "grave.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "grave.png")),
         rects=[(96, 144, 47, 46)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_shovel() -> pygame.Surface:
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "shovel.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "shovel.png")),
         rects=[(2, 2, 13, 50)])[0].convert_alpha()
 
 @lru_cache(None)
@@ -1072,7 +698,7 @@ def get_fire():
         (128, 20, 64, 64)
     ]
     fire_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "fire3.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "fire3.png")),
         rects=tiles)
     frames = list(zip(fire_tiles,
                       [100, 100, 100]))
@@ -1083,19 +709,19 @@ def get_fire():
 @lru_cache(None)
 def get_tool_sign():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'building_signs.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'building_signs.png')),
         rects=[(240, 62, 48, 34)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_clothes_sign():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'building_signs.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'building_signs.png')),
         rects=[(96, 110, 48, 31)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_stores_sign():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'building_signs.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'building_signs.png')),
         rects=[(144, 110, 48, 31)])[0].convert_alpha()
 
 
@@ -1103,69 +729,69 @@ def get_stores_sign():
 @lru_cache(None)
 def get_cage():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(482, 253, 31, 39)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_carpet():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(100, 353, 90, 63)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_cans():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(194, 222, 31, 39)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_boxes():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(382, 35, 62, 64)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_bear():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(291, 97, 27, 35)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_library_sign():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'building_signs.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'building_signs.png')),
         rects=[(144, 159, 48, 34)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_painting():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'library1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'library1.png')),
         rects=[(34, 4, 63, 29)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_shelf_m():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'library1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'library1.png')),
         rects=[(31, 42, 64,72)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_shelf_l():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'library1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'library1.png')),
         rects=[(128, 46, 129,68)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_laundry_dirty():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(10, 200, 53, 35)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_laundry_clean_white():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(65, 201, 25, 24)])[0].convert_alpha()
 
 @lru_cache(None)
@@ -1181,71 +807,71 @@ def get_laundry_clean_pink():
 @lru_cache(None)
 def get_laundry_clean_other():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(65, 261, 32, 232)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_sugar():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(357, 391, 23, 16)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_soap():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(235, 298, 19, 23)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_gravestone1():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'grave.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'grave.png')),
         rects=[(58, 341, 36, 48)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_gravestone2():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'grave.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'grave.png')),
         rects=[(57, 387, 38, 48)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_gravestone3():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'grave.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'grave.png')),
         rects=[(105, 338, 35, 48)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_gravestone4():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'grave.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'grave.png')),
         rects=[(105, 338, 35, 48)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_gravestone5():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'grave.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'grave.png')),
         rects=[(55, 49, 37, 51)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_candles_black():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(70, 488, 21, 23)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_candles_white():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(2, 487, 23, 26)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_candles_pink():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'attic1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'attic1.png')),
         rects=[(0, 456, 23, 26)])[0].convert_alpha()
 
 @lru_cache(None)
-def get_garden(width, height):
+def get_garden_tiles() -> typing.List[pygame.Surface]:
     tiles = [
         (3, 227, 31, 28),
         (32, 255, 31, 28),
@@ -1255,99 +881,85 @@ def get_garden(width, height):
         (132, 288, 59, 35),
     ]
     garden_tile = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'foliage1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'foliage1.png')),
         rects=tiles)
     for tile in garden_tile:
         tile.convert_alpha()
-    garden = pygame.Surface(
-        (width, height), pygame.SRCALPHA, 32).convert_alpha()
-
-    # for top edge
-    for i in range(0, width, 60):
-        garden.blit(random.choice(garden_tile),
-                (i+random.randint(0, 5), 0+random.randint(0, 10)))
-        garden.blit(random.choice(garden_tile),
-                (i+random.randint(0, 5), 0+random.randint(0, 10)))
-    for j in range(0, height, 60):
-        garden.blit(random.choice(garden_tile),
-                (0+random.randint(0, 10), j+random.randint(0, 5)))
-        garden.blit(random.choice(garden_tile),
-                (width-60+random.randint(0, 10), j+random.randint(0, 5)))
-    return garden
+    return garden_tile
 
 @lru_cache(None)
 def get_plant1():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'nature.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'nature.png')),
         rects=[(241, 531, 47, 43)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_plant2():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'nature.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'nature.png')),
         rects=[(584, 143, 40, 45)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_plant3():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'nature.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'nature.png')),
         rects=[(342, 193, 35, 50)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_plant4():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'nature.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'nature.png')),
         rects=[(485, 478, 40, 54)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_plant5():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'nature.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'nature.png')),
         rects=[(344, 592, 28, 34)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_plant6():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'nature.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'nature.png')),
         rects=[(344, 592, 28, 34)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_plant7():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'nature.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'nature.png')),
         rects=[(59, 251, 33, 46)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_herbs():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(256, 18, 58, 33)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_cabinet():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(133, 10, 56, 71)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_kitchen_sign():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'building_signs.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'building_signs.png')),
         rects=[(0, 158, 48, 36)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_bed_sign():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'building_signs2.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'building_signs2.png')),
         rects=[(144, 158, 48, 31)])[0].convert_alpha()
 
 
 @lru_cache(None)
 def get_sheet():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(278, 227, 40, 30)])[0].convert_alpha()
 
 @lru_cache(None)
@@ -1362,7 +974,7 @@ def get_demon():
         (355, 129, 30, 34)
     ]
     demon_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "chars6.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "chars6.png")),
         rects=tiles)
     frames = list(zip(demon_tiles,
                       [100, 100, 100]))
@@ -1396,7 +1008,7 @@ def get_demon_fire():
         (200, 400, 100, 100),
     ]
     demon_tiles = pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, "sunburst.png"),
+        asset(os.path.join(settings.SPRITES_DIR, "sunburst.png")),
         rects=tiles)
     frames = list(zip(demon_tiles,
                       [100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100, 100]))
@@ -1407,23 +1019,23 @@ def get_demon_fire():
 @lru_cache(None)
 def get_melted_wax():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(419, 68, 27, 26)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_brown_jar():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(393, 327, 15, 17)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_pestle_and_mortar():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'apothecary1.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'apothecary1.png')),
         rects=[(422, 224, 21, 20)])[0].convert_alpha()
 
 @lru_cache(None)
 def get_pentagram():
     return pyganim.getImagesFromSpriteSheet(
-        os.path.join(settings.SPRITES_DIR, 'pentagram.png'),
+        asset(os.path.join(settings.SPRITES_DIR, 'pentagram.png')),
         rects=[(0, 0, 800, 800)])[0].convert_alpha()
@@ -7,22 +7,26 @@ import copy
 
 import pygame
 
-from cultivate import loader, settings
+from cultivate import events, loader, settings
+from cultivate.audio import KEYSTROKE, get_audio
 
 class Madlibs:
     text_color = pygame.Color("black")
     text_editable_color = pygame.Color("0x4c60b3")
     text_editing_color = pygame.Color("0xa94cb3")
 
-    def __init__(self, format_string: str, format_dict: collections.OrderedDict, expected_changes: collections.OrderedDict):
+    def __init__(self, format_string: str, format_dict: collections.OrderedDict, expected_changes: collections.OrderedDict,
+                 event_bus: events.EventBus = None):
         """
         :param format_string: a format with named parameters that the player can change
         :param format_dict: containing default values for all the format parameters
+        :param event_bus: told about every edit, if given
         """
         self.unformattted_prose = format_string
         self.original_words = format_dict
         self.changed_words = copy.deepcopy(self.original_words)
         self.expected_changes = expected_changes
+        self.event_bus = event_bus
         self.selected_word_index = 0
         self.editable_words = len(format_dict.keys())
         # test that format_dict has all the required format parameters
@@ -153,6 +157,7 @@ class Madlibs:
             word = self.changed_words[selected_word]
             self.changed_words[selected_word] = word[:-1]
             # self.pencil_sound.play()
+            self.publish_edit()
 
         letter = pygame.key.name(key)
         if letter in string.ascii_lowercase:
@@ -160,4 +165,10 @@ class Madlibs:
             if pressed[pygame.K_LSHIFT] or pressed[pygame.K_RSHIFT]:
                 letter = letter.upper()
             self.changed_words[selected_word] += letter
-            self.pencil_sound.play()
+            # fast typing overlaps two strokes at most, the oldest restarts for a third
+            get_audio().play(self.pencil_sound, KEYSTROKE, max_voices=2)
+            self.publish_edit()
+
+    def publish_edit(self) -> None:
+        if self.event_bus:
+            self.event_bus.publish(events.MADLIBS_EDITED, self)
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 import contextlib
 import logging
+import random
+import struct
 import sys
+import time
 import typing
 
 from itertools import chain
@@ -11,17 +14,25 @@ with contextlib.redirect_stdout(None):
     import pygame
     from pygame.sprite import Group
 
-from cultivate import settings
-from cultivate.loader import get_dirt, get_font, get_grass, get_music
+from cultivate import display, events, save, settings
+from cultivate.loader import get_dirt, get_font, get_grass, render_text, text_cache_hit_rate
 from cultivate.map import Map
 from cultivate.game_state import GameState
+from cultivate.music import MusicPlayer
+from cultivate.audio import get_audio, init_mixer
+from cultivate.frame_pacing import FramePacer
+from cultivate.renderer import DirtyRectRenderer, DirtyState
+from cultivate.culling import on_screen
+from cultivate.render_queue import ACTORS, RenderQueue
 from cultivate.sprites.pickups import BasePickUp
+from cultivate.sprites.grave import Grave
 from cultivate.player import Player
 from cultivate.tooltip import Tooltip, InventoryBox, InfoBox
 from cultivate.exc import DemonSummoned, SummoningSabotaged
 
 K_INTERACT = pygame.K_x
 K_QUIT_INTERACTION = pygame.K_q
+K_SAVE = pygame.K_F5
 
 
 def main(argv=sys.argv[1:]):
@@ -40,10 +51,50 @@ def main(argv=sys.argv[1:]):
     else:
         current_day = 0
 
+    if "--audio-buffer" in argv:
+        settings.AUDIO_BUFFER = int(argv[argv.index('--audio-buffer') + 1])
+
+    if "--window" in argv:
+        settings.WINDOW_SIZE = display.parse_size(argv[argv.index('--window') + 1])
+    if "--scale-mode" in argv:
+        settings.SCALE_MODE = argv[argv.index('--scale-mode') + 1]
+    if "--render-scale" in argv:
+        settings.RENDER_SCALE = float(argv[argv.index('--render-scale') + 1])
+
+    if "--crowd" in argv:
+        settings.NPC_CROWD = True
+
+    if "--seed" in argv:
+        # any int names a world, wrapped to the unsigned 64 bits a save keeps it in
+        settings.WORLD_SEED = int(argv[argv.index('--seed') + 1]) % save.SEED_RANGE
+    elif settings.WORLD_SEED is None:
+        settings.WORLD_SEED = random.randrange(2 ** 32)
+    saved = None
+    if "--load" in argv:
+        try:
+            saved = save.load(settings.SAVE_FILE)
+        except (OSError, ValueError, struct.error) as e:
+            # missing on the first run, or from another version of the game
+            logging.warning("No usable save in %s (%s), starting a new game", settings.SAVE_FILE, e)
+        else:
+            settings.WORLD_SEED = saved.seed
+            current_day = saved.day
+    logging.info("World seed %d", settings.WORLD_SEED)
+
+    pacer = FramePacer(argv[argv.index('--fps-mode') + 1] if "--fps-mode" in argv else None)
+
     # init
-    screen, clock = init_game()
+    screen, clock = init_game(pacer)
     game_state, player, game_map, tooltip_bar, inventory, info_box, static_interactables = init_state(current_day)
+    game_state.music = MusicPlayer()
+    game_state.music.play_day(current_day)
     npc_sprites, pickups = game_state.get_day_items()
+    if saved:
+        save.restore(saved, game_state, player, game_map, inventory, pickups)
+    # save at the start of each day, the day's pickups come from its spawns
+    game_state.events.subscribe(
+        events.DAY_STARTED,
+        lambda day: save.save(settings.SAVE_FILE, save.snapshot(game_state, player, game_map)))
 
     # show intro screen
     update(game_state, player, game_map, tooltip_bar, npc_sprites, pickups, static_interactables)
@@ -51,39 +102,54 @@ def main(argv=sys.argv[1:]):
         draw_callable = lambda: draw(screen, player, game_map, game_state, tooltip_bar, inventory, info_box, npc_sprites, pickups)
         intro(screen, clock, draw_callable)
 
+    renderer = DirtyRectRenderer()
+    tick = 1 / settings.TICK_RATE
+    accumulator = 0.0
+    previous_time = time.perf_counter()
+
     # main loop
     try:
         while True:
+            now = time.perf_counter()
+            accumulator += min(now - previous_time, settings.MAX_FRAME_TIME)
+            previous_time = now
+
             # handle events
             for event in pygame.event.get():
                 handle_event(event, player, game_map, game_state, inventory, static_interactables, pickups)
 
-            # transition day
-            if game_state.day != current_day and game_state.fader.black:
-                npc_sprites, pickups = game_state.get_day_items()
-                current_day = game_state.day
+            # apply volume changes queued since the last frame
+            get_audio().flush()
 
-            # update
-            update(game_state, player, game_map, tooltip_bar, npc_sprites, pickups, static_interactables)
+            # update in fixed ticks, however long the last frame took
+            while accumulator >= tick:
+                # transition day
+                if game_state.day != current_day and game_state.fader.black:
+                    npc_sprites, pickups = game_state.swap_day_items()
+                    current_day = game_state.day
 
-            # draw
-            draw(screen, player, game_map, game_state, tooltip_bar, inventory, info_box, npc_sprites, pickups)
+                update(game_state, player, game_map, tooltip_bar, npc_sprites, pickups, static_interactables)
+                accumulator -= tick
+            # how far we are between the last tick and the next one
+            alpha = accumulator / tick
 
-            # display FPS
+            # draw, only the parts of the screen that changed when the camera is still
+            fps_str = None
             if settings.DEBUG:
-                fps_str = f"FPS: {clock.get_fps():.2f}"
-                fps_surface = settings.SM_FONT.render(fps_str, True, pygame.Color("black"))
-                screen.blit(fps_surface, (settings.WIDTH // 2 - fps_surface.get_rect().w, fps_surface.get_rect().h))
-
-            # fade screen on day transition
-            if game_state.fader.fading:
-                game_state.fader.draw(screen)
-
-            # display new draws
-            pygame.display.flip()
+                fps_str = f"FPS: {clock.get_fps():.0f} {pacer.describe()} text cache hits: {text_cache_hit_rate():.0%}"
+            # every fader step changes the whole screen
+            camera = (*game_map.interpolated_viewport(alpha).topleft,
+                      game_state.fader.opacity if game_state.fader.fading else None)
+            renderer.render(
+                screen, camera,
+                frame_states(player, game_map, game_state, tooltip_bar, inventory, info_box,
+                             npc_sprites, pickups, fps_str, alpha),
+                lambda surface: draw_frame(surface, player, game_map, game_state, tooltip_bar,
+                                           inventory, info_box, npc_sprites, pickups, fps_str, alpha)
+            )
 
             # wait for next frame
-            clock.tick(settings.FPS)
+            pacer.tick()
 
     except DemonSummoned:
         game_lost(screen, clock)
@@ -100,19 +166,14 @@ def game_wait(clock, to_wait):
         wait_frames -= 1
 
 
-def init_game() -> typing.Tuple[pygame.Surface, pygame.time.Clock]:
-    # init pygame
-    # stop sound effect delay (see https://stackoverflow.com/q/18273722)
-    pygame.mixer.pre_init(22050, -16, 2, 1024)
+def init_game(pacer: FramePacer = None) -> typing.Tuple[pygame.Surface, pygame.time.Clock]:
+    # init pygame, the mixer is set up once by pre_init
+    init_mixer()
     pygame.init()
-    pygame.mixer.quit()
-    pygame.mixer.init(22050, -16, 2, 1024)
-    screen = pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
-    clock = pygame.time.Clock()
-    pygame.mixer.init()
-    bgm = get_music("beeball.ogg")
-    bgm.play(-1)
-    return screen, clock
+    pacer = pacer or FramePacer()
+    # everything draws to a back buffer at the logical resolution, display scales it to the window
+    screen = display.init(pacer=pacer)
+    return screen, pacer.clock
 
 
 def init_state(start_day: int) -> typing.Tuple[GameState, Player, Map, Tooltip, InventoryBox, InfoBox, Group]:
@@ -134,6 +195,7 @@ def init_state(start_day: int) -> typing.Tuple[GameState, Player, Map, Tooltip,
     static_interactables.add(game_map.fire)
     static_interactables.add(game_map.graves)
     static_interactables.add(game_map.clothes_line)
+    game_state.static_interactables = static_interactables
 
     return game_state, player, game_map, tooltip_bar, inventory, info_box, static_interactables
 
@@ -147,7 +209,7 @@ def intro(screen: pygame.Surface, clock: pygame.time.Clock,
         get_dirt(int(settings.WIDTH * 0.8), int(settings.HEIGHT * 0.8)),
         (int(settings.WIDTH * 0.1), int(settings.HEIGHT * 0.1))
     )
-    title_text = settings.TITLE_FONT.render("Cultivate", True, pygame.Color("0x875ddd"))
+    title_text = render_text(settings.TITLE_FONT, "Cultivate", True, pygame.Color("0x875ddd"))
     title.blit(title_text, pygame.Rect(
         settings.WIDTH // 2 - title_text.get_rect().w // 2,
         settings.HEIGHT // 2 - title_text.get_rect().h // 2,
@@ -156,7 +218,7 @@ def intro(screen: pygame.Surface, clock: pygame.time.Clock,
 
     # draw title screen and wait for 1 second
     screen.blit(title, (0, 0))
-    pygame.display.flip()
+    display.flip()
     game_wait(clock, 0.5)
 
     # scroll title screen for 3 seconds
@@ -170,7 +232,7 @@ def intro(screen: pygame.Surface, clock: pygame.time.Clock,
 
         draw_callable()
         screen.blit(title, (0, y))
-        pygame.display.flip()
+        display.flip()
 
         y -= dy
         clock.tick(settings.FPS)
@@ -180,17 +242,23 @@ def handle_event(event, player, game_map, game_state, inventory, static_interact
     if event.type == pygame.QUIT:
         sys.exit(0)
 
+    if game_state.music:
+        game_state.music.handle_event(event)
+
     if event.type == pygame.KEYDOWN:
         handled = game_state.key_press(event.key)
         if handled:
             return
 
+        if event.key == K_SAVE:
+            save.save(settings.SAVE_FILE, save.snapshot(game_state, player, game_map, pickups))
         # Dropped
-        if event.key == pygame.K_z and player.pickup:
+        elif event.key == pygame.K_z and player.pickup:
             logging.debug("Dropping: " + str(player.pickup))
             player.pickup.x = player.x + game_map.map_view_x
             player.pickup.y = player.y + game_map.map_view_y
             pickups.add(player.pickup)
+            game_state.events.publish(events.ITEM_CREATED, player.pickup)
             player.pickup = None
             inventory.clear_icon()
         # Interact - possibly pick up
@@ -203,6 +271,7 @@ def handle_event(event, player, game_map, game_state, inventory, static_interact
                         logging.debug("Interacting with: " + str(item))
                         # Found the item we're picking up
                         pickups.remove(item)
+                        game_state.events.publish(events.ITEM_REMOVED, item)
                         player.pickup = item
                         picked_up = True
                         inventory.set_icon(item)
@@ -234,8 +303,10 @@ def handle_event(event, player, game_map, game_state, inventory, static_interact
                         else:
                             # If it isn't static, item should be deleted
                             pickups.remove(item)
+                            game_state.events.publish(events.ITEM_REMOVED, item)
 
                         pickups.add(new_item)
+                        game_state.events.publish(events.ITEM_CREATED, new_item)
                         player.pickup = reusable
                         inventory.set_icon(reusable)
                         # Break just incase we are in the vicinity of multiple objects
@@ -245,20 +316,23 @@ def handle_event(event, player, game_map, game_state, inventory, static_interact
             player.key_press(event.key)
 
 
-def update(game_state, player, game_map, tooltip_bar, npc_sprites, pickups, static_interactables) -> typing.Tuple[Group, Group]:
-    game_map.update_map_view(pygame.key.get_pressed())
+def update(game_state, player, game_map, tooltip_bar, npc_sprites, pickups, static_interactables,
+           key_pressed=None) -> typing.Tuple[Group, Group]:
+    game_map.update_map_view(pygame.key.get_pressed() if key_pressed is None else key_pressed)
 
     game_state.update(game_map.get_viewport())
     npc_sprites.update(game_map.get_viewport())
+    game_map.pathfinder.update()
     pickups.update(game_map.get_viewport())
     static_interactables.update(game_map.get_viewport())
     player.update()
     player.set_nearby(None)
 
     if settings.DEBUG:
+        mouse_x, mouse_y = display.to_logical(pygame.mouse.get_pos())
         pygame.display.set_caption(
-            "mouse X: {}, mouse Y: {}".format(pygame.mouse.get_pos()[0]+game_map.map_view_x,
-                                              pygame.mouse.get_pos()[1]+game_map.map_view_y))
+            "mouse X: {}, mouse Y: {}".format(mouse_x+game_map.map_view_x,
+                                              mouse_y+game_map.map_view_y))
     # update tooltip
     tooltip_bar.clear_tooltip()
     for item in chain(pickups, npc_sprites, static_interactables):
@@ -277,19 +351,24 @@ def update(game_state, player, game_map, tooltip_bar, npc_sprites, pickups, stat
     if player.pickup and tooltip_bar.empty:
         tooltip_bar.set_tooltip("press z to drop")
 
-    # check various task completion conditions
-    game_state.update_task_status(pickups, static_interactables)
-
 
-def draw(screen, player, game_map, game_state, tooltip_bar, inventory, info_box, npc_sprites, pickups) -> None:
-    game_map.draw(screen)
-    pickups.draw(screen)
-    for npc in npc_sprites:
-        npc.draw(screen)
-    # draw building roofs
-    for building in game_map.buildings.values():
-        building.draw(screen)
-    player.draw(screen, pygame.key.get_pressed())
+def draw(screen, player, game_map, game_state, tooltip_bar, inventory, info_box, npc_sprites, pickups,
+         alpha=1.0) -> None:
+    # the world goes through the render queue so everything overlaps in order
+    queue = RenderQueue(game_map.view_offset(alpha), alpha)
+    game_map.submit(queue)
+    for item in on_screen(pickups):
+        queue.submit(ACTORS, item.rect.bottom, item.image, item.rect)
+    for npc in on_screen(npc_sprites.near_screen()):
+        npc.submit(queue)
+    game_map.roofs.submit(queue, game_map.interpolated_viewport(alpha))
+    player.submit(queue, pygame.key.get_pressed())
+    world, scale = display.world_layer(screen)
+    queue.flush(world, scale)
+    display.show_world(screen)
+
+    # the ui is drawn straight on top
+    player.draw_ui(screen)
     if not player.conversation:
         tooltip_bar.draw(screen)
 
@@ -298,9 +377,53 @@ def draw(screen, player, game_map, game_state, tooltip_bar, inventory, info_box,
 
     game_state.draw(screen)
 
+
+def draw_frame(screen, player, game_map, game_state, tooltip_bar, inventory, info_box, npc_sprites, pickups,
+               fps_str, alpha=1.0) -> None:
+    draw(screen, player, game_map, game_state, tooltip_bar, inventory, info_box, npc_sprites, pickups, alpha)
+
+    # display FPS
+    if fps_str:
+        fps_surface = render_text(settings.SM_FONT, fps_str, True, pygame.Color("black"))
+        screen.blit(fps_surface, (settings.WIDTH // 2 - fps_surface.get_rect().w, fps_surface.get_rect().h))
+
+    # fade screen on day transition
+    if game_state.fader.fading:
+        game_state.fader.draw(screen)
+
+
+def frame_states(player, game_map, game_state, tooltip_bar, inventory, info_box, npc_sprites, pickups,
+                 fps_str, alpha=1.0) -> typing.List[DirtyState]:
+    """Describe everything that can change on screen without the camera moving."""
+    frame = player.animation(pygame.key.get_pressed()).getCurrentFrame()
+    states = [
+        ("player", frame.get_rect(topleft=(player.x, player.y)), frame),
+        ("tooltip", tooltip_bar.rect, None if player.conversation else tooltip_bar.render),
+        # the ui boxes resize with their text, so redraw everything when they change
+        ("conversation", None, (player.conversation, player.conversation.current if player.conversation else None)),
+        ("madlibs", None, (player.madlibs.selected_word_index, list(player.madlibs.changed_words.values()))
+                          if player.madlibs else None),
+        ("inventory", None, (inventory.icon, inventory.name)),
+        ("info", None, (info_box.current_date, game_state.current_task)),
+        ("cutscene", None, game_state.draw_state),
+    ]
+    for sprite in game_map.visible_drawables():
+        image = sprite.grave_image if isinstance(sprite, Grave) else sprite.image
+        states.append((("map", id(sprite)), sprite.rect, image))
+    for item in on_screen(pickups):
+        states.append((("pickup", id(item)), item.rect, item.image))
+    for npc in on_screen(npc_sprites.near_screen()):
+        position = npc.interpolated_rect(alpha).topleft if hasattr(npc, "interpolated_rect") else None
+        states.append((("npc", id(npc)), getattr(npc, "bounds", npc.rect),
+                       (npc.image, getattr(npc, "dialogue", None), position)))
+    if fps_str:
+        states.append(("fps", pygame.Rect(0, 0, settings.WIDTH // 2, 60), fps_str))
+    return states
+
+
 def game_lost(screen, clock):
     title = pygame.Surface((settings.WIDTH, settings.HEIGHT))
-    title_text = settings.TITLE_FONT.render("The demon was summoned. You Lose!", True, pygame.Color(255, 0, 0))
+    title_text = render_text(settings.TITLE_FONT, "The demon was summoned. You Lose!", True, pygame.Color(255, 0, 0))
     title.blit(title_text, pygame.Rect(
         settings.WIDTH // 2 - title_text.get_rect().w // 2,
         settings.HEIGHT // 2 - title_text.get_rect().h // 2,
@@ -308,18 +431,18 @@ def game_lost(screen, clock):
     ))
     screen.fill((0,0,0))
     screen.blit(title, (0, 0))
-    pygame.display.flip()
+    display.flip()
     game_wait(clock, 3)
 
 def game_win(screen, clock):
     title = pygame.Surface((settings.WIDTH, settings.HEIGHT))
-    title_text = settings.TITLE_FONT.render("The summoning was sabotaged.", True, pygame.Color(255, 0, 0))
+    title_text = render_text(settings.TITLE_FONT, "The summoning was sabotaged.", True, pygame.Color(255, 0, 0))
     title.blit(title_text, pygame.Rect(
         settings.WIDTH // 2 - title_text.get_rect().w // 2,
         settings.HEIGHT // 2 - title_text.get_rect().h // 2,
         title_text.get_rect().w, title_text.get_rect().h
     ))
-    title_text = settings.TITLE_FONT.render("You win!", True, pygame.Color(255, 0, 0))
+    title_text = render_text(settings.TITLE_FONT, "You win!", True, pygame.Color(255, 0, 0))
     title.blit(title_text, pygame.Rect(
         settings.WIDTH // 2 - title_text.get_rect().w // 2,
         settings.HEIGHT // 2 - title_text.get_rect().h // 2 + settings.HEIGHT // 5,
@@ -327,7 +450,7 @@ def game_win(screen, clock):
     ))
     screen.fill((0,0,0))
     screen.blit(title, (0, 0))
-    pygame.display.flip()
+    display.flip()
     game_wait(clock, 3)
 
 
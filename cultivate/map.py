@@ -1,9 +1,11 @@
 import collections
-import random
+import typing
+from itertools import chain
 
 import pygame
 
 from cultivate.sprites import UpdatableSprite
+from cultivate.sprites.buildings import RoofOverlay
 from cultivate.sprites.buildings.toolshed import ToolShed
 from cultivate.sprites.buildings.church import Church
 from cultivate.sprites.buildings.library import Library
@@ -19,20 +21,25 @@ from cultivate.madlibs import Madlibs
 from cultivate.sprites.fire import Fire, DemonFire
 from cultivate.sprites.demon import Demon
 from cultivate.player import Player
-from cultivate.loader import get_pentagram, get_garden, get_dirt, get_grass, get_weed, get_forest, get_sound, get_grave
+from cultivate.loader import get_pentagram, get_garden_tiles, get_dirt, get_grass, get_weed, get_forest_tiles, get_sound, get_grave
 from cultivate.loader import get_plant1, get_plant2, get_plant3, get_plant4, get_plant5, get_plant6, get_plant7
 from cultivate.loader import get_gravestone1, get_gravestone2, get_gravestone3, get_gravestone4, get_gravestone5
 from cultivate.settings import HEIGHT, MAP_HEIGHT, MAP_WIDTH, WIDTH
-from cultivate import settings
+from cultivate import events, settings, terrain
 from cultivate.game_state import GameState
+from cultivate.audio import FOOTSTEPS, get_audio
+from cultivate.culling import SpatialHash, world_rect
+from cultivate.pathfinding import get_pathfinder
+from cultivate.render_queue import MAP, RenderQueue
+from cultivate.timeline import Cutscene, Signal, next_event
 
 from cultivate.conversation_tree import ConversationTree
-from cultivate.tasks import day_0_conversations
 
 
 class Map:
-    def __init__(self, player: Player, game_state: GameState):
+    def __init__(self, player: Player, game_state: GameState, seed: int = None):
         self.player = player
+        self.seed = settings.WORLD_SEED if seed is None else seed
 
         # I don't like this. - Davy
         self.player.map = self
@@ -41,12 +48,15 @@ class Map:
         self.image = self.compose_image()
         self.map_view_x = WIDTH
         self.map_view_y = HEIGHT
+        # camera position at the previous tick, drawing interpolates from it
+        self.prev_view_x = self.map_view_x
+        self.prev_view_y = self.map_view_y
         self.width = self.image.get_rect().width
         self.height = self.image.get_rect().height
         self.move_amount = 10
         self.moved_last_tick = False
         self.footstep = get_sound("footstep-medium.ogg")
-        self.footstep.set_volume(0.2)
+        get_audio().set_volume(FOOTSTEPS, 0.2)
 
         # create permanent sprites
         # TODO: Make the forest border out of proper sprites (that own blitting themselves onto the map)
@@ -59,7 +69,7 @@ class Map:
         self.buildings = {
             "toolshed": ToolShed(1650, 450, self.image),
             "library": Library(2500, 450, self.image),
-            "kitchen": Kitchen(1800, 1500, self.image),
+            "kitchen": Kitchen(1800, 1500, self.image, self.seed),
             "dorm1": HorizontalDorm(750, 1600, self.image),
             "dorm2": VerticalDorm(1250, 1600, self.image),
             "dorm3": HorizontalDorm(750, 2100, self.image),
@@ -69,7 +79,7 @@ class Map:
         }
 
         self.bed = Bed(1340, 1650, self.image)
-        self.desk = Desk(2500, 550, self.image, self.make_madlibs())
+        self.desk = Desk(2500, 550, self.image, self.make_madlibs(game_state.events))
         self.graves = [
             Grave(3260, 1100, 0),
             Grave(3150, 900, 300),
@@ -83,6 +93,12 @@ class Map:
         # self.demon_fire = DemonFire(2000, 800)
         # self.demon = Demon(2000,800)
 
+        # static things drawn over the map, indexed so only the ones in the viewport are drawn
+        self.drawables = SpatialHash()
+        for sprite in [self.fire, *self.graves, self.clothes_line]:
+            self.drawables.insert(sprite, world_rect(sprite))
+        self.roofs = RoofOverlay(self.buildings.values())
+
         # create collision groups
         self.impassables = pygame.sprite.Group(
             top_forest, left_forest, right_forest, bottom_forest,
@@ -92,26 +108,32 @@ class Map:
         for building in self.buildings.values():
             self.impassables.add(building.impassables)
             self.passables.add(building.passables)
+        # npcs find their way around the same things the player bumps into
+        self.pathfinder = get_pathfinder()
+        self.pathfinder.build(self.impassables, self.passables)
 
+        # the tour's stops, as (building or None to say it straight away, conversation)
         self.day0 = [
-            (None, 'welcome the newcomers'),
-            ('kitchen', 'kitchen description'),
-            ('toolshed', 'toolshed description'),
-            ('library', 'library description'),
-            ('church', 'church description'),
-            (None, 'end day 0')
-        ]
+            (stop['building'], stop['conversation']) for stop in game_state.days[0]['tour']
+        ] if game_state.day == 0 else []
+        # the building the tour is heading for, and the signal to fire once the player is there
+        self.tour_stop = None
+        if self.day0:
+            game_state.timeline.start(self.tour())
 
     def compose_image(self) -> pygame.Surface:
-        image = get_grass(MAP_WIDTH, MAP_HEIGHT)
-        self.generate_random_weeds(image)
-        self.generate_border_forest(image)
-        self.generate_garden(image)
-        self.generate_dirt(image)
-        return image
+        # copied, the cached grass has to stay clean for the next map generated from it
+        image = get_grass(MAP_WIDTH, MAP_HEIGHT).copy()
+        # work out where everything goes, then draw it all in one batch
+        return terrain.draw(image, chain(
+            self.generate_random_weeds(terrain.stage_rng(self.seed, "weeds")),
+            self.generate_border_forest(terrain.stage_rng(self.seed, "forest")),
+            self.generate_garden(terrain.stage_rng(self.seed, "garden")),
+            self.generate_dirt(terrain.stage_rng(self.seed, "graves")),
+        ))
 
     @staticmethod
-    def make_madlibs():
+    def make_madlibs(event_bus=None):
         replacements = collections.OrderedDict([
                 ("verb1", "beeseech"),
                 ("verb2", "bless"),
@@ -150,59 +172,45 @@ class Map:
             "We {verb7} you\n"
             "{verb8} before us\n",
             replacements,
-            expected
+            expected,
+            event_bus
         )
 
     @staticmethod
-    def generate_random_weeds(surface: pygame.Surface, count=100):
-        """Randomly blit weeds onto {surface}."""
-        weed = get_weed()
-        locations = [(random.randrange(0, MAP_WIDTH), random.randrange(0, MAP_HEIGHT)) for _ in range(count)]
-        for x, y in locations:
-            surface.blit(weed, (x, y))
+    def generate_random_weeds(rng, count=100) -> typing.List[terrain.Placement]:
+        """Weeds at random all over the map."""
+        return terrain.scatter(get_weed(), count, MAP_WIDTH, MAP_HEIGHT, rng)
 
     @staticmethod
-    def generate_dirt(surface: pygame.Surface):
-        surface.blit(get_dirt(600, 600), (3000, 800))
+    def generate_dirt(rng) -> typing.List[terrain.Placement]:
         graves = [
             get_gravestone1(),
             get_gravestone2(),
             get_gravestone3(),
             get_gravestone5()
             ]
-        for i in range(30, 560, 70):
-            surface.blit(random.choice(graves), (3000+i, 820))
-            surface.blit(random.choice(graves), (3020+i, 860))
-
+        positions = chain.from_iterable(((3000+i, 820), (3020+i, 860)) for i in range(30, 560, 70))
+        return [(get_dirt(600, 600), (3000, 800)), *terrain.pick(graves, positions, rng)]
 
     @staticmethod
-    def generate_border_forest(surface: pygame.Surface):
-        surface.blit(get_forest(MAP_WIDTH, MAP_HEIGHT), (0, 0))
+    def generate_border_forest(rng) -> typing.List[terrain.Placement]:
+        return terrain.forest(get_forest_tiles(), MAP_WIDTH, MAP_HEIGHT, rng)
 
     @staticmethod
-    def generate_garden(surface: pygame.Surface):
-        surface.blit(get_garden(500, 500), (1100, 400))
-        surface.blit(get_garden(500, 500), (550, 400))
-
-        for i in range(50, 500, 60):
-            surface.blit(get_plant1(), (1150+random.randint(0, 20), 400+i))
-            surface.blit(get_plant2(), (1200+random.randint(0, 20), 400+i))
-            surface.blit(get_plant3(), (1250+random.randint(0, 20), 400+i))
-            surface.blit(get_plant4(), (1300+random.randint(0, 20), 400+i))
-            surface.blit(get_plant5(), (1350+random.randint(0, 20), 400+i))
-            surface.blit(get_plant6(), (1400+random.randint(0, 20), 400+i))
-            surface.blit(get_plant7(), (1450+random.randint(0, 20), 400+i))
-
-        for i in range(50, 500, 60):
-            surface.blit(get_plant1(), (600+random.randint(0, 20), 400+i))
-            surface.blit(get_plant2(), (650+random.randint(0, 20), 400+i))
-            surface.blit(get_plant3(), (700+random.randint(0, 20), 400+i))
-            surface.blit(get_plant4(), (750+random.randint(0, 20), 400+i))
-            surface.blit(get_plant5(), (800+random.randint(0, 20), 400+i))
-            surface.blit(get_plant6(), (850+random.randint(0, 20), 400+i))
-            surface.blit(get_plant7(), (900+random.randint(0, 20), 400+i))
+    def generate_garden(rng) -> typing.List[terrain.Placement]:
+        placements = [
+            *terrain.garden(get_garden_tiles(), 1100, 400, 500, 500, rng),
+            *terrain.garden(get_garden_tiles(), 550, 400, 500, 500, rng),
+        ]
+        plants = [get_plant1(), get_plant2(), get_plant3(), get_plant4(), get_plant5(), get_plant6(), get_plant7()]
+        for left in (1150, 600):
+            for i in range(50, 500, 60):
+                placements += [(plant, (left + 50*column + rng.randint(0, 20), 400+i))
+                               for column, plant in enumerate(plants)]
+        return placements
 
     def update_map_view(self, key_pressed):
+        self.prev_view_x, self.prev_view_y = self.map_view_x, self.map_view_y
         if self.player.interacting_with:
             self.moved_last_tick = False
             return
@@ -225,49 +233,59 @@ class Map:
 
         if not self.moved_last_tick and moved:
             # started moving
-            self.footstep.play(-1)
+            get_audio().play_footsteps(self.footstep)
         if self.moved_last_tick and not moved:
             # stopped moving
-            self.footstep.stop()
+            get_audio().stop_footsteps()
 
         self.moved_last_tick = moved
 
-        if self.game_state.day == 0 and self.day0:
-            # If there is no building associated, display the text
-            if self.day0[0][0] is None:
-                item, text = self.day0.pop(0)
-                self.player.interacting_with = self
-                self.player.nearby_interactable = self
-                self.player.conversation = ConversationTree(
-                    npc_name='You', conversation_data=day_0_conversations[text])
-            else:
-                # See which buildings we are colliding with
-                for (building_name, building) in self.buildings.items():
-                    if building.rect.colliderect(pygame.Rect(
-                            WIDTH//2 - 50,
-                            HEIGHT//2 - 50,
-                            100,
-                            100)) and building_name == self.day0[0][0]:
-                        self.footstep.stop()
-                        item, text = self.day0.pop(0)
-                        self.player.interacting_with = self
-                        self.player.nearby_interactable = self
-                        self.player.conversation = ConversationTree(
-                            npc_name='You', conversation_data=day_0_conversations[text])
-                        break
-            if not self.day0:
-                self.game_state.complete_task()
+        if self.tour_stop and (self.map_view_x, self.map_view_y) != (self.prev_view_x, self.prev_view_y):
+            self.check_tour_stop()
 
         # update other sprites
         for building in self.buildings.values():
             building.update(self.get_viewport())
+        self.roofs.update(pygame.Rect(self.map_view_x + WIDTH // 2 - 75, self.map_view_y + HEIGHT // 2 - 75, 150, 150))
         self.passables.update(self.get_viewport())
         self.impassables.update(self.get_viewport())
 
+    def tour(self) -> Cutscene:
+        """Say each stop of the day 0 tour once the player reaches its building, after the last one closes."""
+        for i, (building_name, conversation) in enumerate(self.day0):
+            if building_name is not None:
+                arrived = Signal()
+                self.tour_stop = (self.buildings[building_name], arrived)
+                self.check_tour_stop()
+                yield arrived
+                get_audio().stop_footsteps()
+            self.player.interacting_with = self
+            self.player.nearby_interactable = self
+            self.player.conversation = ConversationTree(npc_name='You', conversation_data=conversation)
+            if i == len(self.day0) - 1:
+                self.game_state.complete_task()
+            yield next_event(self.game_state.events, events.INTERACTION_STOPPED)
+
+    def check_tour_stop(self):
+        building, arrived = self.tour_stop
+        # the building has to be in the middle of the screen
+        centre = pygame.Rect(self.map_view_x + WIDTH//2 - 50, self.map_view_y + HEIGHT//2 - 50, 100, 100)
+        if building.map_rect.colliderect(centre):
+            self.tour_stop = None
+            arrived.fire()
+
     def get_viewport(self):
         return pygame.Rect(self.map_view_x, self.map_view_y,
                            WIDTH, HEIGHT)
 
+    def view_offset(self, alpha: float) -> typing.Tuple[int, int]:
+        """How far on screen things move when the camera is drawn {alpha} of the way from the previous tick."""
+        return (round((self.map_view_x - self.prev_view_x) * (1 - alpha)),
+                round((self.map_view_y - self.prev_view_y) * (1 - alpha)))
+
+    def interpolated_viewport(self, alpha: float) -> pygame.Rect:
+        return self.get_viewport().move(*[-offset for offset in self.view_offset(alpha)])
+
     def can_move(self, dx: int, dy: int) -> bool:
         """Check if the player can move by {dx}, {dy}.
 
@@ -280,16 +298,16 @@ class Map:
                                  self.player.rect.w, 1)
         return pygame.sprite.spritecollide(ghost, self.passables, False) or not pygame.sprite.spritecollide(ghost, self.impassables, False)
 
-    def draw(self, surface: pygame.Surface):
-        """Draw the viewable area of the map to the surface."""
-        surface.blit(self.image, (0, 0), area=(self.map_view_x, self.map_view_y,
-                                               self.map_view_x+WIDTH, self.map_view_y+HEIGHT))
+    def submit(self, queue: RenderQueue):
+        """Queue the viewable area of the map and the things on it."""
+        view = self.get_viewport().move(-queue.offset[0], -queue.offset[1])
+        queue.submit(MAP, 0, self.image, (0, 0), view, fixed=True)
         if settings.DEBUG:
-            self.impassables.draw(surface)
-            self.passables.draw(surface)
-        self.fire.draw(surface)
-        # self.demon_fire.draw(surface)
-        # self.demon.draw(surface)
-        for grave in self.graves:
-            grave.draw(surface)
-        self.clothes_line.draw(surface)
+            for sprite in chain(self.impassables, self.passables):
+                queue.submit(MAP, 0, sprite.image, sprite.rect)
+        for sprite in self.visible_drawables():
+            sprite.submit(queue)
+
+    def visible_drawables(self) -> list:
+        return self.drawables.query(self.get_viewport())
+
@@ -0,0 +1,69 @@
+import typing
+
+import pygame
+
+from cultivate import settings
+from cultivate.loader import get_music
+
+MUSIC_END = pygame.USEREVENT + 1
+
+
+class MusicPlayer:
+    """Stream background music with pygame.mixer.music, so only a small buffer of a track is decoded at once.
+
+    The mixer has a single music stream, so changing track fades the old one out and
+    fades the new one in once it has stopped.
+    """
+
+    def __init__(self, playlists: typing.Dict[int, typing.List[str]] = None,
+                 finale: str = None, fade_ms: int = None):
+        self.playlists = settings.MUSIC_PLAYLISTS if playlists is None else playlists
+        self.finale = settings.FINALE_TRACK if finale is None else finale
+        self.fade_ms = settings.MUSIC_FADE_MS if fade_ms is None else fade_ms
+        self.playlist = []
+        self.position = 0
+        self.track = None
+        self.pending = None
+        pygame.mixer.music.set_endevent(MUSIC_END)
+
+    def play_day(self, day: int) -> None:
+        self.play_playlist(self.playlists.get(day, settings.DEFAULT_PLAYLIST))
+
+    def play_finale(self) -> None:
+        self.play_playlist([self.finale])
+
+    def play_playlist(self, playlist: typing.List[str]) -> None:
+        if playlist == self.playlist:
+            return
+        self.playlist = list(playlist)
+        self.position = 0
+        self.crossfade(self.playlist[0])
+
+    def crossfade(self, track: str) -> None:
+        if track == self.track and pygame.mixer.music.get_busy():
+            return
+        if pygame.mixer.music.get_busy():
+            # start {track} once the fade out has finished, see {handle_event}
+            self.pending = track
+            pygame.mixer.music.fadeout(self.fade_ms)
+        else:
+            self.start(track)
+
+    def start(self, track: str) -> None:
+        self.track = track
+        self.pending = None
+        pygame.mixer.music.load(get_music(track))
+        pygame.mixer.music.play(fade_ms=self.fade_ms)
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type != MUSIC_END:
+            return
+        if self.pending:
+            self.start(self.pending)
+        elif self.playlist:
+            # tracks play once each, so a playlist can be swapped without waiting for a loop to end
+            self.position = (self.position + 1) % len(self.playlist)
+            if self.playlist[self.position] == self.track:
+                pygame.mixer.music.play()
+            else:
+                self.start(self.playlist[self.position])
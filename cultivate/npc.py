@@ -1,13 +1,18 @@
-from itertools import cycle
-import time
+import collections
+from itertools import count
 import random
 import pygame
 
 from cultivate.loader import get_npc5, get_character, get_npc, get_npc_cat, \
-    get_npc_white_robes, get_npc_pink_robes, get_pentagram
-from cultivate.settings import WIDTH, HEIGHT, MD_FONT
+    get_npc_white_robes, get_npc_pink_robes, get_pentagram, render_text
+from cultivate import settings
+from cultivate.crowd import FULL_DETAIL, NEAR_DETAIL, NEAR_PLAYER, make_crowd, view
+from cultivate.render_queue import ACTORS, BUBBLES, GROUND
 from cultivate.conversation_tree import ConversationTree
-from cultivate.tasks import task_conversations
+from cultivate.days import get_days
+from cultivate.pathfinding import get_pathfinder
+from cultivate.timeline import Signal
+from cultivate.timers import get_timers, ticks
 
 
 
@@ -27,42 +32,117 @@ SPEECH_FOLLOWERS = [
 BACKGROUND = pygame.Color(245, 245, 220)
 FOREGROUND = pygame.Color(0, 0, 0)
 
+# spreads out the ticks off screen npcs are updated on, in the order they're made so replays match
+_lod_phase = count()
+
 
 class TimedDialogue:
-    def __init__(self, text, duration):
+    """A speech bubble, the npc saying it takes it down again when its time is up."""
+
+    def __init__(self, text):
         padding = 10
 
-        text_width, text_height = MD_FONT.size(text)
+        text_width, text_height = settings.MD_FONT.size(text)
 
         self.image = pygame.Surface((text_width + padding * 2,
                                      text_height + padding * 2))
         pygame.draw.rect(self.image, BACKGROUND,
                          (0, 0, *self.image.get_size()))
-        self.image.blit(MD_FONT.render(text, True, FOREGROUND), (padding, padding))
+        self.image.blit(render_text(settings.MD_FONT, text, True, FOREGROUND), (padding, padding))
+
+    def rect_at(self, x, y):
+        # centered above this point
+        rect = self.image.get_rect()
+        return rect.move(x - rect.w // 2, y - rect.bottom - 10)
+
+
+class NpcGroup(pygame.sprite.Group):
+    """Npcs, each only updated on the ticks its level of detail needs.
+
+    Npc.update returns how many ticks it can be left for: one near the screen, more the
+    further off it is. Npcs left for more than a tick are at least 100px off screen, and
+    neither they nor the camera move more than 10px a tick, so none walk on screen
+    between updates. Other sprites are updated every tick.
+
+    With NPC_CROWD on and numpy installed, npcs walk in a Crowd instead, moved a whole
+    crowd at a time on the same ticks they would have been here.
+    """
+
+    def __init__(self, *sprites):
+        self.tick = 0
+        self.due = collections.defaultdict(list)
+        self.next_update = {}
+        self.crowd = make_crowd()
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if self.crowd is not None and isinstance(sprite, Npc):
+            self.crowd.add(sprite)
+        else:
+            self.schedule(sprite, self.tick + 1)
 
-        self.expired = time.time() + duration
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if sprite in self.next_update:
+            del self.next_update[sprite]
+        else:
+            self.crowd.remove(sprite)
+
+    def schedule(self, sprite, tick):
+        self.next_update[sprite] = tick
+        self.due[tick].append(sprite)
+
+    def near_screen(self):
+        """The sprites that may be on screen, npcs known to be off it left out."""
+        return [sprite for sprite in self if getattr(sprite, "on_screen", True)]
+
+    def update(self, viewport):
+        self.tick += 1
+        if self.crowd is not None:
+            self.crowd.step(viewport)
+        for sprite in self.due.pop(self.tick, ()):
+            # removed, or added again since
+            if self.next_update.get(sprite) == self.tick:
+                self.schedule(sprite, self.tick + (sprite.update(viewport) or 1))
 
-    def draw(self, screen, x, y):
-        # Draw centered above this point
-        if self.expired >= time.time():
-            screen.blit(self.image,
-                        (x - self.image.get_rect().w // 2,
-                         y - self.image.get_rect().bottom - 10))
-            return True
-        return False
+
+class TaskConversations(dict):
+    """The quester's conversation about each task, only loaded when that task comes up."""
+
+    def __init__(self, npc_name):
+        super().__init__()
+        self.npc_name = npc_name
+
+    def __missing__(self, task):
+        self[task] = ConversationTree(npc_name=self.npc_name, conversation_data=get_days().conversation(task))
+        return self[task]
 
 
 class Npc(pygame.sprite.Sprite):
+    # where the npc is, was last tick and is walking to, kept in its crowd while it's in one
+    x = view("x")
+    y = view("y")
+    prev_x = view("prev_x")
+    prev_y = view("prev_y")
+    next_x = view("next_x")
+    next_y = view("next_y")
+    on_screen = view("on_screen")
+    crowd = None
+    slot = None
+    # sent after the player (see NpcFollower.follow) instead of walking its own points
+    follows_view = False
+
     def __init__(self, speed=3, cycle_path=True):
         super().__init__()
 
-        if cycle_path:
-            self.path = cycle(self.points)
-        else:
-            self.path = iter(self.points)
-
-        self.x, self.y = next(self.path)
-        self.next_x, self.next_y = next(self.path)
+        self.cycle_path = cycle_path
+        # the point being walked to, and whether a path that doesn't cycle has been walked
+        self.waypoint = 0
+        self.finished = False
+        self.x, self.y = self.points[0]
+        self.prev_x, self.prev_y = self.x, self.y
+        self.next_x, self.next_y = self.next_point()
 
         self.image = self.get_images().getCurrentFrame()
         self.rect = self.image.get_rect()
@@ -73,10 +153,15 @@ class Npc(pygame.sprite.Sprite):
         self.paused = False
 
         self.tips = SPEECH
+        # what the npc is saying, its bubble is only made while it's on screen
+        self.speech = None
         self.dialogue = None
         self.pause_between_tips = 5
         self.speech_duration = 5
-        self.next_helpful_hint = time.time() + self.pause_between_tips
+        # hints and speech bubbles run on game clock timers, nothing is checked each tick
+        self.hint_timer = None
+        self.speech_timer = None
+        self.schedule_hint(self.pause_between_tips)
 
         self.conversation = None
         self.in_conversation = False
@@ -85,26 +170,61 @@ class Npc(pygame.sprite.Sprite):
 
         self.player_can_stop = True
 
+        self.on_screen = False
+        self.updated_at = None
+        self.lod_phase = next(_lod_phase)
+
     def get_images(self, direction=None):
         return get_npc5(direction=direction)
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+    def interpolated_rect(self, alpha):
+        """Where to draw the npc, {alpha} of the way from its position at the previous tick."""
+        return self.rect.move(round((self.prev_x - self.x) * (1 - alpha)),
+                              round((self.prev_y - self.y) * (1 - alpha)))
+
+    def submit(self, queue):
+        rect = self.interpolated_rect(queue.alpha)
+        queue.submit(ACTORS, rect.bottom, self.image, rect)
+        if self.dialogue:
+            queue.submit(BUBBLES, rect.bottom, self.dialogue.image,
+                         self.dialogue.rect_at(rect.centerx, rect.y))
 
+    @property
+    def bounds(self):
+        """The screen area covered by the npc and its speech bubble, anywhere between the last two ticks."""
+        rects = [self.rect, self.interpolated_rect(0)]
         if self.dialogue:
-            present = self.dialogue.draw(surface, self.rect.centerx, self.rect.y)
-            if not present:
-                self.dialogue = None
-                self.next_helpful_hint = time.time() + self.pause_between_tips
+            rects += [self.dialogue.rect_at(rect.centerx, rect.y) for rect in rects]
+        return rects[0].unionall(rects[1:])
 
     def update(self, viewport):
-        rect_near_player = pygame.Rect(WIDTH//2 - 100, HEIGHT//2 - 100, 200, 200)
+        """Move the npc on, and return how many ticks it can be left before the next update (see NpcGroup)."""
+        now = get_timers().now
+        # ticks gone by since the last update, without this one
+        skipped = now - self.updated_at - 1 if self.updated_at is not None else 0
+        self.updated_at = now
+        self.prev_x, self.prev_y = self.x, self.y
+        near_player = self.rect.colliderect(NEAR_PLAYER)
+        self.rect.x = self.x - viewport.x
+        self.rect.y = self.y - viewport.y
 
-        if not self.dialogue and self.next_helpful_hint <= time.time() and self.tips:
-            self.dialogue = TimedDialogue(random.choice(self.tips), self.speech_duration)
+        self.on_screen = FULL_DETAIL.colliderect(self.rect)
+        if not self.on_screen:
+            # off screen, walk the ticks since the last update in one go and don't animate
+            self.advance(self.speed * (skipped + 1))
+            self.rect.x = self.x - viewport.x
+            self.rect.y = self.y - viewport.y
+            interval = settings.NPC_LOD_NEAR_INTERVAL if NEAR_DETAIL.colliderect(self.rect) \
+                else settings.NPC_LOD_FAR_INTERVAL
+            if self.lod_phase is not None:
+                interval = 1 + self.lod_phase % interval
+                self.lod_phase = None
+            return interval
+        if skipped:
+            self.advance(self.speed * skipped)
 
         direction = None
-        if not self.player_can_stop or not self.rect.colliderect(rect_near_player):
+        if not self.player_can_stop or not near_player:
 
             if self.next_x > self.x + self.speed:
                 direction = 'right'
@@ -122,12 +242,101 @@ class Npc(pygame.sprite.Sprite):
                 self.x = self.next_x
                 self.y = self.next_y
                 try:
-                    self.next_x, self.next_y = next(self.path)
+                    self.next_x, self.next_y = self.next_point()
                 except:
                     self.next_x, self.next_y = self.x, self.y
-        self.image = self.get_images(direction=direction).getCurrentFrame()
-        self.rect.x = self.x - viewport.x
-        self.rect.y = self.y - viewport.y
+                    self.reached_end()
+        self.show(self.x - viewport.x, self.y - viewport.y, direction)
+        return 1
+
+    def show(self, screen_x, screen_y, direction=None, frames=None):
+        """Put the npc at ({screen_x}, {screen_y}) walking {direction}, with any speech bubble it's due.
+
+        {frames} shares each animation's current frame between npcs shown on the same tick.
+        """
+        self.rect.x = screen_x
+        self.rect.y = screen_y
+        if self.speech and not self.dialogue:
+            self.dialogue = TimedDialogue(self.speech)
+        animation = self.get_images(direction=direction)
+        if frames is None:
+            self.image = animation.getCurrentFrame()
+        else:
+            if animation not in frames:
+                frames[animation] = animation.getCurrentFrame()
+            self.image = frames[animation]
+
+    def walk_route(self, points):
+        """Walk {points} from where the npc is now, stopping at the last one."""
+        self.points = points
+        self.cycle_path = False
+        self.waypoint = 0
+        self.finished = False
+        self.next_x, self.next_y = points[0]
+        if self.crowd is not None:
+            self.crowd.set_path(self)
+
+    def next_point(self):
+        """Move on to the point after the one being walked to and return it, StopIteration at the end of the path."""
+        if self.waypoint + 1 == len(self.points) and not self.cycle_path:
+            self.finished = True
+            raise StopIteration
+        self.waypoint = (self.waypoint + 1) % len(self.points)
+        return self.points[self.waypoint]
+
+    def advance(self, distance):
+        """Walk {distance} along the path in one go, across as many points as that takes."""
+        while distance > 0:
+            if self.x != self.next_x:
+                step = min(abs(self.next_x - self.x), distance)
+                self.x += step if self.next_x > self.x else -step
+            elif self.y != self.next_y:
+                step = min(abs(self.next_y - self.y), distance)
+                self.y += step if self.next_y > self.y else -step
+            else:
+                try:
+                    self.next_x, self.next_y = self.next_point()
+                except StopIteration:
+                    self.reached_end()
+                    return
+                if (self.next_x, self.next_y) == (self.x, self.y):
+                    # a path that stays put
+                    return
+                continue
+            distance -= step
+
+    def schedule_hint(self, seconds):
+        """Say one of the tips in {seconds}, or once the current speech bubble runs out if that's later."""
+        timers = get_timers()
+        delay = ticks(seconds)
+        if self.speech_timer:
+            delay = max(delay, self.speech_timer.due - timers.now + 1)
+        if self.hint_timer:
+            self.hint_timer.cancel()
+        self.hint_timer = timers.after(delay, self.give_hint)
+
+    def give_hint(self):
+        self.hint_timer = None
+        # npcs from a day that's over stop talking, as does anyone already saying something
+        if not self.alive() or self.speech_timer or self.dialogue or not self.tips:
+            return
+        self.speech = random.choice(self.tips)
+        self.dialogue = TimedDialogue(self.speech) if self.on_screen else None
+        self.speech_timer = get_timers().after(ticks(self.speech_duration), self.stop_speaking)
+
+    def stop_speaking(self):
+        self.speech = None
+        self.dialogue = None
+        self.speech_timer = None
+        if self.hint_timer is None:
+            self.schedule_hint(self.pause_between_tips)
+        self.finished_speaking()
+
+    def reached_end(self):
+        """Called once a path that doesn't cycle has been walked."""
+
+    def finished_speaking(self):
+        """Called when a speech bubble runs out."""
 
     @property
     def help_text(self):
@@ -178,8 +387,8 @@ class Pentagram(pygame.sprite.Sprite):
         self.rect.x = self.x - view_port.x
         self.rect.y = self.y - view_port.y
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+    def submit(self, queue):
+        queue.submit(GROUND, self.rect.bottom, self.image, self.rect)
 
     @property
     def help_text(self):
@@ -192,15 +401,19 @@ class Pentagram(pygame.sprite.Sprite):
 
 class NpcFollower(Npc):
     name = "follower"
+    follows_view = True
+
     def __init__(self, x, y):
         self.points = [(x, y)]
         super().__init__(speed=5+random.random()*5)
         self.x, self.y = x, y
-        self.path = iter(self.points)
         self.next_x, self.next_y = x, y
+        # the pathfinding cell being headed for, and the route still being looked for
+        self.goal = None
+        self.route_request = None
         self.tips = SPEECH_FOLLOWERS
         self.pause_between_tips = 5+random.random()*10
-        self.next_helpful_hint = time.time() + self.pause_between_tips
+        self.schedule_hint(self.pause_between_tips)
 
         self.conversation = [
             {'text': "I'm so happy to be invited to be part of this community",
@@ -208,8 +421,31 @@ class NpcFollower(Npc):
             }]
 
     def update(self, viewport):
-        super().update(viewport)
-        self.next_x, self.next_y = (viewport.centerx, viewport.centery)
+        interval = super().update(viewport)
+        self.follow(*viewport.center)
+        return interval
+
+    def follow(self, x, y):
+        """Head for the player at ({x}, {y}) around whatever's in the way, once there's a route."""
+        pathfinder = get_pathfinder()
+        goal = pathfinder.cell_at(x, y)
+        if goal == self.goal:
+            return
+        self.goal = goal
+        if self.route_request:
+            self.route_request.cancel()
+        # from where its feet are
+        start = pathfinder.cell_at(self.x + self.rect.w // 2, self.y + self.rect.h - 1)
+        self.route_request = pathfinder.request(start, goal, self.take_route)
+
+    def take_route(self, cells):
+        self.route_request = None
+        if cells is None:
+            # nowhere to go, stay put
+            return
+        size = get_pathfinder().cell_size
+        # standing at the bottom middle of each cell
+        self.walk_route([(x * size + (size - self.rect.w) // 2, (y + 1) * size - self.rect.h) for x, y in cells])
 
 
 class NpcPathAndStop(Npc):
@@ -220,6 +456,7 @@ class NpcPathAndStop(Npc):
         self.player_can_stop = False
         self.speed = 10
         self.tips = []
+        self.arrived = Signal()
 
     def get_images(self, direction=None):
         return get_npc5(direction=direction)
@@ -227,6 +464,9 @@ class NpcPathAndStop(Npc):
     def at_end_location(self):
         return self.x == self.next_x and self.y == self.next_y
 
+    def reached_end(self):
+        self.arrived.fire()
+
 
 class NpcSacrifice(NpcPathAndStop):
     name = "lamb"
@@ -235,6 +475,7 @@ class NpcSacrifice(NpcPathAndStop):
         super().__init__(start_point, end_point)
         self.speed = 10
         self.speech_duration = 1.5
+        self.said = Signal()
     def get_images(self, direction=None):
         if self.sabotaged:
             return get_npc_pink_robes(direction=direction)
@@ -242,8 +483,12 @@ class NpcSacrifice(NpcPathAndStop):
 
     def draw_text_in(self, text, seconds=1):
         self.tips = [text]
-        self.next_helpful_hint = time.time() + seconds
         self.pause_between_tips = 999
+        self.said = Signal()
+        self.schedule_hint(seconds)
+
+    def finished_speaking(self):
+        self.said.fire()
 
 
 class NpcQuester(Npc):
@@ -257,12 +502,10 @@ class NpcQuester(Npc):
 
     def __init__(self):
         super().__init__()
-        self.dialogue = TimedDialogue("!", 99999)
+        # never taken down
+        self.dialogue = TimedDialogue("!")
     def get_conversations(self):
-        return {
-            task_name: ConversationTree(npc_name=self.name, conversation_data=task_conv_data)
-            for task_name, task_conv_data in task_conversations.items()
-        }
+        return TaskConversations(self.name)
 
     def get_images(self, direction=None):
         return get_npc_cat(direction=direction)
@@ -0,0 +1,75 @@
+"""Colour tables for deriving sprite variants from one sheet, and the recolouring itself."""
+import typing
+
+import pygame
+
+try:
+    import numpy
+except ImportError:  # pygame.surfarray needs numpy, fall back to PixelArray without it
+    numpy = None
+
+Palette = typing.Dict[typing.Tuple[int, int, int], typing.Tuple[int, int, int]]
+
+# white robes (chars10.png) -> pink robes, the laundry went in with a red sock
+PINK_ROBES = {
+    (153, 156, 144): (156, 157, 147),
+    (153, 157, 144): (157, 159, 148),
+    (189, 152, 127): (190, 152, 128),
+    (191, 154, 129): (193, 155, 133),
+    (193, 155, 130): (196, 157, 135),
+    (194, 166, 120): (201, 170, 135),
+    (195, 157, 132): (199, 160, 140),
+    (199, 161, 135): (206, 165, 148),
+    (163, 171, 175): (172, 174, 182),
+    (205, 168, 140): (216, 174, 162),
+    (235, 179, 133): (236, 180, 140),
+    (200, 187, 170): (230, 193, 209),
+    (201, 188, 171): (231, 193, 210),
+    (188, 188, 188): (214, 192, 209),
+    (193, 196, 175): (233, 197, 219),
+    (194, 191, 187): (223, 194, 213),
+    (193, 194, 203): (213, 195, 216),
+    (196, 199, 212): (214, 199, 221),
+    (211, 211, 211): (237, 203, 229),
+    (255, 217, 173): (255, 207, 209),
+    (230, 230, 201): (255, 198, 242),
+    (223, 223, 218): (247, 205, 236),
+    (224, 224, 218): (247, 204, 236),
+    (226, 226, 226): (245, 208, 236),
+    (219, 230, 235): (238, 213, 239),
+    (226, 235, 240): (241, 215, 241),
+    (219, 230, 255): (225, 224, 253),
+    (232, 242, 250): (243, 222, 246),
+    (255, 248, 222): (255, 205, 239),
+    (255, 249, 223): (255, 205, 239),
+    (226, 253, 255): (239, 229, 249),
+    (255, 255, 252): (255, 223, 246),
+    (255, 255, 255): (255, 225, 248),
+}
+
+PALETTES = {
+    "pink_robes": PINK_ROBES,
+}
+
+
+def recolour(surface: pygame.Surface, palette: Palette) -> pygame.Surface:
+    """Return a copy of {surface} with every colour in {palette} swapped, keeping its alpha."""
+    surface = surface.copy()
+    if numpy is None:
+        pixels = pygame.PixelArray(surface)
+        for source, target in palette.items():
+            pixels.replace(source, target)
+        pixels.close()
+        return surface
+
+    sources = numpy.array(sorted(palette), dtype=numpy.uint32)
+    targets = numpy.array([palette[tuple(source)] for source in sources], dtype=numpy.uint8)
+    keys = (sources[:, 0] << 16) | (sources[:, 1] << 8) | sources[:, 2]
+
+    rgb = pygame.surfarray.pixels3d(surface)
+    packed = (rgb[..., 0].astype(numpy.uint32) << 16) | (rgb[..., 1].astype(numpy.uint32) << 8) | rgb[..., 2]
+    index = numpy.searchsorted(keys, packed).clip(0, len(keys) - 1)
+    hit = keys[index] == packed
+    rgb[hit] = targets[index[hit]]
+    del rgb  # unlocks the surface
+    return surface
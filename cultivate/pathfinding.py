@@ -0,0 +1,212 @@
+"""Routes for npcs around the map's buildings, river and forest, found with A* on a grid.
+
+The map is cut into PATH_CELL_SIZE cells. A cell can be walked through the way the player
+can stand somewhere (Map.can_move): if it touches something passable (a bridge, a door)
+or nothing impassable. Routes are found between cells, moving up, down, left or right,
+and come back as the cells where they turn, so an npc walking them one axis at a time
+never cuts a corner.
+
+Searches run a few hundred cells a tick (PATH_NODES_PER_TICK) between all the npcs that
+asked, so however many ask at once a tick never takes much longer. The budget counts
+cells rather than time so replays find their routes on the same ticks. Found routes are
+cached; changing what blocks the map ({block}, {unblock}) only drops the routes it
+affects.
+"""
+import collections
+import heapq
+import itertools
+import typing
+from functools import lru_cache
+
+import pygame
+
+from cultivate import settings
+from cultivate.culling import world_rect
+
+Cell = typing.Tuple[int, int]
+Route = typing.Optional[typing.List[Cell]]
+
+
+class PathRequest:
+    __slots__ = ("callback", "cancelled")
+
+    def __init__(self, callback: typing.Callable[[Route], None]):
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class Pathfinder:
+    def __init__(self, cell_size: int = None):
+        self.cell_size = settings.PATH_CELL_SIZE if cell_size is None else cell_size
+        self.columns = -(-settings.MAP_WIDTH // self.cell_size)
+        self.rows = -(-settings.MAP_HEIGHT // self.cell_size)
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget the map and every route."""
+        cells = self.columns * self.rows
+        # how many impassable and passable things touch each cell
+        self.blockers = [0] * cells
+        self.openers = [0] * cells
+        # 1 for the cells that can be walked through, by y * columns + x
+        self.open = bytearray(b"\x01") * cells
+        # (start, goal) -> (route, the cells it goes through), least recently used first
+        self.routes = collections.OrderedDict()
+        # searches still running, and who's waiting for each one
+        self.searches = collections.OrderedDict()
+        self.waiting = {}
+
+    def build(self, impassables: typing.Iterable[pygame.sprite.Sprite],
+              passables: typing.Iterable[pygame.sprite.Sprite]) -> None:
+        """Start again with the map's collision sprites, which keep their map position in {x}, {y}."""
+        self.clear()
+        for sprite in impassables:
+            self.count(self.blockers, world_rect(sprite), 1)
+        for sprite in passables:
+            self.count(self.openers, world_rect(sprite), 1)
+
+    def walkable(self, cell: Cell) -> bool:
+        x, y = cell
+        if not (0 <= x < self.columns and 0 <= y < self.rows):
+            return False
+        return bool(self.open[y * self.columns + x])
+
+    def cell_at(self, x: float, y: float) -> Cell:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def cells_under(self, rect: pygame.Rect) -> typing.Iterator[Cell]:
+        left = max(rect.left // self.cell_size, 0)
+        right = min((rect.right - 1) // self.cell_size, self.columns - 1)
+        top = max(rect.top // self.cell_size, 0)
+        bottom = min((rect.bottom - 1) // self.cell_size, self.rows - 1)
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                yield x, y
+
+    def count(self, counts: typing.List[int], rect: pygame.Rect, change: int) -> None:
+        """Add {change} to {counts} for the cells under {rect}, and drop the routes that go differently now."""
+        changed = set()
+        for cell in self.cells_under(rect):
+            index = cell[1] * self.columns + cell[0]
+            counts[index] += change
+            walkable = int(bool(self.openers[index]) or not self.blockers[index])
+            if walkable != self.open[index]:
+                self.open[index] = walkable
+                changed.add(cell)
+        if not changed:
+            return
+        if any(self.walkable(cell) for cell in changed):
+            # somewhere opened up, any route might be shorter through it now
+            self.routes.clear()
+        else:
+            for key in [key for key, (_, through) in self.routes.items() if through & changed]:
+                del self.routes[key]
+        # searches part way through may have gone the old way
+        for key in self.searches:
+            self.searches[key] = self.search(*key)
+
+    def block(self, rect: pygame.Rect) -> None:
+        """Something impassable appeared over {rect}, in map coordinates."""
+        self.count(self.blockers, rect, 1)
+
+    def unblock(self, rect: pygame.Rect) -> None:
+        """Something impassable over {rect} went away."""
+        self.count(self.blockers, rect, -1)
+
+    def request(self, start: Cell, goal: Cell, callback: typing.Callable[[Route], None]) -> PathRequest:
+        """Call {callback} with the route from {start} to {goal}, or None if there isn't one.
+
+        The callback is called straight away for a route that's cached, otherwise once a
+        later {update} has found it.
+        """
+        request = PathRequest(callback)
+        key = (start, goal)
+        if key in self.routes:
+            self.routes.move_to_end(key)
+            callback(self.routes[key][0])
+            return request
+        if key not in self.searches:
+            self.searches[key] = self.search(start, goal)
+            self.waiting[key] = []
+        self.waiting[key].append(request)
+        return request
+
+    def update(self) -> None:
+        """Run the searches asked for, for up to PATH_NODES_PER_TICK cells, oldest first."""
+        budget = settings.PATH_NODES_PER_TICK
+        while self.searches and budget > 0:
+            # a search that finishes takes itself out (see {remember})
+            for _ in next(iter(self.searches.values())):
+                budget -= 1
+                if not budget:
+                    break
+
+    def remember(self, key: typing.Tuple[Cell, Cell], route: Route, cells: typing.Set[Cell]) -> None:
+        self.routes[key] = (route, cells)
+        if len(self.routes) > settings.PATH_CACHE_SIZE:
+            self.routes.popitem(last=False)
+        del self.searches[key]
+        for request in self.waiting.pop(key):
+            if not request.cancelled:
+                request.callback(route)
+
+    def search(self, start: Cell, goal: Cell) -> typing.Iterator[None]:
+        """A* from {start} to {goal}, yielding after each cell it expands.
+
+        Both ends are allowed to be blocked, an npc may be standing next to a wall.
+        """
+        def estimate(cell):
+            return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
+
+        columns, rows, walkable = self.columns, self.rows, self.open
+        tie = itertools.count()
+        came_from = {start: None}
+        cost = {start: 0}
+        expanded = set()
+        frontier = [(estimate(start), next(tie), start)]
+        while frontier:
+            _, _, cell = heapq.heappop(frontier)
+            if cell == goal:
+                break
+            if cell in expanded:
+                continue
+            expanded.add(cell)
+            yield
+            x, y = cell
+            for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if neighbour != goal and not (0 <= neighbour[0] < columns and 0 <= neighbour[1] < rows
+                                              and walkable[neighbour[1] * columns + neighbour[0]]):
+                    continue
+                new_cost = cost[cell] + 1
+                if new_cost < cost.get(neighbour, new_cost + 1):
+                    cost[neighbour] = new_cost
+                    came_from[neighbour] = cell
+                    heapq.heappush(frontier, (new_cost + estimate(neighbour), next(tie), neighbour))
+        else:
+            self.remember((start, goal), None, set())
+            return
+
+        cells = [goal]
+        while came_from[cells[-1]] is not None:
+            cells.append(came_from[cells[-1]])
+        cells.reverse()
+        self.remember((start, goal), turns(cells), set(cells))
+
+
+def turns(cells: typing.List[Cell]) -> typing.List[Cell]:
+    """The first and last of {cells}, and the ones where the route changes direction."""
+    kept = cells[:1]
+    for before, cell, after in zip(cells, cells[1:], cells[2:]):
+        if (cell[0] - before[0], cell[1] - before[1]) != (after[0] - cell[0], after[1] - cell[1]):
+            kept.append(cell)
+    if len(cells) > 1:
+        kept.append(cells[-1])
+    return kept
+
+
+@lru_cache(None)
+def get_pathfinder() -> Pathfinder:
+    return Pathfinder()
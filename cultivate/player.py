@@ -3,11 +3,13 @@ import logging
 import pygame
 from pygame.sprite import Sprite
 
-from cultivate import settings
+from cultivate import events, settings
+from cultivate.audio import get_audio
 from cultivate.loader import get_player
 from cultivate.dialogue import Dialogue
 from cultivate.conversation_tree import ConversationTree
 from cultivate.madlibs import Madlibs
+from cultivate.render_queue import ACTORS
 from cultivate.sprites.bed import Bed
 from cultivate.sprites.grave import Grave
 from cultivate.sprites.pickups import Shovel, Flower
@@ -34,33 +36,44 @@ class Player(Sprite):
         self.interacting_with = None
         self.inventory = None
         self.map = None  # set post init
+        self._dialogue = None
+        self._dialogue_state = None
 
-    def draw(self, surface, key_pressed):
+    @staticmethod
+    def animation(key_pressed):
         if key_pressed[pygame.K_DOWN] or key_pressed[pygame.K_s]:
-            self.image = get_player('forward')
+            return get_player('forward')
         elif key_pressed[pygame.K_UP] or key_pressed[pygame.K_w]:
-            self.image = get_player('backward')
+            return get_player('backward')
         elif key_pressed[pygame.K_RIGHT] or key_pressed[pygame.K_d]:
-            self.image = get_player('right')
+            return get_player('right')
         elif key_pressed[pygame.K_LEFT] or key_pressed[pygame.K_a]:
-            self.image = get_player('left')
-        else:
-            self.image = get_player()
+            return get_player('left')
+        return get_player()
 
-        surface.blit(self.image.getCurrentFrame(), (self.x, self.y))
+    def submit(self, queue, key_pressed):
+        self.image = self.animation(key_pressed)
+        frame = self.image.getCurrentFrame()
+        # the player stays in the middle of the screen however the camera is interpolated
+        queue.submit(ACTORS, self.y + frame.get_height(), frame, (self.x, self.y), fixed=True)
 
+    def draw_ui(self, surface):
         if self.conversation:
-            d = Dialogue()
-            d.set_data(
-                self.conversation.npc_name,
-                self.conversation.current['text'],
-                self.conversation.current['responses']
-            )
-            d.draw(surface)
+            self.dialogue_for(self.conversation).draw(surface)
 
         if self.madlibs is not None:
             self.madlibs.draw(surface)
 
+    def dialogue_for(self, conversation):
+        # the dialogue box is only rebuilt when the conversation moves on
+        state = (conversation, conversation.current)
+        if state != self._dialogue_state:
+            self._dialogue = Dialogue()
+            self._dialogue.set_data(conversation.npc_name, conversation.current['text'],
+                                    conversation.current['responses'])
+            self._dialogue_state = state
+        return self._dialogue
+
     @property
     def direction(self):
         return self._direction
@@ -110,7 +123,7 @@ class Player(Sprite):
             self.interacting_with = self.nearby_interactable
 
             if isinstance(self.interacting_with.interaction_result, ConversationTree):
-                self.map.footstep.stop()
+                get_audio().stop_footsteps()
                 self.conversation = self.interacting_with.interaction_result
 
             elif (
@@ -119,7 +132,7 @@ class Player(Sprite):
                     for thing in self.interacting_with.interaction_result.values()
                 ])
             ):
-                self.map.footstep.stop()
+                get_audio().stop_footsteps()
                 conversations = self.interacting_with.interaction_result
                 if self.game_state.current_task:
                     self.conversation = conversations[self.game_state.current_task]
@@ -143,7 +156,7 @@ class Player(Sprite):
 
 
             elif isinstance(self.interacting_with.interaction_result, Madlibs):
-                self.map.footstep.stop()
+                get_audio().stop_footsteps()
                 self.madlibs = self.interacting_with.interaction_result
 
             elif (
@@ -151,8 +164,8 @@ class Player(Sprite):
                 isinstance(self.pickup, Shovel)
             ):
                 self.interacting_with.dig()
+                self.game_state.events.publish(events.GRAVE_DUG, self.interacting_with)
                 self.interacting_with = None
-                self.game_state.complete_task()
 
             elif (
                 isinstance(self.interacting_with.interaction_result, Grave) and
@@ -160,14 +173,15 @@ class Player(Sprite):
                 isinstance(self.pickup, Flower)
             ):
                 self.interacting_with.plant()
+                self.game_state.events.publish(events.GRAVE_PLANTED, self.interacting_with)
                 self.interacting_with = None
                 self.pickup = None
                 self.inventory.clear_icon()
-                self.game_state.sabotage_task()
             else:
                 self.interacting_with = None
 
     def stop_interact(self):
+        was_interacting = self.interacting_with is not None
         if self.interacting_with == self.nearby_interactable and self.interacting_with is not None:
             if (
                 isinstance(self.interacting_with.interaction_result, dict) and all([
@@ -184,3 +198,5 @@ class Player(Sprite):
         else:
             self.conversation = None
             self.interacting_with = None
+        if was_interacting:
+            self.game_state.events.publish(events.INTERACTION_STOPPED)
@@ -0,0 +1,77 @@
+import math
+import typing
+import weakref
+from itertools import groupby
+from operator import itemgetter
+
+import pygame
+
+# layers, drawn in this order
+MAP = 0
+GROUND = 1  # flat things: graves, the pentagram
+ACTORS = 2  # upright things, sorted by their bottom edge so lower ones overlap higher ones
+ROOFS = 3
+BUBBLES = 4
+
+# surface -> {scale: the surface scaled by it} (see {scaled})
+_scaled = weakref.WeakKeyDictionary()
+
+
+def scaled(surface: pygame.Surface, scale: float) -> pygame.Surface:
+    """{surface} scaled by {scale}, made once and kept for as long as the surface is."""
+    copies = _scaled.setdefault(surface, {})
+    if scale not in copies:
+        size = (math.ceil(surface.get_width() * scale), math.ceil(surface.get_height() * scale))
+        copies[scale] = pygame.transform.scale(surface, size)
+    return copies[scale]
+
+
+def forget_scaled(surface: pygame.Surface) -> None:
+    """Drop the scaled copies of {surface}, after drawing on it."""
+    _scaled.pop(surface, None)
+
+
+def scale_rect(rect: pygame.Rect, scale: float) -> pygame.Rect:
+    rect = pygame.Rect(rect)
+    return pygame.Rect(math.floor(rect.x * scale), math.floor(rect.y * scale),
+                       math.ceil(rect.w * scale), math.ceil(rect.h * scale))
+
+
+class RenderQueue:
+    """Collect a frame's blits, then issue them sorted by layer and sort key.
+
+    Each layer is flushed with one Surface.blits call. Blits with the same layer and
+    sort key keep the order they were submitted in.
+
+    Positions are relative to the viewport of the last simulation tick. {offset} moves
+    them to where the camera is interpolated to, {alpha} of the way between the last two
+    ticks; blits that already account for that are submitted with {fixed}.
+
+    Flushed at a {scale} below 1, everything is drawn that much smaller, from scaled
+    copies of the surfaces (see {scaled}).
+    """
+
+    def __init__(self, offset: typing.Tuple[int, int] = (0, 0), alpha: float = 1.0):
+        self.offset = offset
+        self.alpha = alpha
+        self.items = []
+
+    def submit(self, layer: int, sort_key: int, surface: pygame.Surface,
+               position: typing.Union[pygame.Rect, typing.Tuple[int, int]],
+               area: pygame.Rect = None, fixed: bool = False) -> None:
+        if not fixed:
+            position = (position[0] + self.offset[0], position[1] + self.offset[1])
+        self.items.append((layer, sort_key, len(self.items), surface, position, area))
+
+    def flush(self, target: pygame.Surface, scale: float = 1.0) -> None:
+        self.items.sort(key=itemgetter(0, 1, 2))
+        for _, items in groupby(self.items, key=itemgetter(0)):
+            blits = [(surface, position, area) for _, _, _, surface, position, area in items]
+            if scale != 1:
+                blits = [(scaled(surface, scale),
+                          (math.floor(position[0] * scale), math.floor(position[1] * scale)),
+                          None if area is None else scale_rect(area, scale))
+                         for surface, position, area in blits]
+            target.blits([(surface, position) if area is None else (surface, position, area)
+                          for surface, position, area in blits], doreturn=False)
+        self.items = []
@@ -0,0 +1,90 @@
+import typing
+
+import pygame
+
+from cultivate import display, settings
+
+# (key, screen rect or None, token): the rect is redrawn when the token or rect change.
+# A rect of None means the whole screen is redrawn when the token changes.
+DirtyState = typing.Tuple[typing.Hashable, typing.Optional[pygame.Rect], typing.Any]
+
+
+def merge_rects(rects: typing.Iterable[pygame.Rect], bounds: pygame.Rect) -> typing.List[pygame.Rect]:
+    """Clip {rects} to {bounds} and union the ones that overlap."""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.w or not rect.h:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """Redraw only the parts of the screen that changed since the last frame.
+
+    Every frame is described by a list of {DirtyState}s. When the camera is still, the
+    frame is drawn once, clipped to the box around the rects whose state changed, and
+    only those rects are pushed with pygame.display.update. Anything else falls back to a full redraw and flip.
+    """
+
+    def __init__(self, max_rects: int = 8, max_area: float = 0.5):
+        self.max_rects = max_rects
+        self.max_area = max_area
+        self.bounds = pygame.Rect(0, 0, settings.WIDTH, settings.HEIGHT)
+        self.previous = {}
+        self.camera = None
+        self.full = True
+
+    def invalidate(self) -> None:
+        """Redraw everything next frame."""
+        self.full = True
+
+    def dirty_rects(self, current: typing.Dict[typing.Hashable, typing.Tuple]) -> typing.Optional[typing.List[pygame.Rect]]:
+        """Return the rects to redraw, or None if the whole screen has to be."""
+        rects = []
+        for key in current.keys() | self.previous.keys():
+            now = current.get(key)
+            before = self.previous.get(key)
+            if now == before:
+                continue
+            for state in (before, now):
+                if state is None:
+                    continue
+                if state[0] is None:
+                    return None
+                rects.append(state[0])
+
+        rects = merge_rects(rects, self.bounds)
+        area = sum(rect.w * rect.h for rect in rects)
+        if len(rects) > self.max_rects or area > self.bounds.w * self.bounds.h * self.max_area:
+            return None
+        return rects
+
+    def render(self, screen: pygame.Surface, camera: typing.Hashable,
+               states: typing.Iterable[DirtyState],
+               draw_frame: typing.Callable[[pygame.Surface], None]) -> None:
+        current = {key: (rect.copy() if rect is not None else None, token) for key, rect, token in states}
+        if self.full or camera != self.camera:
+            rects = None
+        else:
+            rects = self.dirty_rects(current)
+        self.previous = current
+        self.camera = camera
+        self.full = False
+
+        if rects is None:
+            draw_frame(screen)
+            display.flip()
+            return
+
+        if rects:
+            # one pass over the scene, clipped to the area around every changed rect
+            screen.set_clip(rects[0].unionall(rects[1:]))
+            draw_frame(screen)
+            screen.set_clip(None)
+        display.update(rects)
@@ -0,0 +1,200 @@
+"""Save the game to a small binary file and pick it up again later.
+
+Layout (little endian):
+
+    header    b"CSAV", version (H)
+    world     seed (Q), day (B), map view x, y (ii)
+    tasks     count (B), per day: completed | sabotaged << 1 (B)
+    graves    count (B), per grave: dug | planted << 1 (B)
+    madlibs   madlib text (str), word count (B), per word: key (str), word (str)
+    player    held pickup type (str, empty for none)
+    pickups   1 if saved (B), count (H), per pickup: type (str), x, y (ii)
+
+where str is a length (H) and then utf-8. Pickups aren't saved at the start of a day,
+the day's spawns are used instead.
+
+Nothing here rebuilds what the game builds anyway: the world comes back from its seed,
+the rest is set on the already built objects.
+"""
+import collections
+import io
+import logging
+import os
+import struct
+import threading
+import typing
+
+from cultivate.game_state import TaskStatus
+from cultivate.sprites import pickups as pickupables
+
+MAGIC = b"CSAV"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+WORLD = struct.Struct("<QBii")
+# world seeds a save can hold (WORLD's Q)
+SEED_RANGE = 2 ** 64
+POSITION = struct.Struct("<ii")
+
+
+class SaveData(typing.NamedTuple):
+    seed: int
+    day: int
+    view: typing.Tuple[int, int]
+    task_status: typing.List[TaskStatus]
+    graves: typing.List[typing.Tuple[bool, bool]]
+    madlib_text: str
+    changed_words: typing.List[typing.Tuple[str, str]]
+    player_pickup: typing.Optional[str]
+    pickups: typing.Optional[typing.List[typing.Tuple[str, int, int]]]
+
+
+def snapshot(game_state, player, game_map, pickups=None) -> SaveData:
+    """Capture the game, without the pickups on the map unless {pickups} is given."""
+    return SaveData(
+        seed=game_map.seed,
+        day=game_state.day,
+        view=(game_map.map_view_x, game_map.map_view_y),
+        task_status=list(game_state.task_status),
+        graves=[(grave.dug, grave.planted) for grave in game_map.graves],
+        madlib_text=game_state.madlib_text,
+        changed_words=list(game_map.desk.madlibs.changed_words.items()),
+        player_pickup=type(player.pickup).__name__ if player.pickup else None,
+        pickups=None if pickups is None else [
+            (type(item).__name__, int(item.x), int(item.y)) for item in pickups
+        ],
+    )
+
+
+def write_str(out: io.BytesIO, text: str) -> None:
+    encoded = text.encode("utf-8")
+    out.write(struct.pack("<H", len(encoded)) + encoded)
+
+
+def read_str(data: memoryview, position: int) -> typing.Tuple[str, int]:
+    length, = struct.unpack_from("<H", data, position)
+    position += 2
+    return bytes(data[position:position + length]).decode("utf-8"), position + length
+
+
+def encode(save: SaveData) -> bytes:
+    out = io.BytesIO()
+    out.write(HEADER.pack(MAGIC, VERSION))
+    out.write(WORLD.pack(save.seed, save.day, *save.view))
+    out.write(struct.pack("<B", len(save.task_status)))
+    out.write(bytes(status.completed | status.sabotaged << 1 for status in save.task_status))
+    out.write(struct.pack("<B", len(save.graves)))
+    out.write(bytes(dug | planted << 1 for dug, planted in save.graves))
+    write_str(out, save.madlib_text)
+    out.write(struct.pack("<B", len(save.changed_words)))
+    for key, word in save.changed_words:
+        write_str(out, key)
+        write_str(out, word)
+    write_str(out, save.player_pickup or "")
+    out.write(struct.pack("<B", save.pickups is not None))
+    if save.pickups is not None:
+        out.write(struct.pack("<H", len(save.pickups)))
+        for name, x, y in save.pickups:
+            write_str(out, name)
+            out.write(POSITION.pack(x, y))
+    return out.getvalue()
+
+
+def decode(data: bytes) -> SaveData:
+    data = memoryview(data)
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} save")
+    position = HEADER.size
+    seed, day, view_x, view_y = WORLD.unpack_from(data, position)
+    position += WORLD.size
+
+    count = data[position]
+    task_status = [TaskStatus(bool(flags & 1), bool(flags & 2)) for flags in data[position + 1:position + 1 + count]]
+    position += 1 + count
+    count = data[position]
+    graves = [(bool(flags & 1), bool(flags & 2)) for flags in data[position + 1:position + 1 + count]]
+    position += 1 + count
+
+    madlib_text, position = read_str(data, position)
+    changed_words = []
+    count = data[position]
+    position += 1
+    for _ in range(count):
+        key, position = read_str(data, position)
+        word, position = read_str(data, position)
+        changed_words.append((key, word))
+
+    player_pickup, position = read_str(data, position)
+    pickups = None
+    if data[position]:
+        count, = struct.unpack_from("<H", data, position + 1)
+        position += 3
+        pickups = []
+        for _ in range(count):
+            name, position = read_str(data, position)
+            x, y = POSITION.unpack_from(data, position)
+            position += POSITION.size
+            pickups.append((name, x, y))
+
+    return SaveData(seed, day, (view_x, view_y), task_status, graves, madlib_text, changed_words,
+                    player_pickup or None, pickups)
+
+
+_write_lock = threading.Lock()
+
+
+def write(path: str, data: bytes) -> None:
+    # written next to the save and swapped in, so a crash mid-write keeps the last good save
+    with _write_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(data)
+        os.replace(temporary_path, path)
+
+
+def save(path: str, save_data: SaveData) -> threading.Thread:
+    """Write {save_data} to {path} on a background thread, it is encoded before returning."""
+    data = encode(save_data)
+
+    def run():
+        try:
+            write(path, data)
+            logging.debug("Saved day %d to %s", save_data.day, path)
+        except OSError as e:
+            logging.warning("Couldn't save to %s (%s)", path, e)
+
+    thread = threading.Thread(target=run, name="save", daemon=True)
+    thread.start()
+    return thread
+
+
+def load(path: str) -> SaveData:
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+def restore(save_data: SaveData, game_state, player, game_map, inventory, pickups) -> None:
+    """Put a game built for {save_data}'s seed and day back how it was saved."""
+    game_state.task_status = list(save_data.task_status)
+    game_state.madlib_text = save_data.madlib_text
+
+    game_map.map_view_x, game_map.map_view_y = save_data.view
+    game_map.prev_view_x, game_map.prev_view_y = save_data.view
+    for grave, (dug, planted) in zip(game_map.graves, save_data.graves):
+        if dug:
+            grave.dig()
+        if planted:
+            grave.plant()
+    game_map.desk.madlibs.changed_words = collections.OrderedDict(save_data.changed_words)
+
+    player.pickup = None
+    if save_data.player_pickup:
+        player.pickup = getattr(pickupables, save_data.player_pickup)(0, 0)
+    inventory.set_icon(player.pickup)
+
+    if save_data.pickups is not None:
+        pickups.empty()
+        pickups.add(*[getattr(pickupables, name)(x, y) for name, x, y in save_data.pickups])
+    # the task tracker counted what was there before
+    game_state.start_task_tracker()
@@ -2,20 +2,60 @@ import os
 
 import pygame
 
-# I dislike that settings imports loader  - Ed
-from cultivate.loader import get_font
-
 
 DEBUG = False
 FPS = 60
+# the simulation runs at a fixed rate whatever the frame rate, speeds are in pixels per tick
+TICK_RATE = 60
+# longest frame the simulation catches up on, so a long hitch doesn't snowball
+MAX_FRAME_TIME = 0.25
+# frame pacing: capped, vsync, uncapped or adaptive (see frame_pacing.py)
+FPS_MODE = "capped"
+ADAPTIVE_FALLBACK_FPS = 30
+FRAME_TIME_WINDOW = 120
+
+# music, streamed from MUSIC_DIR
+# day -> tracks played in turn, days without a playlist play DEFAULT_PLAYLIST
+DEFAULT_PLAYLIST = ["beeball.ogg"]
+MUSIC_PLAYLISTS = {}
+FINALE_TRACK = "beeball.ogg"
+MUSIC_FADE_MS = 1500
+
+# mixer, smaller buffers lower the sound effect latency but may crackle on slow machines
+AUDIO_FREQUENCY = 22050
+AUDIO_BUFFER = 1024
+AUDIO_CHANNELS = 16
 
-# dimensions
+# dimensions, the logical resolution everything is drawn at
 HEIGHT = 700
 WIDTH = 1100
 VIEW_PORT_SIZE = (WIDTH, HEIGHT)
+# window size, None to match the logical resolution, and how the back buffer is scaled to it (see display.py)
+WINDOW_SIZE = None
+SCALE_MODE = "nearest"
+# the world is drawn at this fraction of the logical resolution and scaled up under the ui,
+# below 1 for slow machines (see display.py)
+RENDER_SCALE = 1.0
 
 MAP_HEIGHT = MAP_WIDTH = 700 * 6
 TOTAL_MAP_SIZE = (MAP_HEIGHT, MAP_WIDTH)
+# the same seed always generates the same world, None picks a new one each run
+WORLD_SEED = None
+
+# grid size of the spatial index used to cull drawables outside the viewport
+CULL_CELL_SIZE = 512
+# npcs off screen move in bigger, rarer steps: every NPC_LOD_NEAR_INTERVAL ticks within
+# NPC_LOD_NEAR_DISTANCE pixels of the screen, every NPC_LOD_FAR_INTERVAL ticks further away
+NPC_LOD_NEAR_DISTANCE = 600
+NPC_LOD_NEAR_INTERVAL = 4
+NPC_LOD_FAR_INTERVAL = 30
+# move npcs a whole crowd at a time with numpy (see crowd.py), off by default and without numpy
+NPC_CROWD = False
+# npc routes are found on a grid of PATH_CELL_SIZE pixel cells, the last PATH_CACHE_SIZE
+# are remembered, and searches expand at most PATH_NODES_PER_TICK cells a tick between them
+PATH_CELL_SIZE = 50
+PATH_CACHE_SIZE = 256
+PATH_NODES_PER_TICK = 500
 
 
 # file paths
@@ -29,21 +69,39 @@ SOUNDS_DIR = os.path.join(ROOT_ASSETS_DIR, 'sounds')
 MUSIC_DIR = os.path.join(ROOT_ASSETS_DIR, 'music')
 DIALOGUE_DIR = os.path.join(ROOT_ASSETS_DIR, 'dialogue')
 FONTS_DIR = os.path.join(ROOT_ASSETS_DIR, 'fonts')
+# build with `cultivate-pack`, without it the loose files above are used
+ASSET_PACK = os.path.join(RUN_DIR, 'assets.pack')
+DAYS_DIR = os.path.join(ROOT_ASSETS_DIR, 'days')
+DAYS_PACK = os.path.join(RUN_DIR, 'days.pack')
+SAVE_FILE = os.path.join(os.path.expanduser('~'), '.cultivate', 'save.dat')
 
 
-# default fonts
-pygame.font.init()
-
+# default fonts, only created when first used (see __getattr__)
 FONT = "NixieOne.ttf"
 FONT_SIZE_XS = 12
-XS_FONT = get_font(FONT, FONT_SIZE_XS)
 FONT_SIZE_SM = 14
-SM_FONT = get_font(FONT, FONT_SIZE_SM)
 FONT_SIZE_MD = 18
-MD_FONT = get_font(FONT, FONT_SIZE_MD)
 FONT_SIZE_LG = 20
-LG_FONT = get_font(FONT, FONT_SIZE_LG)
 FONT_SIZE_XL = 24
-XL_FONT = get_font(FONT, FONT_SIZE_XL)
-MADLIBS_FONT = get_font("Cultivate-Regular.ttf", 32)
-TITLE_FONT = get_font("Cultivate-Regular.ttf", 72)
+FONTS = {
+    "XS_FONT": (FONT, FONT_SIZE_XS),
+    "SM_FONT": (FONT, FONT_SIZE_SM),
+    "MD_FONT": (FONT, FONT_SIZE_MD),
+    "LG_FONT": (FONT, FONT_SIZE_LG),
+    "XL_FONT": (FONT, FONT_SIZE_XL),
+    "MADLIBS_FONT": ("Cultivate-Regular.ttf", 32),
+    "TITLE_FONT": ("Cultivate-Regular.ttf", 72),
+}
+
+# rendered text surfaces kept by loader.render_text
+TEXT_CACHE_SIZE = 256
+
+
+def __getattr__(name):
+    if name in FONTS:
+        from cultivate.loader import get_font
+
+        if not pygame.font.get_init():
+            pygame.font.init()
+        return get_font(*FONTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,160 @@
+"""Play many seeded games with the autoplay bot in parallel, to catch crashes and slow runs.
+
+Runs are spread over a multiprocessing pool. Each worker starts pygame headless once and
+plays run after run in it, so loaded images and fonts stay cached between runs. Each
+run gets its own world seed and random choice of which tasks to sabotage, both drawn
+from --seed, so a batch (or any single run from it) can be played again.
+
+    python -m cultivate.simulate [--runs 100] [--processes N] [--seed N] [--out runs/] [--report summary.json]
+
+Each run's report is the one autoplay.play returns, a run that raised has an error
+instead. Peak RSS is the worker's, so it only grows over the runs a worker plays.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import traceback
+import typing
+
+from cultivate import autoplay
+
+# how many of the slowest runs the summary lists
+OUTLIERS = 5
+
+_screen = None
+
+
+class Job(typing.NamedTuple):
+    index: int
+    seed: int
+    choices: typing.Dict[int, str]
+
+
+def make_jobs(runs: int, seed: int) -> typing.List[Job]:
+    rng = random.Random(seed)
+    return [
+        Job(index, rng.randrange(2 ** 32),
+            {day: rng.choice((autoplay.COMPLETE, autoplay.SABOTAGE)) for day in autoplay.TASK_DAYS})
+        for index in range(runs)
+    ]
+
+
+def expected_outcome(choices: typing.Dict[int, str]) -> str:
+    if all(choice == autoplay.SABOTAGE for choice in choices.values()):
+        return "summoning_sabotaged"
+    return "demon_summoned"
+
+
+def init_worker() -> None:
+    global _screen
+    # SDL catches SIGTERM otherwise, and the pool couldn't stop its workers
+    os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+    _screen = autoplay.init(headless=True)
+
+
+def run(job: Job) -> dict:
+    try:
+        report = autoplay.play(_screen, job.choices, job.seed)
+    except Exception:
+        report = {
+            "seed": job.seed,
+            "choices": {str(day): choice for day, choice in sorted(job.choices.items())},
+            "outcome": None,
+            "error": traceback.format_exc(),
+        }
+    report["index"] = job.index
+    report["expected"] = expected_outcome(job.choices)
+    return report
+
+
+def summarise(reports: typing.List[dict], wall_time: float) -> dict:
+    finished = [report for report in reports if "all" in report]
+    p95s = [report["all"]["p95_ms"] for report in finished if report["all"]["p95_ms"] is not None]
+    histogram = {}
+    for report in finished:
+        for bucket, count in report["all"]["histogram"].items():
+            histogram[bucket] = histogram.get(bucket, 0) + count
+    outcomes = {}
+    for report in reports:
+        outcomes[report["outcome"] or "failed"] = outcomes.get(report["outcome"] or "failed", 0) + 1
+
+    def brief(report):
+        return {key: report.get(key) for key in ("index", "seed", "choices", "outcome", "expected", "error")}
+
+    slowest = sorted(finished, key=lambda report: report["all"]["p95_ms"] or 0, reverse=True)[:OUTLIERS]
+    return {
+        "runs": len(reports),
+        "wall_time": round(wall_time, 3),
+        "outcomes": outcomes,
+        # crashed, got stuck or ended the wrong way
+        "failures": [brief(report) for report in reports if report["outcome"] != report["expected"]],
+        "frames": sum(report["all"]["frames"] for report in finished),
+        "p95_ms": {
+            "median": round(statistics.median(p95s), 3) if p95s else None,
+            "max": max(p95s) if p95s else None,
+        },
+        "max_ms": max((report["all"]["max_ms"] or 0 for report in finished), default=None),
+        "histogram": histogram,
+        "peak_rss_kb": max((report["all"]["peak_rss_kb"] or 0 for report in finished), default=None),
+        "slowest": [dict(brief(report), p95_ms=report["all"]["p95_ms"]) for report in slowest],
+    }
+
+
+def print_summary(summary: dict) -> None:
+    print(f"{summary['runs']} runs in {summary['wall_time']:.1f}s: "
+          + ", ".join(f"{count} {outcome}" for outcome, count in sorted(summary["outcomes"].items())))
+    if summary["frames"]:
+        print(f"  frame p95 median {summary['p95_ms']['median']}ms, worst {summary['p95_ms']['max']}ms, "
+              f"max {summary['max_ms']}ms, peak rss {summary['peak_rss_kb']}kB")
+    for failure in summary["failures"]:
+        reason = (failure["error"] or "").strip().splitlines()[-1:] or [failure["outcome"]]
+        print(f"  run {failure['index']} (seed {failure['seed']}) failed, expected {failure['expected']}: "
+              f"{reason[0]}")
+
+
+def simulate(runs: int, seed: int, processes: int = None, out_dir: str = None) -> dict:
+    """Play {runs} games over {processes} workers and return the summary."""
+    jobs = make_jobs(runs, seed)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    reports = []
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes, initializer=init_worker) as pool:
+        for report in pool.imap_unordered(run, jobs):
+            reports.append(report)
+            logging.info("Run %d/%d (seed %d): %s", len(reports), runs, report["seed"],
+                         report["outcome"] or "failed")
+            if out_dir:
+                with open(os.path.join(out_dir, f"run_{report['index']}.json"), "w") as f:
+                    json.dump(report, f, indent=2)
+        pool.close()
+        pool.join()
+    reports.sort(key=lambda report: report["index"])
+    return summarise(reports, time.perf_counter() - start)
+
+
+def main(argv=sys.argv[1:]):
+    logging.basicConfig(level=logging.DEBUG if "--debug" in argv else logging.INFO,
+                        format="%(levelname)-8s %(asctime)15s [%(filename)s@%(lineno)-3s] %(message)s")
+    runs = int(argv[argv.index('--runs') + 1]) if "--runs" in argv else 100
+    processes = int(argv[argv.index('--processes') + 1]) if "--processes" in argv else None
+    seed = int(argv[argv.index('--seed') + 1]) if "--seed" in argv else random.randrange(2 ** 32)
+    out_dir = argv[argv.index('--out') + 1] if "--out" in argv else None
+    logging.info("Simulating %d runs from seed %d", runs, seed)
+
+    summary = simulate(runs, seed, processes, out_dir)
+    summary["seed"] = seed
+    print_summary(summary)
+    if "--report" in argv:
+        with open(argv[argv.index('--report') + 1], "w") as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
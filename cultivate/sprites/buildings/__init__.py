@@ -7,6 +7,7 @@ import pygame
 from cultivate import settings
 from cultivate.loader import (get_floor, get_roof_small, get_walls,
                               get_walls_edge)
+from cultivate.render_queue import ROOFS, RenderQueue, forget_scaled
 from cultivate.sprites import UpdatableSprite
 
 
@@ -49,24 +50,17 @@ class Building(abc.ABC):
         self.rect.x = self.map_x - view_port.x
         self.rect.y = self.map_y - view_port.y
 
-    def draw(self, map_foreground: pygame.Surface) -> None:
-        """Draw the roof if the player is not near the building."""
-        rect_near_player = pygame.Rect(
-            settings.WIDTH // 2 - 75, settings.HEIGHT // 2 - 75,
-            150, 150
-        )
-        if not rect_near_player.colliderect(self.rect):
-            map_foreground.blit(
-                self.roof,
-                pygame.Rect(self.rect.x, self.rect.y - self.roof_y_overlap,
-                            self.rect.width, self.rect.height + self.roof_y_overlap)
-            )
-            map_foreground.blit(
-                self.sign,
-                pygame.Rect(self.rect.x + self.rect.w // 2 - self.sign.get_rect().w // 2,
-                            self.rect.y + self.roof_y_overlap - self.sign.get_rect().h,
-                            self.rect.w, self.rect.h)
-            )
+    @property
+    def map_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.map_x, self.map_y, self.width, self.height)
+
+    def roof_blits(self) -> typing.List[typing.Tuple[pygame.Surface, pygame.Rect]]:
+        """The roof and sign, positioned on the map."""
+        return [
+            (self.roof, self.roof.get_rect(topleft=(self.map_x, self.map_y - self.roof_y_overlap))),
+            (self.sign, self.sign.get_rect(topleft=(self.map_x + self.width // 2 - self.sign.get_rect().w // 2,
+                                                    self.map_y + self.roof_y_overlap - self.sign.get_rect().h))),
+        ]
 
     @property
     @abc.abstractmethod
@@ -103,6 +97,53 @@ class Building(abc.ABC):
         pass
 
 
+class RoofOverlay:
+    """Every roof and sign pre-composed on one surface, so they are drawn with a single blit.
+
+    A roof is hidden while the player is near its building. The overlay is only
+    re-composed, around that building, when one of those flags changes.
+    """
+
+    def __init__(self, buildings: typing.Iterable):
+        self.buildings = list(buildings)
+        rects = [rect for building in self.buildings for _, rect in building.roof_blits()]
+        self.bounds = rects[0].unionall(rects[1:])
+        self.image = pygame.Surface(self.bounds.size, pygame.SRCALPHA)
+        self.visible = {building: True for building in self.buildings}
+        for building in self.buildings:
+            self.draw_roof(building)
+
+    def draw_roof(self, building) -> None:
+        for surface, rect in building.roof_blits():
+            self.image.blit(surface, rect.move(-self.bounds.x, -self.bounds.y))
+
+    def update(self, near_player: pygame.Rect) -> None:
+        """Hide the roofs of buildings that {near_player} (in map coordinates) overlaps."""
+        for building in self.buildings:
+            visible = not near_player.colliderect(building.map_rect)
+            if visible != self.visible[building]:
+                self.visible[building] = visible
+                self.recompose(building)
+
+    def recompose(self, changed) -> None:
+        # redraw every visible roof overlapping the changed one, clipped to its area
+        for area in [rect for _, rect in changed.roof_blits()]:
+            local = area.move(-self.bounds.x, -self.bounds.y)
+            self.image.fill((0, 0, 0, 0), local)
+            self.image.set_clip(local)
+            for building in self.buildings:
+                if self.visible[building]:
+                    self.draw_roof(building)
+            self.image.set_clip(None)
+        forget_scaled(self.image)
+
+    def submit(self, queue: RenderQueue, view_port: pygame.Rect) -> None:
+        area = view_port.clip(self.bounds)
+        if area.w and area.h:
+            queue.submit(ROOFS, 0, self.image, (area.x - view_port.x, area.y - view_port.y),
+                         area.move(-self.bounds.x, -self.bounds.y), fixed=True)
+
+
 class DefaultBuilding(Building):
     """Default building without a sign or items."""
 
@@ -1,15 +1,16 @@
 import pygame
 from cultivate.loader import get_stone_cross_floor, get_stone_cross_wall, get_altar, get_pews, get_church_roof
-from cultivate import settings
 from cultivate.sprites import UpdatableSprite
 
 
 class Church:
     def __init__(self, map_background: pygame.Surface):
         self.passables = pygame.sprite.Group()
-        self.rect = pygame.Rect(3000, 1500, 288, 544)
+        # where the church is on the map, self.rect follows it around the screen
+        self._map_rect = pygame.Rect(3000, 1500, 288, 544)
+        self.rect = self._map_rect.copy()
         self.floor = get_stone_cross_floor(self.rect.w, self.rect.h)
-        self.walls = get_stone_cross_wall(288, 544)
+        self.walls = get_stone_cross_wall(self.rect.w, self.rect.h)
         self.pews = get_pews()
         altar = get_altar()
         map_background.blit(self.floor, (self.rect.x, self.rect.y))
@@ -30,19 +31,13 @@ class Church:
         self.impassables = pygame.sprite.Group(impassable_altar)
 
     def update(self, view_port: pygame.Rect):
-        self.rect.x = 3000 - view_port.x
-        self.rect.y = 1500 - view_port.y
+        self.rect.x = self._map_rect.x - view_port.x
+        self.rect.y = self._map_rect.y - view_port.y
 
-    def draw(self, map_foreground: pygame.Surface) -> None:
-        """Draw the roof if the player is not near the building."""
-        rect_near_player = pygame.Rect(
-            settings.WIDTH // 2 - 75, settings.HEIGHT // 2 - 75,
-            150, 150
-        )
-        if not rect_near_player.colliderect(self.rect):
-            map_foreground.blit(
-                self.roof,
-                pygame.Rect(self.rect.x + 1, self.rect.y - 84,
-                            self.rect.width, self.rect.height + 100)
-            )
+    @property
+    def map_rect(self) -> pygame.Rect:
+        return self._map_rect.copy()
+
+    def roof_blits(self):
+        return [(self.roof, self.roof.get_rect(topleft=(self._map_rect.x + 1, self._map_rect.y - 84)))]
 
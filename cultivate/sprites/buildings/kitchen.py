@@ -7,11 +7,16 @@ from cultivate.sprites.buildings import DefaultBuilding
 
 
 class Kitchen(DefaultBuilding):
+    def __init__(self, map_x, map_y, map_background: pygame.Surface, seed: int = None):
+        # the world seed the map is generated from, picks the vegetables
+        self.seed = seed
+        super().__init__(map_x, map_y, map_background)
+
     def get_sign(self) -> pygame.Surface:
         return get_kitchen_sign()
 
     def draw_items(self, map_background: pygame.Surface):
-        veggies = get_vegetables(180, 200)
+        veggies = get_vegetables(180, 200, self.seed)
         lemon = get_lemon_basket()
         herbs = get_herbs()
         cheesecabinet = get_cabinet()
@@ -1,6 +1,7 @@
 import pygame
 
 from cultivate.loader import get_clothes_line
+from cultivate.render_queue import ACTORS
 from cultivate.sprites import UpdatableSprite
 
 
@@ -21,5 +22,5 @@ class ClothesLine(UpdatableSprite):
     def interaction_result(self):
         return self
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+    def submit(self, queue):
+        queue.submit(ACTORS, self.rect.bottom, self.image, self.rect)
@@ -2,6 +2,7 @@
 import pygame
 from pygame.sprite import Sprite
 from cultivate.loader import get_fire, get_demon_fire
+from cultivate.render_queue import ACTORS
 
 class Fire(Sprite):
     def __init__(self, x, y):
@@ -19,8 +20,8 @@ class Fire(Sprite):
         self.rect.x = self.x - view_port.x
         self.rect.y = self.y - view_port.y
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+    def submit(self, queue):
+        queue.submit(ACTORS, self.rect.bottom, self.image, self.rect)
 
     @property
     def help_text(self):
@@ -46,8 +47,8 @@ class DemonFire(Sprite):
         self.rect.x = self.x - view_port.x
         self.rect.y = self.y - view_port.y
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+    def submit(self, queue):
+        queue.submit(ACTORS, self.rect.bottom, self.image, self.rect)
 
     @property
     def help_text(self):
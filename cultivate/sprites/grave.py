@@ -1,6 +1,7 @@
 import pygame
 
 from cultivate.loader import get_grave, get_dug_grave, get_planted_grave
+from cultivate.render_queue import GROUND
 from cultivate.sprites import UpdatableSprite
 
 
@@ -40,5 +41,5 @@ class Grave(UpdatableSprite):
     def interaction_result(self):
         return self
 
-    def draw(self, surface):
-        surface.blit(self.grave_image, self.rect)
+    def submit(self, queue):
+        queue.submit(GROUND, self.rect.bottom, self.grave_image, self.rect)
@@ -0,0 +1,131 @@
+"""Follow each day's task through events, marking it completed or sabotaged as soon as it is."""
+import abc
+import collections
+import typing
+
+from pygame.sprite import Group
+
+from cultivate import events
+from cultivate.sprites import pickups as pickupables
+from cultivate.sprites.desk import Desk
+from cultivate.sprites.grave import Grave
+
+
+class TaskTracker(abc.ABC):
+    """Subscribes its {handlers} for one day, counting what the task needs as it changes.
+
+    {start} looks at the day's items once, after that only events are handled.
+    """
+    handlers = {}  # event -> method name
+
+    def __init__(self, game_state, pickups: Group, static_interactables: Group):
+        self.game_state = game_state
+        self.subscriptions = [(event, getattr(self, name)) for event, name in self.handlers.items()]
+        for event, handler in self.subscriptions:
+            game_state.events.subscribe(event, handler)
+        self.start(pickups, static_interactables)
+
+    def start(self, pickups: Group, static_interactables: Group) -> None:
+        pass
+
+    def stop(self) -> None:
+        for event, handler in self.subscriptions:
+            self.game_state.events.unsubscribe(event, handler)
+        self.subscriptions = []
+
+
+class DigGraves(TaskTracker):
+    handlers = {events.GRAVE_DUG: "dug", events.GRAVE_PLANTED: "planted"}
+
+    def start(self, pickups, static_interactables):
+        graves = [item for item in static_interactables if isinstance(item, Grave)]
+        self.dug_count = sum(grave.dug for grave in graves)
+        self.planted_count = sum(grave.planted for grave in graves)
+        self.check()
+
+    def dug(self, grave):
+        self.dug_count += 1
+        self.check()
+
+    def planted(self, grave):
+        self.planted_count += 1
+        self.check()
+
+    def check(self):
+        # a single grave has always been enough either way
+        if self.dug_count:
+            self.game_state.complete_task()
+        if self.planted_count:
+            self.game_state.sabotage_task()
+
+
+class ItemTask(TaskTracker):
+    """A task done by making an item, tracked by counting the pickups of each type on the map."""
+    handlers = {events.ITEM_CREATED: "created", events.ITEM_REMOVED: "removed"}
+
+    def start(self, pickups, static_interactables):
+        self.counts = collections.Counter(type(item) for item in pickups)
+        self.check()
+
+    def created(self, item):
+        self.counts[type(item)] += 1
+        self.check()
+
+    def removed(self, item):
+        self.counts[type(item)] -= 1
+
+    @abc.abstractmethod
+    def check(self):
+        pass
+
+
+class MakeLemonade(ItemTask):
+    def check(self):
+        if self.counts[pickupables.Lemonade]:
+            self.game_state.complete_task()
+            if self.counts[pickupables.EmptyBottle]:
+                self.game_state.sabotage_task()
+
+
+class DoLaundry(ItemTask):
+    def check(self):
+        if self.counts[pickupables.WhiteRobes]:
+            self.game_state.complete_task()
+        if self.counts[pickupables.PinkRobes]:
+            self.game_state.sabotage_task()
+
+
+class MakeCandles(ItemTask):
+    def check(self):
+        if self.counts[pickupables.BlackCandles]:
+            self.game_state.complete_task()
+        if self.counts[pickupables.ScentedBlackCandles]:
+            self.game_state.sabotage_task()
+
+
+class EditPrayer(TaskTracker):
+    handlers = {events.MADLIBS_EDITED: "edited"}
+
+    def start(self, pickups, static_interactables):
+        for item in static_interactables:
+            if isinstance(item, Desk):
+                self.edited(item.madlibs)
+
+    def edited(self, madlibs):
+        if not madlibs.edited:
+            return
+        if madlibs.correct:
+            self.game_state.complete_task()
+        else:
+            self.game_state.sabotage_task()
+        self.game_state.madlib_text = madlibs.unformattted_prose.format_map(madlibs.changed_words)
+
+
+# day -> tracker, days without one have nothing to track
+TRACKERS: typing.Dict[int, typing.Type[TaskTracker]] = {
+    1: DigGraves,
+    2: MakeLemonade,
+    3: DoLaundry,
+    4: MakeCandles,
+    5: EditPrayer,
+}
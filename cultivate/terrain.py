@@ -0,0 +1,103 @@
+"""Build the map's terrain: tiled fills and the scattered things placed on top.
+
+Fills blit the tile once and then copy the filled area onto itself, doubling it each
+time, so a 4200x4200 field takes ~20 blits instead of ~69,000. Scatters are worked out
+as a list of (surface, position) first and drawn with a single Surface.blits call.
+
+Placement takes an {rng} with the random.Random interface, the module by default. To
+generate the same world again each stage gets its own stream from the world seed, see
+{stage_rng}, so changing one stage doesn't shift the numbers every later stage draws.
+"""
+import random
+import typing
+
+import pygame
+
+Placement = typing.Tuple[pygame.Surface, typing.Tuple[int, int]]
+
+
+def stage_rng(seed: int, stage: str) -> random.Random:
+    """The random stream for one stage ("forest", "weeds", ...) of generating the world from {seed}."""
+    # str seeds are hashed with sha512, so unlike hash() they're the same in every process
+    return random.Random(f"{seed}/{stage}")
+
+
+def tile(surface: pygame.Surface, tile_image: pygame.Surface) -> pygame.Surface:
+    """Cover {surface} with {tile_image}, repeated from the top left corner."""
+    width, height = surface.get_size()
+    # blending onto a surface with per pixel alpha would change the tile's semi-transparent
+    # pixels, the max of it and the still empty destination copies it as is
+    flags = pygame.BLEND_RGBA_MAX if surface.get_flags() & pygame.SRCALPHA else 0
+    surface.blit(tile_image, (0, 0), None, flags)
+
+    filled_width, filled_height = tile_image.get_size()
+    filled_height = min(filled_height, height)
+    while filled_width < width:
+        surface.blit(surface, (filled_width, 0), (0, 0, filled_width, filled_height), flags)
+        filled_width *= 2
+    while filled_height < height:
+        surface.blit(surface, (0, filled_height), (0, 0, width, filled_height), flags)
+        filled_height *= 2
+    return surface
+
+
+def draw(surface: pygame.Surface, placements: typing.Iterable[Placement]) -> pygame.Surface:
+    surface.blits(list(placements), doreturn=False)
+    return surface
+
+
+def forest(tiles: typing.Sequence[pygame.Surface], width: int, height: int, rng=random) -> typing.List[Placement]:
+    """Trees around the edges of a {width} x {height} map, {tiles}[1] is the tall one."""
+    tall = tiles[1]
+    short = [tile_image for tile_image in tiles if tile_image is not tall]
+    placements = []
+    # top edge
+    for i in range(0, width, 100):
+        placements += [
+            (tall, (i, -50)),
+            (rng.choice(tiles), (i + rng.randint(-30, 0), rng.randint(-20, 20))),
+            (rng.choice(tiles), (i + rng.randint(-30, 0), 150 + rng.randint(-20, 20))),
+            (rng.choice(short), (i + rng.randint(-25, 25), 250 + rng.randint(-25, 25))),
+        ]
+    # left edge
+    for i in range(0, height, 100):
+        placements.append((tall, (-50, i + rng.randint(-30, 0))))
+        placements += [(rng.choice(tiles), (x + rng.randint(-30, 30), i + rng.randint(-30, 0)))
+                       for x in range(50, 450, 90)]
+    # right edge
+    for i in range(0, height, 100):
+        placements.append((tall, (width - 100, i + rng.randint(-30, 0))))
+        placements += [(rng.choice(tiles), (width - x + rng.randint(-30, 30), i + rng.randint(-30, 0)))
+                       for x in range(50, 550, 90)]
+    # bottom edge
+    for i in range(0, width, 100):
+        placements += [(rng.choice(tiles), (i + rng.randint(-30, 0), height - y + rng.randint(-30, 30)))
+                       for y in range(50, 400, 90)]
+        placements.append((tall, (i, height - 100)))
+    return placements
+
+
+def garden(tiles: typing.Sequence[pygame.Surface], x: int, y: int, width: int, height: int,
+           rng=random) -> typing.List[Placement]:
+    """Bushes along the top and sides of a {width} x {height} garden at {x}, {y}."""
+    placements = []
+    for i in range(0, width, 60):
+        placements += [(rng.choice(tiles), (x + i + rng.randint(0, 5), y + rng.randint(0, 10)))
+                       for _ in range(2)]
+    for j in range(0, height, 60):
+        placements += [
+            (rng.choice(tiles), (x + rng.randint(0, 10), y + j + rng.randint(0, 5))),
+            (rng.choice(tiles), (x + width - 60 + rng.randint(0, 10), y + j + rng.randint(0, 5))),
+        ]
+    return placements
+
+
+def scatter(image: pygame.Surface, count: int, width: int, height: int, rng=random) -> typing.List[Placement]:
+    """{count} copies of {image} anywhere in {width} x {height}."""
+    return [(image, (rng.randrange(0, width), rng.randrange(0, height))) for _ in range(count)]
+
+
+def pick(images: typing.Sequence[pygame.Surface], positions: typing.Iterable[typing.Tuple[int, int]],
+         rng=random) -> typing.List[Placement]:
+    """A random one of {images} at each of {positions}."""
+    return [(rng.choice(images), position) for position in positions]
@@ -0,0 +1,104 @@
+"""Run cutscenes written as generators, picked up again only when what they wait for happens.
+
+A cutscene yields what it's waiting for:
+
+    Ticks(n)            n updates of the timeline from now
+    a Signal            until it's fired, straight on if it already has been
+    all_of(*signals)    until every one of them has been fired
+
+Nothing is checked while a cutscene waits. A signal puts its waiters back in the queue
+when it's fired, to run on the next update, and sleeping cutscenes wait on a game clock
+timer (see timers.py).
+"""
+import collections
+import typing
+
+from cultivate.timers import TimerWheel
+
+
+class Ticks(typing.NamedTuple):
+    count: int
+
+
+class Signal:
+    """Something a cutscene can wait for, fired (once) by whatever sees it happen."""
+
+    def __init__(self):
+        self.fired = False
+        self.waiting = []
+
+    def fire(self) -> None:
+        if self.fired:
+            return
+        self.fired = True
+        waiting, self.waiting = self.waiting, []
+        for callback in waiting:
+            callback()
+
+    def then(self, callback: typing.Callable[[], None]) -> None:
+        """Call {callback} when the signal fires, now if it has."""
+        if self.fired:
+            callback()
+        else:
+            self.waiting.append(callback)
+
+
+def all_of(*signals: Signal) -> Signal:
+    """A signal fired once all of {signals} have been."""
+    combined = Signal()
+    remaining = [len(signals)]
+
+    def one_fired():
+        remaining[0] -= 1
+        if not remaining[0]:
+            combined.fire()
+
+    for signal in signals:
+        signal.then(one_fired)
+    if not signals:
+        combined.fire()
+    return combined
+
+
+def next_event(event_bus, event: str) -> Signal:
+    """A signal fired the next time {event} is published on {event_bus}."""
+    signal = Signal()
+
+    def handler(*args):
+        event_bus.unsubscribe(event, handler)
+        signal.fire()
+
+    event_bus.subscribe(event, handler)
+    return signal
+
+
+Cutscene = typing.Generator[typing.Union[Ticks, Signal], None, None]
+
+
+class Timeline:
+    """Step the cutscenes {start}ed on it, once per game tick, after {timers} has moved on."""
+
+    def __init__(self, timers: TimerWheel):
+        self.timers = timers
+        self.ready = collections.deque()
+
+    def start(self, cutscene: Cutscene) -> None:
+        """Run {cutscene} from the next update."""
+        self.ready.append(cutscene)
+
+    def update(self) -> None:
+        # exceptions from a cutscene (the game ending) go to whoever updates the timeline
+        while self.ready:
+            self.resume(self.ready.popleft())
+
+    def resume(self, cutscene: Cutscene) -> None:
+        try:
+            wait = next(cutscene)
+        except StopIteration:
+            return
+        if isinstance(wait, Ticks):
+            self.timers.after(wait.count, lambda: self.ready.append(cutscene))
+        elif isinstance(wait, Signal):
+            wait.then(lambda: self.ready.append(cutscene))
+        else:
+            raise TypeError(f"cutscene yielded {wait!r}, not Ticks or a Signal")
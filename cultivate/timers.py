@@ -0,0 +1,111 @@
+"""Timers on the game clock: run a callback after so many ticks, once or every so often.
+
+The clock only moves when the game ticks (GameState.update), so timers pause with the
+game, speed up with it, and fire on the same tick every time a game is replayed.
+
+Timers are kept in a hierarchical timer wheel. The first level has a slot for each of
+the next 256 ticks, each level above has 64 slots covering 64 times the span of a slot
+below it. A timer goes in the lowest level that still holds its due tick, and moves down
+a level whenever the level below comes round to its slot. A tick only looks at its own
+slot (and every 256 ticks, the one slot moving down), so it costs as much as the timers
+firing on it, however many are waiting. Cancelled timers are dropped when their slot
+comes up.
+"""
+import typing
+from functools import lru_cache
+
+from cultivate import settings
+
+# bits of the tick each level of the wheel covers, lowest first
+LEVEL_BITS = (8, 6, 6, 6)
+
+
+def ticks(seconds: float) -> int:
+    """How many game ticks make {seconds}."""
+    return round(seconds * settings.TICK_RATE)
+
+
+class Timer:
+    __slots__ = ("due", "callback", "period", "cancelled")
+
+    def __init__(self, due: int, callback: typing.Callable[[], None], period: typing.Optional[int]):
+        self.due = due
+        self.callback = callback
+        self.period = period
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class TimerWheel:
+    def __init__(self):
+        self.now = 0
+        self.shifts = [sum(LEVEL_BITS[:level]) for level in range(len(LEVEL_BITS))]
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every timer, the clock keeps going."""
+        self.levels = [[[] for _ in range(1 << bits)] for bits in LEVEL_BITS]
+        # further off than the whole wheel
+        self.overflow = []
+
+    def after(self, delay: int, callback: typing.Callable[[], None]) -> Timer:
+        """Call {callback} in {delay} ticks (at least the next one)."""
+        return self.insert(Timer(self.now + max(delay, 1), callback, None))
+
+    def every(self, period: int, callback: typing.Callable[[], None], delay: int = None) -> Timer:
+        """Call {callback} every {period} ticks, the first time in {delay}, a period by default."""
+        period = max(period, 1)
+        return self.insert(Timer(self.now + max(period if delay is None else delay, 1), callback, period))
+
+    def insert(self, timer: Timer) -> Timer:
+        for level, bits in enumerate(LEVEL_BITS):
+            shift = self.shifts[level]
+            # the lowest level where the due tick is still in this round of the level above
+            if timer.due >> (shift + bits) == self.now >> (shift + bits):
+                self.levels[level][(timer.due >> shift) & ((1 << bits) - 1)].append(timer)
+                return timer
+        self.overflow.append(timer)
+        return timer
+
+    def advance(self) -> None:
+        """Move the clock on a tick and fire the timers due on it."""
+        self.now += 1
+        # levels that have come round to a new slot move its timers down, the top one first
+        cascading = []
+        for level in range(1, len(LEVEL_BITS)):
+            if self.now & ((1 << self.shifts[level]) - 1):
+                break
+            cascading.append(level)
+        if len(cascading) == len(LEVEL_BITS) - 1 and not self.now & ((1 << sum(LEVEL_BITS)) - 1):
+            overflow, self.overflow = self.overflow, []
+            for timer in overflow:
+                self.insert(timer)
+        for level in reversed(cascading):
+            slots = self.levels[level]
+            index = (self.now >> self.shifts[level]) & (len(slots) - 1)
+            timers, slots[index] = slots[index], []
+            for timer in timers:
+                if not timer.cancelled:
+                    self.insert(timer)
+
+        slots = self.levels[0]
+        index = self.now & (len(slots) - 1)
+        timers, slots[index] = slots[index], []
+        for timer in timers:
+            if timer.cancelled:
+                continue
+            if timer.period:
+                timer.due += timer.period
+                self.insert(timer)
+            timer.callback()
+
+    def __len__(self) -> int:
+        """How many timers are waiting, cancelled ones included until they're dropped."""
+        return sum(len(slot) for slots in self.levels for slot in slots) + len(self.overflow)
+
+
+@lru_cache(None)
+def get_timers() -> TimerWheel:
+    return TimerWheel()
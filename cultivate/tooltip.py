@@ -1,7 +1,8 @@
 from datetime import date, timedelta
 import pygame
 from cultivate import loader
-from cultivate.settings import WIDTH, HEIGHT, MD_FONT, SM_FONT
+from cultivate import settings
+from cultivate.settings import WIDTH, HEIGHT
 
 BACKGROUND = pygame.Color(245, 245, 220)
 FONT_COLOR = pygame.Color("black")
@@ -23,10 +24,10 @@ class Tooltip:
         self.padding = 20
 
     def set_tooltip(self, text):
-        font_width, font_height = MD_FONT.size(text)
+        font_width, font_height = settings.MD_FONT.size(text)
         self.rect.width = font_width + (self.padding * 2)
-        self.render = MD_FONT.render(text,
-                                     True, FONT_COLOR)
+        self.render = loader.render_text(settings.MD_FONT, text,
+                                         True, FONT_COLOR)
 
     @property
     def empty(self):
@@ -65,7 +66,7 @@ class InventoryBox:
     def draw(self, surface):
         rect = self.rect
         if self.name:
-            font_width, _ = MD_FONT.size(self.name)
+            font_width, _ = settings.MD_FONT.size(self.name)
             rect.width = max(rect.width, font_width + (self.padding * 2))
             rect.x = WIDTH - rect.width
         else:
@@ -79,7 +80,7 @@ class InventoryBox:
             icon_y = rect.y + rect.height // 2 - self.icon.get_width() // 2
             surface.blit(self.icon, (icon_x, icon_y))
         if self.name:
-            surface.blit(MD_FONT.render(self.name, True, FONT_COLOR),
+            surface.blit(loader.render_text(settings.MD_FONT, self.name, True, FONT_COLOR),
                          (rect.x + self.padding, rect.y + self.padding))
 
 class InfoBox:
@@ -98,21 +99,21 @@ class InfoBox:
 
 
     def draw(self, surface):
-        font_width, font_height = MD_FONT.size(self.current_date)
+        font_width, font_height = settings.MD_FONT.size(self.current_date)
         rect = self.rect
         if self.game_state.current_task:
-            font_width, _ = MD_FONT.size(self.game_state.current_task)
+            font_width, _ = settings.MD_FONT.size(self.game_state.current_task)
             rect.width = max(rect.width, font_width + (self.padding * 2))
         else:
             rect.width = self.width
         scaled_image = pygame.transform.scale(self.image, (rect.w, rect.h))
         surface.blit(scaled_image, rect)
         surface.blit(
-            MD_FONT.render(self.current_date, True, FONT_COLOR),
+            loader.render_text(settings.MD_FONT, self.current_date, True, FONT_COLOR),
             (self.rect.x + self.padding, self.rect.y + self.padding)
         )
         if self.game_state.current_task:
             surface.blit(
-                SM_FONT.render(self.game_state.current_task, True, FONT_COLOR),
+                loader.render_text(settings.SM_FONT, self.game_state.current_task, True, FONT_COLOR),
                 (self.rect.x + self.padding, self.rect.y + self.padding + font_height + self.padding)
             )
@@ -1,5 +1,5 @@
 import pygame
-from cultivate.settings import MAP_WIDTH, MAP_HEIGHT, MD_FONT
+from cultivate.settings import MAP_WIDTH, MAP_HEIGHT
 
 BLACK = pygame.Color(0, 0, 0)
 
@@ -25,11 +25,14 @@ class Fader:
         self.increasing = True
         self.fading = False
 
+    def update(self):
+        if self.fading:
+            self.adjust_opacity()
+
     def draw(self, surface):
         self.fade.set_alpha(self.opacity)
         pygame.draw.rect(self.fade, BLACK, self.rect)
         surface.blit(self.fade, self.rect)
-        self.adjust_opacity()
 
     def adjust_opacity(self):
         if not self.increasing and self.opacity <= 0:
@@ -12,9 +12,16 @@ setup(
     entry_points={
         "gui_scripts": [
             "cultivate = cultivate.main:main",
-        ]
+        ],
+        "console_scripts": [
+            "cultivate-pack = cultivate.asset_pack:main",
+            "cultivate-autoplay = cultivate.autoplay:main",
+            "cultivate-sim = cultivate.simulate:main",
+        ],
     },
     include_package_data=True,
     install_requires=requirements,
-    python_requires=">=3.6",
+    # moves npcs a crowd at a time with --crowd, and speeds up recolouring sprites
+    extras_require={"numpy": ["numpy"]},
+    python_requires=">=3.7",
 )